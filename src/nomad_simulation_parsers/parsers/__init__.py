@@ -1,7 +1,92 @@
+from typing import Literal, Optional
+
 from nomad.config.models.plugins import ParserEntryPoint
+from pydantic import Field
 
 
 class EntryPoint(ParserEntryPoint):
+    max_file_size: dict[str, int] = Field(
+        default_factory=dict,
+        description="""
+        Maximum size in bytes of the auxiliary files by file name, e.g. `dos.xml`.
+        Larger files are not parsed. The budgets of `spectra` and `PDOS` apply to the
+        total size of the BSE and TDDFT spectrum files and of the PDOS_S*_A*.OUT files.
+        """,
+    )
+    max_parse_time: dict[str, float] = Field(
+        default_factory=dict,
+        description="""
+        Maximum wall time in seconds for reading the auxiliary files by file name,
+        or `spectra` for all spectrum files. The reading of a file is cancelled when
+        it runs longer. The conversion of the data read into the archive is not
+        covered, such that a cancelled file leaves no partial data in the archive.
+        """,
+    )
+    precision: dict[
+        Literal['eigenvalues', 'occupancies', 'band_energies', 'dos', 'dos_energies'],
+        Literal['float64', 'float32'],
+    ] = Field(
+        default_factory=dict,
+        description="""
+        Storage dtype of the eigenvalues, occupancies, band_energies, dos and
+        dos_energies arrays read from the auxiliary files, float64 by default. The
+        values are converted directly into this dtype when parsed. float32 keeps
+        about 7 significant digits, i.e. a relative error below 6e-8, and halves the
+        memory of the parsed arrays. The archive stores them in the schema dtype.
+        Half precision is not supported, as its relative error of about 5e-4, i.e.
+        tens of meV for eigenvalues of a few Hartree, exceeds the accuracy of band
+        gaps.
+        """,
+    )
+    workers: Optional[int] = Field(
+        None,
+        description="""
+        Number of processes parsing the SCF iterations and optimization steps of
+        large INFO.OUT files. Defaults to one per CPU, such that the modules of at
+        least `parallel_min_size` bytes are parsed in parallel and smaller ones
+        serially.
+        """,
+    )
+    parallel_min_size: Optional[int] = Field(
+        None,
+        description="""
+        Minimum size in bytes of a block of SCF iterations or optimization steps to
+        be parsed in parallel. Defaults to 8 MiB.
+        """,
+    )
+    optimization_stride: Optional[int] = Field(
+        None,
+        description="""
+        Only keep the first, the last and every n-th step of structure optimizations
+        in the model systems and outputs. The full trajectory is then stored as
+        arrays in pages of `trajectory_page_size` steps. All steps are kept by
+        default.
+        """,
+    )
+    trajectory_page_size: int = Field(
+        100,
+        description="""
+        Number of structure optimization steps per page of the stored trajectory.
+        """,
+    )
+    max_memory: Optional[int] = Field(
+        None,
+        description="""
+        Memory ceiling in bytes of the eigenvalue, band structure and density of
+        states arrays read from EIGVAL.OUT, bandstructure.xml and dos.xml. The arrays
+        above it are backed by temporary memory-mapped files, which are removed once
+        the archive is written. This is slower but keeps very large entries within
+        the memory of a worker. No ceiling by default.
+        """,
+    )
+    spill_directory: Optional[str] = Field(
+        None,
+        description="""
+        Directory of the temporary files of the arrays above `max_memory`. It should
+        be on disk and not a tmpfs. Defaults to the temporary directory.
+        """,
+    )
+
     def load(self):
         from nomad.parsing.parser import MatchingParserInterface
 
@@ -10,6 +95,16 @@ class EntryPoint(ParserEntryPoint):
             **self.dict(),
         )
 
+    def warmup(self, freeze: bool = True) -> None:
+        """
+        Imports the parser and builds its compiled patterns and mappers once, to be
+        called in the parent process before forking parser workers such that they
+        share this state, see `exciting.parser.warmup`.
+        """
+        from nomad_simulation_parsers.parsers.exciting.parser import warmup  # noqa: PLC0415
+
+        warmup(freeze=freeze)
+
 
 exciting_parser_entry_point = EntryPoint(
     name='parsers/exciting',
@@ -0,0 +1,334 @@
+import abc
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from nomad.datamodel.datamodel import (
+        EntryArchive,
+    )
+    from structlog.stdlib import (
+        BoundLogger,
+    )
+
+from nomad.parsing.file_parser import Parser
+from nomad.parsing.file_parser.mapping_parser import MappingParser, MetainfoParser
+from nomad.utils import get_logger
+from nomad_simulations.schema_packages.general import Simulation
+
+from nomad_simulation_parsers.parsers import EntryPoint
+from nomad_simulation_parsers.parsers.utils import (
+    ArrayBuffer,
+    ReadAhead,
+    TimeBudgetExceeded,
+    clear_transform_cache,
+    profile_stage,
+    search_many_files,
+    time_budget,
+)
+
+# mappers built from the annotations of the archive sections by section, annotation
+# key and nesting level, shared by all parsers of the process and copied per parse
+MAPPERS: dict[tuple[str, str, int], Any] = {}
+MAPPERS_LOCK = threading.Lock()
+# PhysicalProperty re-attaches the data type of `value`, shared by all its sections,
+# to a new definition on each assignment, so the sections are not built concurrently
+SECTIONS_LOCK = threading.RLock()
+
+
+class SimulationParser(MetainfoParser):
+    """
+    MetainfoParser of the Simulation section which builds the mapper of each
+    annotation key and nesting level only once per process, see `MAPPERS`. Each parse
+    converts with a copy, as the mappers also cache the transformed data.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('data_object', Simulation())
+        super().__init__(**kwargs)
+
+    def build_mapper(self, max_level: Optional[int] = None):
+        key = (
+            self.data_object.m_def.qualified_name(),
+            self.annotation_key,
+            max_level or self.max_nested_level,
+        )
+        mapper = MAPPERS.get(key)
+        if mapper is None:
+            with MAPPERS_LOCK:
+                mapper = MAPPERS.get(key)
+                if mapper is None:
+                    mapper = MAPPERS[key] = super().build_mapper(max_level)
+        return mapper.model_copy(deep=True)
+
+    def from_dict(self, dct: dict[str, Any], root=None):
+        with SECTIONS_LOCK:
+            super().from_dict(dct, root)
+
+
+def build_mappers(stages: list[str], nested_stages: set[str]) -> None:
+    """
+    Builds the mappers of the annotation keys `stages` into `MAPPERS`, those of the
+    `nested_stages` include nested sections.
+    """
+    data_parser = SimulationParser()
+    for stage in stages:
+        data_parser.max_nested_level = 2 if stage in nested_stages else 1
+        data_parser.annotation_key = stage
+        data_parser.mapper  # noqa: B018
+
+
+class ParseContext:
+    """
+    State of a single parse of an entry: the auxiliary files found for its mainfile,
+    the parser of the archive data, the file parsers and the metrics of each stage.
+    Each call of `BaseParser.parse` creates its own context such that one parser can
+    parse several entries concurrently. The memory metrics of concurrent parses
+    include each other's allocations, as tracemalloc traces the whole process.
+    """
+
+    def __init__(self, mainfile: str, logger: 'BoundLogger'):
+        self.mainfile = mainfile
+        self.logger = logger
+        self.auxiliary_files: dict[str, list[str]] = {}
+        self.data_parser = SimulationParser()
+        # file parsers by stage
+        self.parsers: dict[str, MappingParser] = {}
+        # wall time and, if tracemalloc is tracing, memory metrics of each stage
+        self.stages: dict[str, dict[str, Any]] = {}
+        # allocator of the large arrays of the auxiliary files
+        self.buffer = ArrayBuffer()
+
+
+class BaseParser(Parser):
+    """
+    Base of the parsers of simulation codes which write a mainfile and auxiliary
+    files converted into the archive with the mapping annotations of the schema. The
+    auxiliary files are declared in `file_stages` by file name together with their
+    annotation key, which also names their parsing stage. A parse finds them in
+    `_discover`, reads them ahead in the background and runs `_parse`, which converts
+    the mainfile and each file in a stage with `_convert_stage` and
+    `_convert_auxiliary`. Each stage is timed and profiled, its memoized transforms
+    are cleared and it is subject to the size and wall-time budgets of its file, the
+    large arrays are allocated in the buffer of the parse. The budgets, precision,
+    workers, parallel block size and memory ceiling default to the options of the
+    `entry_point`.
+    """
+
+    # annotation keys of the auxiliary files, which also name their parsing stages
+    file_stages: dict[str, str] = {}
+    # stages whose mappers include nested sections
+    nested_stages: set[str] = set()
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        entry_point: EntryPoint,
+        read_ahead: bool = True,
+        max_file_size: Optional[dict[str, int]] = None,
+        max_parse_time: Optional[dict[str, float]] = None,
+        workers: Optional[int] = None,
+        parallel_min_size: Optional[int] = None,
+        precision: Optional[dict[str, str]] = None,
+        max_memory: Optional[int] = None,
+    ):
+        # context of the last parse of each thread
+        self._local = threading.local()
+        # read the auxiliary files in the background while the mainfile is parsed
+        self.read_ahead = read_ahead
+        # size (bytes) and wall-time (s) budgets of the auxiliary files by file name,
+        # files over budget are skipped
+        self.max_file_size = (
+            entry_point.max_file_size if max_file_size is None else max_file_size
+        )
+        self.max_parse_time = (
+            entry_point.max_parse_time if max_parse_time is None else max_parse_time
+        )
+        # number of processes parsing blocks of the mainfile of at least
+        # parallel_min_size bytes, see `parallel_map`
+        self.workers = entry_point.workers if workers is None else workers
+        self.parallel_min_size = (
+            entry_point.parallel_min_size
+            if parallel_min_size is None
+            else parallel_min_size
+        )
+        # storage dtypes of the arrays read from the auxiliary files by name, float64
+        # if not given
+        self.precision = entry_point.precision if precision is None else precision
+        # memory ceiling (bytes) of the arrays allocated in the buffer of a parse, the
+        # arrays above it are backed by temporary files in the spill_directory of the
+        # entry point, no ceiling if not given
+        self.max_memory = entry_point.max_memory if max_memory is None else max_memory
+        self.spill_directory = entry_point.spill_directory
+
+    @property
+    def context(self) -> Optional[ParseContext]:
+        """Context of the last parse in the current thread."""
+        return getattr(self._local, 'context', None)
+
+    @property
+    def stages(self) -> dict[str, dict[str, Any]]:
+        """Metrics of each stage of the last parse in the current thread."""
+        context = self.context
+        return context.stages if context is not None else {}
+
+    def parse(
+        self, mainfile: str, archive: 'EntryArchive', logger: 'BoundLogger'
+    ) -> None:
+        """
+        Parses the entry of `mainfile` into `archive`. The parser itself is not
+        modified, all state of the parse is kept in its context, such that several
+        entries can be parsed concurrently in threads.
+        """
+        logger = logger if logger is not None else get_logger(__name__)
+        context = self._local.context = ParseContext(mainfile, logger)
+        context.buffer = ArrayBuffer(self.max_memory, self.spill_directory)
+        with profile_stage('discovery', context.stages) as metrics:
+            context.auxiliary_files = self._discover(mainfile, metrics, logger)
+        with ReadAhead(self._read_ahead_files(context)):
+            try:
+                self._parse(context, archive)
+            finally:
+                context.buffer.close()
+        if context.buffer.spilled_size:
+            logger.info(
+                'Arrays over the memory ceiling are backed by temporary files.',
+                data=dict(
+                    max_memory=self.max_memory,
+                    spilled_size=context.buffer.spilled_size,
+                ),
+            )
+
+    @abc.abstractmethod
+    def _parse(self, context: ParseContext, archive: 'EntryArchive') -> None:
+        """Converts the mainfile and the auxiliary files of the context into
+        `archive`."""
+
+    def _read_ahead_files(self, context: ParseContext) -> list[str]:
+        """Returns the auxiliary files read ahead in the background."""
+        if not self.read_ahead:
+            return []
+        return [
+            files[0]
+            for filename, files in context.auxiliary_files.items()
+            if files and filename in self.file_stages
+        ]
+
+    def _discover(
+        self, mainfile: str, metrics: dict[str, Any], logger: 'BoundLogger'
+    ) -> dict[str, list[str]]:
+        """
+        Finds the auxiliary files of `file_stages` in a single lookup next to and
+        below the directory of the mainfile. The searched files and the directory
+        scans are recorded in `metrics`.
+        """
+        auxiliary_files: dict[str, list[str]] = {}
+        metrics.update(searched=[], directory_scans=0, levels=[])
+        self._search(
+            list(self.file_stages),
+            os.path.dirname(mainfile),
+            auxiliary_files,
+            metrics,
+            logger,
+        )
+        metrics.pop('levels')
+        return auxiliary_files
+
+    def _search(
+        self,
+        filenames: list[str],
+        maindir: str,
+        auxiliary_files: dict[str, list[str]],
+        metrics: dict[str, Any],
+        logger: 'BoundLogger',
+    ) -> None:
+        """
+        Searches the auxiliary files not yet searched in a single lookup and adds the
+        first file of each within its size budget to `auxiliary_files`.
+        """
+        filenames = [f for f in dict.fromkeys(filenames) if f not in auxiliary_files]
+        if not filenames:
+            return
+        found, scans = search_many_files(filenames, maindir)
+        for filename, files in found.items():
+            auxiliary_files[filename] = self._check_size(filename, files[:1], logger)
+        metrics['searched'].extend(filenames)
+        metrics['directory_scans'] += sum(scans)
+        if len(scans) > len(metrics['levels']):
+            metrics['levels'] = scans
+
+    def _check_size(
+        self, name: str, files: list[str], logger: 'BoundLogger'
+    ) -> list[str]:
+        """
+        Returns the files or, if their total size exceeds the size budget of the file
+        or file group `name`, an empty list.
+        """
+        max_size = self.max_file_size.get(name)
+        if not files or max_size is None:
+            return files
+        size = sum(os.path.getsize(file) for file in files)
+        if size <= max_size:
+            return files
+        logger.warning(
+            'Auxiliary file exceeds its size budget and is not parsed.',
+            data=dict(
+                file=files[0] if len(files) == 1 else name,
+                size=size,
+                max_file_size=max_size,
+            ),
+        )
+        return []
+
+    def _convert_stage(
+        self,
+        context: ParseContext,
+        parser: MappingParser,
+        stage: str,
+        update_mode: str = 'merge',
+        max_time: Optional[float] = None,
+    ) -> bool:
+        """
+        Converts the data of a file parser into the archive data using the annotation
+        key `stage` and records the metrics of the stage. Reading the file is
+        cancelled if it exceeds the wall-time budget `max_time`, in which case nothing
+        is written and False is returned.
+        """
+        context.parsers[stage] = parser
+        data_parser = context.data_parser
+        with profile_stage(stage, context.stages) as metrics:
+            try:
+                # the budget only covers reading the file such that a cancelled file
+                # leaves no partial data in the archive
+                with time_budget(max_time):
+                    parser.data  # noqa: B018
+            except TimeBudgetExceeded:
+                context.logger.warning(
+                    'Auxiliary file exceeds its time budget and is not parsed.',
+                    data=dict(file=parser.filepath, max_parse_time=max_time),
+                )
+                parser.close()
+                return False
+            data_parser.max_nested_level = 2 if stage in self.nested_stages else 1
+            data_parser.annotation_key = stage
+            parser.convert(data_parser, update_mode=update_mode)
+            metrics['transform_cache'] = clear_transform_cache(parser)
+        return True
+
+    def _convert_auxiliary(
+        self,
+        context: ParseContext,
+        parser: MappingParser,
+        filename: str,
+        update_mode: str = 'merge@-1',
+    ) -> bool:
+        """
+        Converts the data of an auxiliary file parser in the stage of its annotation
+        key within the wall-time budget of the file, see `_convert_stage`.
+        """
+        return self._convert_stage(
+            context,
+            parser,
+            self.file_stages.get(filename, filename),
+            update_mode=update_mode,
+            max_time=self.max_parse_time.get(filename),
+        )
@@ -0,0 +1,73 @@
+from typing import Any, Optional
+
+import numpy as np
+
+# occupancy above which a state is occupied
+OCCUPANCY_TOLERANCE = 1e-3
+# energy (Hartree) above the Fermi energy up to which a state is occupied
+FERMI_ENERGY_TOLERANCE = 1e-6
+
+
+def get_band_edges(
+    energies: np.ndarray, occupied: np.ndarray, kpoints: Optional[np.ndarray] = None
+) -> list[dict[str, Any]]:
+    """
+    Returns the band edges and band gaps of each spin channel of the band energies in
+    a single vectorized pass over the arrays, i.e. without sorting or copying them.
+    The fundamental gap is direct if the highest occupied and the lowest unoccupied
+    state are at the same k-point, otherwise it is indirect and the smallest direct
+    gap is also given. The gap of a metal is zero and has no type. Spin channels
+    which are completely occupied or empty have no gap.
+
+    Args:
+        energies (np.ndarray): (n_spin, n_kpoints, n_bands) band energies
+        occupied (np.ndarray): boolean mask of the occupied states of `energies`
+        kpoints (np.ndarray, optional): (n_kpoints, 3) k-points, to give the momentum
+            transfer of indirect gaps
+
+    Returns:
+        list[dict]: highest_occupied and lowest_unoccupied energies, None if there is
+            no such state, and the band_gaps of each spin channel
+    """
+    valence = np.max(energies, axis=2, where=occupied, initial=-np.inf)
+    conduction = np.min(energies, axis=2, where=~occupied, initial=np.inf)
+    n_spin = len(energies)
+    edges = []
+    for spin in range(n_spin):
+        k_valence = int(np.argmax(valence[spin]))
+        k_conduction = int(np.argmin(conduction[spin]))
+        homo = float(valence[spin, k_valence])
+        lumo = float(conduction[spin, k_conduction])
+        edge: dict[str, Any] = dict(
+            highest_occupied=homo if np.isfinite(homo) else None,
+            lowest_unoccupied=lumo if np.isfinite(lumo) else None,
+            band_gaps=[],
+        )
+        edges.append(edge)
+        if edge['highest_occupied'] is None or edge['lowest_unoccupied'] is None:
+            continue
+
+        spin_channel = spin if n_spin > 1 else None
+        gap: dict[str, Any] = dict(
+            value=max(lumo - homo, 0.0), spin_channel=spin_channel
+        )
+        edge['band_gaps'].append(gap)
+        if gap['value'] == 0:
+            continue
+        # k-points without occupied or unoccupied states have an infinite gap
+        direct = conduction[spin] - valence[spin]
+        k_direct = int(np.argmin(direct))
+        if k_valence == k_conduction or direct[k_direct] <= gap['value']:
+            gap['type'] = 'direct'
+            continue
+        gap['type'] = 'indirect'
+        if kpoints is not None:
+            gap['momentum_transfer'] = kpoints[[k_valence, k_conduction]]
+        edge['band_gaps'].append(
+            dict(
+                type='direct',
+                value=float(direct[k_direct]),
+                spin_channel=spin_channel,
+            )
+        )
+    return edges
@@ -0,0 +1,178 @@
+import os
+import re
+from typing import Optional
+
+import numpy as np
+
+from nomad_simulation_parsers.parsers.utils import open_file
+
+from .info_reader import scan_modules
+
+# number of leading bytes read for the header values
+HEADER_SIZE = 64 * 1024
+RE_N_ATOMS = re.compile(rb'Total number of atoms per unit cell\s*:\s*(\d+)')
+RE_EIGVAL_HEADER = re.compile(rb'^\s*(\d+)\s*:\s*nkpt\s*\n\s*(\d+)\s*:\s*nstsv')
+OPTIMIZATION_STEP_MARKER = b' Optimization step '
+# features of an entry the parse cost is estimated from: the size of INFO.OUT, the
+# number of atoms of all structures, the number of eigenvalues in EIGVAL.OUT, the
+# sizes of the XML and of all other auxiliary files and the number of auxiliary files
+# and file groups read besides input.xml
+COST_FEATURES = [
+    'info_bytes',
+    'n_atom_steps',
+    'n_eigenvalues',
+    'bandstructure_bytes',
+    'dos_bytes',
+    'other_bytes',
+    'n_auxiliary',
+]
+# wall time in seconds and peak traced memory in bytes of a parse per unit of each
+# feature, `constant` is the cost of an empty parse. Fitted to the benchmark corpus
+# of tests/benchmarks/test_exciting_cost_model.py.
+TIME_COEFFICIENTS = {
+    'constant': 3.32e-2,
+    'info_bytes': 1.56e-7,
+    'n_atom_steps': 2.11e-4,
+    'n_eigenvalues': 1.84e-6,
+    'bandstructure_bytes': 8.30e-8,
+    'dos_bytes': 9.80e-8,
+    'other_bytes': 1.27e-7,
+    'n_auxiliary': 7.01e-3,
+}
+MEMORY_COEFFICIENTS = {
+    'constant': 0.0,
+    'info_bytes': 9.05,
+    'n_atom_steps': 1.45e3,
+    'n_eigenvalues': 170.0,
+    'bandstructure_bytes': 9.64,
+    'dos_bytes': 7.89,
+    'other_bytes': 0.66,
+    'n_auxiliary': 2.67e6,
+}
+
+
+def read_header(filepath: str, size: int = HEADER_SIZE) -> bytes:
+    """Returns the first `size` bytes of the file or nothing if it cannot be read."""
+    try:
+        with open_file(filepath) as f:
+            return f.read(size)
+    except OSError:
+        return b''
+
+
+def read_features(
+    mainfile: str,
+    auxiliary_files: dict[str, list[str]],
+    n_steps: Optional[int] = None,
+) -> dict[str, float]:
+    """
+    Returns the cost features of the entry of INFO.OUT `mainfile` with the auxiliary
+    files and file groups by name, as found by ExcitingParser, and `n_steps`
+    structure optimization steps. Besides the file sizes and the headers of INFO.OUT
+    and EIGVAL.OUT, the whole INFO.OUT is scanned for the optimization step markers
+    if the number of steps is not given.
+    """
+    match = RE_N_ATOMS.search(read_header(mainfile))
+    n_atoms = int(match.group(1)) if match else 0
+    if n_steps is None:
+        n_steps = scan_modules(mainfile, OPTIMIZATION_STEP_MARKER)[1] if n_atoms else 0
+    features = dict.fromkeys(COST_FEATURES, 0.0)
+    features['info_bytes'] = float(os.path.getsize(mainfile))
+    # the initial and the final structures and one per optimization step
+    features['n_atom_steps'] = float(n_atoms * (n_steps + 2 if n_steps else 1))
+    for name, files in auxiliary_files.items():
+        if not files or name == 'input.xml':
+            continue
+        features['n_auxiliary'] += 1
+        size = float(sum(os.path.getsize(file) for file in files))
+        if name == 'EIGVAL.OUT':
+            match = RE_EIGVAL_HEADER.match(read_header(files[0], 256))
+            if match:
+                features['n_eigenvalues'] = float(
+                    int(match.group(1)) * int(match.group(2))
+                )
+            else:
+                features['other_bytes'] += size
+        elif name == 'bandstructure.xml':
+            features['bandstructure_bytes'] = size
+        elif name == 'dos.xml':
+            features['dos_bytes'] = size
+        else:
+            features['other_bytes'] += size
+    return features
+
+
+class CostModel:
+    """
+    Linear model of the wall time in seconds and the peak traced memory in bytes of
+    parsing an entry with ExcitingParser from its cost features. The default
+    coefficients are fitted to the benchmark corpus, the times scale with the speed
+    of the machine.
+    """
+
+    def __init__(
+        self,
+        time_coefficients: Optional[dict[str, float]] = None,
+        memory_coefficients: Optional[dict[str, float]] = None,
+    ):
+        self.time_coefficients = (
+            TIME_COEFFICIENTS if time_coefficients is None else time_coefficients
+        )
+        self.memory_coefficients = (
+            MEMORY_COEFFICIENTS if memory_coefficients is None else memory_coefficients
+        )
+
+    @staticmethod
+    def _predict(coefficients: dict[str, float], features: dict[str, float]) -> float:
+        return coefficients.get('constant', 0.0) + sum(
+            coefficients.get(name, 0.0) * features.get(name, 0.0)
+            for name in COST_FEATURES
+        )
+
+    def estimate(self, features: dict[str, float]) -> dict[str, float]:
+        """Returns the estimated time and memory of the parse."""
+        return dict(
+            time=self._predict(self.time_coefficients, features),
+            memory=self._predict(self.memory_coefficients, features),
+        )
+
+    @staticmethod
+    def _fit(features: np.ndarray, costs: np.ndarray) -> dict[str, float]:
+        # non-negative least squares relative to the cost such that small entries
+        # weigh as much as large ones, features with a negative coefficient are left
+        # out and the fit is repeated
+        columns = np.hstack([np.ones((len(features), 1)), features])
+        columns = columns / costs[:, None]
+        active = np.ones(columns.shape[1], dtype=bool)
+        coefficients = np.zeros(columns.shape[1])
+        while active.any():
+            coefficients[:] = 0.0
+            coefficients[active] = np.linalg.lstsq(
+                columns[:, active], np.ones(len(costs)), rcond=None
+            )[0]
+            if (coefficients >= 0).all():
+                break
+            active &= coefficients > 0
+        return dict(zip(['constant', *COST_FEATURES], coefficients.tolist()))
+
+    @classmethod
+    def fit(
+        cls,
+        features: list[dict[str, float]],
+        times: list[float],
+        memories: list[float],
+    ) -> 'CostModel':
+        """
+        Fits the model to the measured times and peak memories of the parses of
+        entries with the given features.
+        """
+        table = np.array(
+            [[f.get(name, 0.0) for name in COST_FEATURES] for f in features]
+        )
+        return cls(
+            time_coefficients=cls._fit(table, np.asarray(times, dtype=float)),
+            memory_coefficients=cls._fit(table, np.asarray(memories, dtype=float)),
+        )
+
+
+COST_MODEL = CostModel()
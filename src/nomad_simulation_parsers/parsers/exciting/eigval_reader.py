@@ -1,13 +1,22 @@
+from functools import partial
+
 import numpy as np
 from nomad.parsing.file_parser.text_parser import Quantity, TextParser
 
+from nomad_simulation_parsers.parsers.utils import open_text_file
+
 
-def str_to_eigenvalues(val_in: str) -> dict[str, np.ndarray]:
+def str_to_eigenvalues(
+    val_in: str, eigenvalues_dtype: str = 'float64', occupancies_dtype: str = 'float64'
+) -> dict[str, np.ndarray]:
+    """
+    Converts the eigenvalue and occupancy columns of a k-point block directly into
+    arrays of the given dtypes.
+    """
     val = val_in[: val_in.rfind('\n \n')].strip()
-    val = np.array([v.split() for v in val.split('\n')], dtype=float)
-    val = np.transpose(val)
-    occs = val[-1]
-    eigs = val[-2]
+    rows = [v.split() for v in val.split('\n')]
+    eigs = np.array([row[-2] for row in rows], dtype=eigenvalues_dtype)
+    occs = np.array([row[-1] for row in rows], dtype=occupancies_dtype)
 
     tol = 0.1
     nspin = 1 if np.any(occs > 1 + tol) else 2
@@ -18,15 +27,31 @@ def str_to_eigenvalues(val_in: str) -> dict[str, np.ndarray]:
 
 
 class EigvalReader(TextParser):
+    """
+    Reader for the exciting EIGVAL.OUT. The storage dtypes of the eigenvalues and
+    occupancies are taken from the `precision` policy by quantity name.
+    """
+
+    def open(self, mainfile: str):
+        return open_text_file(mainfile)
+
     def init_quantities(self):
+        precision = self._kwargs.get('precision', {})
         self._quantities = [
-            Quantity('k_points', r'\s*\d+\s*([\d\.Ee\- ]+):\s*k\-point', repeats=True),
+            Quantity(
+                'k_points', r'\s*\d+\s+([\d\.Ee\+\- ]+):\s*k\-point', repeats=True
+            ),
             Quantity(
                 'eigenvalues_occupancies',
                 r'\(state\, eigenvalue and occupancy below\)\s*'
                 r'([\d\.Ee\-\s]+?(?:\n *\n))',
-                str_operation=str_to_eigenvalues,
+                str_operation=partial(
+                    str_to_eigenvalues,
+                    eigenvalues_dtype=precision.get('eigenvalues', 'float64'),
+                    occupancies_dtype=precision.get('occupancies', 'float64'),
+                ),
                 repeats=True,
+                convert=False,
             ),
             Quantity('n_k_points', r'(\d+) +\: +nkpt', dtype=int),
             Quantity('n_states', r'(\d+) +\: +nstsv', dtype=int),
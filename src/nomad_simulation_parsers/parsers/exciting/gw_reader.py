@@ -0,0 +1,108 @@
+import re
+from typing import Any
+
+import numpy as np
+from nomad.parsing.file_parser.text_parser import Quantity, TextParser
+
+from nomad_simulation_parsers.parsers.utils import open_text_file
+
+RE_FLOAT = r'[-+]?\d+\.\d*(?:[Ee][-+]\d+)?'
+# header of each k-point block of EVALQP.DAT with the k-point and the column labels
+RE_QP_HEADER = re.compile(r' *k\-point #\s*\d+:([^\n]*)\n *state([^\n]*)\n')
+
+
+def str_to_quasiparticles(val_in: str) -> dict[str, Any]:
+    """
+    Reads the quasiparticle tables of all k-points of EVALQP.DAT in bulk. The k-point
+    headers are cut out and the remaining numbers are converted in a single numpy call
+    into a (k-point, state, column) table. Returns the k-points, their weights, the
+    state indices and one (k-point, state) array per column label, e.g. `E_GW`.
+    """
+    headers = RE_QP_HEADER.findall(val_in)
+    if not headers:
+        return {}
+    k_points = np.array(' '.join(h[0] for h in headers).split(), dtype=float)
+    k_points = k_points.reshape((len(headers), -1))
+    labels = headers[0][1].split()
+    table = np.array(RE_QP_HEADER.sub(' ', val_in).split(), dtype=float)
+    table = table.reshape((len(headers), -1, len(labels) + 1))
+    return dict(
+        k_points=k_points[:, :3],
+        k_weights=k_points[:, 3],
+        states=table[0, :, 0].astype(np.int32),
+        columns={label: table[:, :, n + 1] for n, label in enumerate(labels)},
+    )
+
+
+class EvalqpReader(TextParser):
+    """
+    Reader for the exciting GW quasiparticle energies in EVALQP.DAT. The energies and
+    self-energy components are bare floats in Hartree.
+    """
+
+    def open(self, mainfile: str):
+        return open_text_file(mainfile)
+
+    def init_quantities(self):
+        self._quantities = [
+            Quantity(
+                'quasiparticles',
+                r'(k\-point #[\s\S]+)',
+                str_operation=str_to_quasiparticles,
+                repeats=False,
+                convert=False,
+            )
+        ]
+
+
+class GWInfoReader(TextParser):
+    """
+    Reader for the exciting GW_INFO.OUT. Reads the Fermi energy in Hartree and the
+    band gaps in eV of the Kohn-Sham and the G0W0 band structures as bare floats.
+    """
+
+    def open(self, mainfile: str):
+        return open_text_file(mainfile)
+
+    def init_quantities(self):
+        band_structure_quantities = [
+            Quantity(
+                'fermi_energy',
+                rf'Fermi energy\s*:\s*({RE_FLOAT})',
+                dtype=float,
+                repeats=False,
+            ),
+            Quantity(
+                'band_index_vbm',
+                r'Band index of VBM\s*:\s*(\d+)',
+                dtype=int,
+                repeats=False,
+            ),
+            Quantity(
+                'band_index_cbm',
+                r'Band index of CBm\s*:\s*(\d+)',
+                dtype=int,
+                repeats=False,
+            ),
+            Quantity(
+                'band_gap_indirect',
+                rf'(?:Indirect|Fundamental) Band[Gg]ap \(eV\)\s*:\s*({RE_FLOAT})',
+                dtype=float,
+                repeats=False,
+            ),
+            Quantity(
+                'band_gap_direct',
+                rf'Direct Band[Gg]ap(?: at k\(VBM\))? \(eV\)\s*:\s*({RE_FLOAT})',
+                dtype=float,
+                repeats=False,
+            ),
+        ]
+        self._quantities = [
+            Quantity(
+                name,
+                rf'{header} band structure\s*=+([\s\S]+?)(?:\n *=|\Z)',
+                sub_parser=TextParser(quantities=band_structure_quantities),
+                repeats=False,
+            )
+            for name, header in [('kohn_sham', r'Kohn\-Sham'), ('gw', 'G0W0')]
+        ]
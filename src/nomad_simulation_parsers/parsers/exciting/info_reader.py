@@ -1,13 +1,91 @@
+import os
 import re
-from typing import Any
+from functools import partial
+from typing import Any, Optional
 
 import numpy as np
-import pint
 from nomad.parsing.file_parser import Quantity, TextParser
 from nomad.units import ureg
 
+from nomad_simulation_parsers.parsers.utils import (
+    open_file,
+    open_text_file,
+    parallel_map,
+)
+
 RE_FLOAT = r'[-+]?\d+\.\d*(?:[Ee][-+]\d+)?'
 RE_SYMBOL = re.compile(r'([A-Z][a-z]?)')
+RE_SCF_ITERATION = re.compile(r'(?:I| i)teration number :')
+RE_SCF_ITERATION_END = re.compile(r'\n *\n\+{10}|\+\-{10}')
+
+# minimum size in bytes of a block of SCF iterations or optimization steps to be
+# split across worker processes
+PARALLEL_MIN_SIZE = 8 * 1024**2
+# modules of an exciting run by the lines marking their start in INFO.OUT
+MODULE_MARKERS = {
+    'groundstate': (b'Groundstate module started', b'Self-consistent loop started'),
+    'hybrids': (b'Hybrids module started',),
+    'structure_optimization': (b'Structure-optimization module started',),
+}
+# size in bytes of the chunks of INFO.OUT scanned for the module markers
+SCAN_CHUNK_SIZE = 256 * 1024
+
+# columns of the SCF table by the lower case label of the line in INFO.OUT
+SCF_COLUMNS = {
+    'total energy': 'energy_total',
+    'dos at fermi energy (states/ha/cell)': 'x_exciting_dos_fermi',
+    'estimated fundamental gap': 'x_exciting_gap',
+    'wall time (seconds)': 'time_physical',
+    'rms change in effective potential (target)': (
+        'x_exciting_effective_potential_convergence'
+    ),
+    'absolute change in total energy (target)': 'x_exciting_energy_convergence',
+    'charge distance (target)': 'x_exciting_charge_convergence',
+    'abs. change in max-nonibs-force (target)': 'x_exciting_IBS_force_convergence',
+}
+# headers of the blocks of the SCF table which are stored as sub tables
+SCF_BLOCKS = {
+    'energies': 'energy_contributions',
+    'electron charges': 'charge_contributions',
+    'charges': 'charge_contributions',
+    'moments': 'moment_contributions',
+}
+
+
+def scan_modules(
+    filepath: str, marker: Optional[bytes] = None, chunk_size: int = SCAN_CHUNK_SIZE
+) -> tuple[set[str], int]:
+    """
+    Returns the names of the modules started in INFO.OUT and the number of
+    occurrences of `marker` by scanning the file for the module markers in chunks
+    without parsing it. Without a counted marker, only the header and the banner of
+    the first module are read, i.e. the scan stops at the chunk in which a module is
+    first found and the modules started after it are not returned.
+    """
+    modules: set[str] = set()
+    count = 0
+    overlap = max(len(m) for markers in MODULE_MARKERS.values() for m in markers)
+    overlap = max(overlap, len(marker or b''))
+    tail = b''
+    with open_file(filepath) as f:
+        while marker is not None or not modules:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            # markers may be split across chunks
+            boundary = tail + chunk[:overlap]
+            for module, markers in MODULE_MARKERS.items():
+                if module not in modules and any(
+                    m in chunk or m in boundary for m in markers
+                ):
+                    modules.add(module)
+            if marker is not None:
+                # only the markers split across the chunks are counted in the boundary
+                count += chunk.count(marker) + (
+                    tail[len(tail) + 1 - len(marker) :] + chunk[: len(marker) - 1]
+                ).count(marker)
+            tail = chunk[-overlap:]
+    return modules, count
 
 
 def str_to_array(val_in: str) -> np.ndarray:
@@ -19,14 +97,15 @@ def str_to_array(val_in: str) -> np.ndarray:
     return np.array(val, dtype=float)
 
 
-def str_to_atom_properties_dict(val_in: str) -> dict[str, Any]:
+def str_to_atom_properties_dict(val_in: str, units: bool = True) -> dict[str, Any]:
     """
-    Reads the atom properties from a string block.
+    Reads the atom properties from a string block. The values are bare floats and
+    arrays if `units` is False.
     """
     unit = None
-    if 'charge' in val_in:
+    if units and 'charge' in val_in:
         unit = ureg.elementary_charge
-    elif 'moment' in val_in:
+    elif units and 'moment' in val_in:
         unit = ureg.elementary_charge * ureg.bohr
 
     val = val_in.strip().split('\n')
@@ -49,17 +128,211 @@ def str_to_atom_properties_dict(val_in: str) -> dict[str, Any]:
             v[1] = v[1][0] if len(v[1]) == 1 else v[1]
             if species is None:
                 species = v[0][2]
-            atom_resolved.append((species, v[1] * unit))
+            atom_resolved.append((species, v[1] if unit is None else v[1] * unit))
 
         else:
-            vi = [float(vii) for vii in v[1].split()]
+            vi = np.array(v[1].split(), dtype=float)
             # vi = vi[0] if len(vi) == 1 else vi
-            properties[v[0].strip()] = vi * unit
+            properties[v[0].strip()] = vi if unit is None else vi * unit
 
     properties['atom_resolved'] = atom_resolved
     return properties
 
 
+def read_scf_iteration(iteration: str) -> dict[tuple[str, ...], Any]:
+    """
+    Reads the values of a single SCF iteration keyed by the column of the SCF table
+    and, for the contributions, the block and label.
+    """
+    values: dict[tuple[str, ...], Any] = {}
+    block = None
+    for line in iteration.split('\n'):
+        name, _, value = line.partition(':')
+        name = ' '.join(name.split())
+        label = name.lower()
+        if label.startswith('_'):
+            # the energy contributions follow the total energy
+            block = 'energy_contributions'
+            continue
+        if label in SCF_BLOCKS:
+            block = SCF_BLOCKS[label]
+            continue
+        try:
+            value = [float(v) for v in strip_parentheses(value)]
+        except ValueError:
+            continue
+        if not value:
+            continue
+        value = value[0] if len(value) == 1 else value
+        if label in SCF_COLUMNS:
+            values[(SCF_COLUMNS[label],)] = value
+            if label != 'total energy':
+                block = None
+        elif block is not None and label.startswith('atom'):
+            values.setdefault((block, 'atom_resolved'), []).append(value)
+        elif block is not None:
+            values[(block, name)] = value
+    return values
+
+
+def read_scf_iterations(iterations: list[str]) -> list[dict[tuple[str, ...], Any]]:
+    """
+    Reads the values of a batch of SCF iterations, see `read_scf_iteration`.
+    """
+    return [read_scf_iteration(iteration) for iteration in iterations]
+
+
+def stack_padded(values: list) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Stacks values of different shapes, e.g. atom resolved values of iterations with a
+    different number of atoms or a vector given as a single number, into one array of
+    their common shape. Returns the array and the mask of the padding.
+    """
+    arrays = [np.array(value, dtype=float) for value in values]
+    ndim = max(array.ndim for array in arrays)
+    arrays = [
+        array.reshape(array.shape + (1,) * (ndim - array.ndim)) for array in arrays
+    ]
+    shape = np.max([array.shape for array in arrays], axis=0)
+    data = np.zeros((len(arrays), *shape))
+    mask = np.ones(data.shape, dtype=bool)
+    for n, array in enumerate(arrays):
+        region = (n, *(slice(0, size) for size in array.shape))
+        data[region] = array
+        mask[region] = False
+    return data, mask
+
+
+def str_to_scf_table(
+    val_in: str, workers: int = 1, min_size: int = PARALLEL_MIN_SIZE
+) -> dict[str, Any]:
+    """
+    Reads the SCF iterations from a string block in a single pass into a table of
+    one masked array per quantity, with the iterations along the first axis. Values
+    missing in an iteration are masked. The energy, charge and moment contributions
+    are sub tables keyed by their label, as in `str_to_energy_dict`, and the atom
+    resolved values are stored under `atom_resolved`. All values are bare floats in
+    atomic units. Values of a different shape in some iterations are padded to the
+    common shape of the column and masked, columns whose values cannot be stacked,
+    e.g. ragged within an iteration, are left out. Blocks of at least `min_size`
+    characters are read by `workers`
+    processes, each of which reads one contiguous batch of the iterations.
+    """
+    columns: dict[tuple[str, ...], tuple[list[int], list]] = {}
+    iterations = []
+    for iteration in RE_SCF_ITERATION.split(val_in)[1:]:
+        end = RE_SCF_ITERATION_END.search(iteration)
+        iterations.append(iteration[: end.start()] if end else iteration)
+    if workers > 1 and len(val_in) >= min_size:
+        batch_size = -(-len(iterations) // workers)
+        batches = [
+            iterations[start : start + batch_size]
+            for start in range(0, len(iterations), batch_size)
+        ]
+        iterations_values = [
+            values
+            for batch in parallel_map(read_scf_iterations, batches, workers)
+            for values in batch
+        ]
+    else:
+        iterations_values = read_scf_iterations(iterations)
+    for n, values in enumerate(iterations_values):
+        for key, value in values.items():
+            indices, column = columns.setdefault(key, ([], []))
+            indices.append(n)
+            column.append(value)
+
+    table: dict[str, Any] = {}
+    for key, (indices, column) in columns.items():
+        try:
+            column_values = np.array(column, dtype=float)
+            column_mask = np.zeros(column_values.shape, dtype=bool)
+        except ValueError:
+            try:
+                column_values, column_mask = stack_padded(column)
+            except ValueError:
+                continue
+        data = np.zeros((len(iterations), *column_values.shape[1:]))
+        mask = np.ones(data.shape, dtype=bool)
+        data[indices] = column_values
+        mask[indices] = column_mask
+        if len(key) == 1:
+            table[key[0]] = np.ma.MaskedArray(data, mask=mask)
+        else:
+            table.setdefault(key[0], {})[key[1]] = np.ma.MaskedArray(data, mask=mask)
+    return table
+
+
+def to_results(value: Any) -> Any:
+    """
+    Converts the parsers in a parsed value into plain dicts of their results.
+    """
+    if isinstance(value, TextParser):
+        return {key: to_results(val) for key, val in value.parse()._results.items()}
+    if isinstance(value, list):
+        return [to_results(val) for val in value]
+    return value
+
+
+# quantities of the blocks parsed in the worker processes by the reader options and
+# the path of the block quantity
+_block_quantities: dict[tuple, list[Quantity]] = {}
+
+
+def parse_block(options: tuple, path: tuple[str, ...], block: bytes) -> dict:
+    """
+    Parses a block of the repeated sub-parser quantity of InfoReader at `path` with
+    the reader `options`. The quantities are built in the worker process as the
+    parsers cannot be pickled.
+    """
+    key = (options, path)
+    if key not in _block_quantities:
+        quantities = InfoReader(**dict(options), workers=1).quantities
+        for name in path:
+            quantity = next(q for q in quantities if q.name == name)
+            quantities = quantity.sub_parser.quantities
+        _block_quantities[key] = quantities
+    parser = TextParser(quantities=_block_quantities[key], findlazy=False)
+    parser._file_handler = block
+    return to_results(parser)
+
+
+class BlockTextParser(TextParser):
+    """
+    TextParser which parses the blocks of its repeated sub-parser quantities in a
+    pool of `workers` processes if its text has at least `min_size` bytes. The blocks
+    are parsed with the quantities of the InfoReader with `options` at `path` and the
+    parsed blocks are plain dicts.
+    """
+
+    def copy(self):
+        return self.__class__(
+            self.mainfile, self.quantities, self.logger, **self._kwargs
+        )
+
+    def _parse_quantity(self, quantity: Quantity):
+        workers = self._kwargs.get('workers', 1)
+        if (
+            not quantity.repeats
+            or quantity.sub_parser is None
+            or workers <= 1
+            or len(self.file_mmap) < self._kwargs.get('min_size', PARALLEL_MIN_SIZE)
+        ):
+            return super()._parse_quantity(quantity)
+
+        blocks = [
+            b' '.join([g for g in res.groups() if g])
+            for res in quantity.re_pattern.finditer(self.file_mmap)
+        ]
+        if blocks:
+            path = (*self._kwargs.get('path', ()), quantity.name)
+            self._results[quantity.name] = parallel_map(
+                partial(parse_block, self._kwargs.get('options', ()), path),
+                blocks,
+                workers,
+            )
+
+
 def strip_parentheses(val_in: str) -> str:
     """
     Strips parentheses from string.
@@ -67,7 +340,11 @@ def strip_parentheses(val_in: str) -> str:
     return val_in.strip().replace('(', '').replace(')', '').split()
 
 
-def str_to_energy_dict(val_in: str) -> dict[str, pint.Quantity]:
+def str_to_energy_dict(val_in: str, units: bool = True) -> dict[str, Any]:
+    """
+    Reads the energy contributions from a string block. The values are bare floats in
+    hartree if `units` is False.
+    """
     val = val_in.strip().split('\n')
     energies = dict()
     min_n = 2
@@ -75,12 +352,32 @@ def str_to_energy_dict(val_in: str) -> dict[str, pint.Quantity]:
         v = val_n.split(':')
         if len(v) < min_n:
             continue
-        energies[v[0].strip()] = float(v[1]) * ureg.hartree
+        energies[v[0].strip()] = float(v[1])
+    if units:
+        energies = {key: val * ureg.hartree for key, val in energies.items()}
     return energies
 
 
 class InfoReader(TextParser):
+    """
+    Reader for the exciting INFO.OUT. With `units=False`, the values are returned as
+    bare floats and arrays and the units are instead collected by quantity name in
+    `quantity_units` to be applied when the values are written to the archive. With
+    `summary=True`, the individual SCF iterations and optimization steps are skipped
+    and only the header, the initialization and the final blocks are read. The SCF
+    iterations and optimization steps of modules of at least `parallel_min_size`
+    bytes are parsed by `workers` processes, by default one per CPU.
+    """
+
+    def open(self, mainfile: str):
+        return open_text_file(mainfile)
+
     def init_quantities(self):
+        units = self._kwargs.get('units', True)
+        summary = self._kwargs.get('summary', False)
+        workers = self._kwargs.get('workers') or os.cpu_count() or 1
+        min_size = self._kwargs.get('parallel_min_size')
+        min_size = PARALLEL_MIN_SIZE if min_size is None else min_size
         self._quantities = [
             Quantity(
                 'program_version',
@@ -300,7 +597,7 @@ class InfoReader(TextParser):
             Quantity(
                 'energy_contributions',
                 r'(?:Energies|_)([\+\-\s\w\.\:]+?)\n *(?:DOS|Density)',
-                str_operation=str_to_energy_dict,
+                str_operation=partial(str_to_energy_dict, units=units),
                 repeats=False,
                 convert=False,
             ),
@@ -314,14 +611,14 @@ class InfoReader(TextParser):
             Quantity(
                 'charge_contributions',
                 r'(?:Charges|Electron charges\s*\:*\s*)([\-\s\w\.\:\(\)]+?)\n *[A-Z\+]',
-                str_operation=str_to_atom_properties_dict,
+                str_operation=partial(str_to_atom_properties_dict, units=units),
                 repeats=False,
                 convert=False,
             ),
             Quantity(
                 'moment_contributions',
                 r'(?:Moments\s*\:*\s*)([\-\s\w\.\:\(\)]+?)\n *[A-Z\+]',
-                str_operation=str_to_atom_properties_dict,
+                str_operation=partial(str_to_atom_properties_dict, units=units),
                 repeats=False,
                 convert=False,
             ),
@@ -374,10 +671,20 @@ class InfoReader(TextParser):
 
         module_quantities = [
             Quantity(
-                'scf_iteration',
-                r'(?:I| i)teration number :([\s\S]+?)(?:\n *\n\+{10}|\+\-{10})',
-                sub_parser=TextParser(quantities=scf_quantities),
-                repeats=True,
+                'scf_iterations',
+                r'((?:I| i)teration number :[\s\S]+)',
+                str_operation=partial(
+                    str_to_scf_table, workers=workers, min_size=min_size
+                ),
+                repeats=False,
+                convert=False,
+            ),
+            Quantity(
+                'converged',
+                r'(Convergence targets achieved|Reached self-consistent loops maximum)',
+                str_operation=lambda x: x.startswith('Convergence'),
+                repeats=False,
+                convert=False,
             ),
             Quantity(
                 'final',
@@ -495,7 +802,7 @@ class InfoReader(TextParser):
                 'structure_optimization',
                 r'Structure\-optimization module started([\s\S]+?)Structure'
                 r'\-optimization module stopped',
-                sub_parser=TextParser(
+                sub_parser=BlockTextParser(
                     quantities=[
                         Quantity(
                             'optimization_step',
@@ -504,6 +811,13 @@ class InfoReader(TextParser):
                             sub_parser=TextParser(quantities=optimization_quantities),
                             repeats=True,
                         ),
+                        Quantity(
+                            'converged',
+                            r'(Force convergence target achieved)',
+                            str_operation=lambda x: True,
+                            repeats=False,
+                            convert=False,
+                        ),
                         Quantity(
                             'final',
                             r'Force convergence target achieved([\s\S]+?Opt)',
@@ -543,7 +857,11 @@ class InfoReader(TextParser):
                             dtype=float,
                             unit=ureg.hartree / ureg.bohr,
                         ),
-                    ]
+                    ],
+                    workers=workers,
+                    min_size=min_size,
+                    options=(('units', units),),
+                    path=('structure_optimization',),
                 ),
                 repeats=False,
             )
@@ -567,6 +885,34 @@ class InfoReader(TextParser):
             )
         )
 
+        if summary:
+            # the module blocks are still matched to find their final blocks
+            for quantity in self._quantities:
+                if quantity.sub_parser is not None:
+                    quantity.sub_parser.quantities = [
+                        q
+                        for q in quantity.sub_parser.quantities
+                        if q.name not in ['scf_iterations', 'optimization_step']
+                    ]
+
+        # units of the values converted by the str_operation functions
+        self.quantity_units = dict(
+            energy_contributions=ureg.hartree,
+            charge_contributions=ureg.elementary_charge,
+            moment_contributions=ureg.elementary_charge * ureg.bohr,
+        )
+
+        def collect_units(quantities: list[Quantity]):
+            for quantity in quantities:
+                if quantity.unit is not None:
+                    self.quantity_units.setdefault(quantity.name, quantity.unit)
+                    if not units:
+                        quantity.unit = None
+                if quantity.sub_parser is not None:
+                    collect_units(quantity.sub_parser.quantities)
+
+        collect_units(self._quantities)
+
     def get_atom_labels(self, section):
         labels = section.get('symbols')
 
@@ -612,27 +958,19 @@ class InfoReader(TextParser):
             cell = self.get_initialization_parameter('lattice_vectors')
             if cell is None:
                 return
-            positions = np.dot(positions, cell.magnitude)
+            positions = np.dot(positions, getattr(cell, 'magnitude', cell))
 
         return positions * ureg.bohr
 
     def get_scf_threshold(self, name):
-        reference = self.get('groundstate', self.get('hybrids', {}))
-        return reference.get('scf_iteration', [{}])[-1].get(name, [None, None])[-1]
-
-    def get_scf_quantity(self, name):
-        n_scf = len(self.get('energy_total_scf_iteration', []))
-        quantity = self.get(f'{name}_scf_iteration')
-        if quantity is None:
+        convergence = self.get_scf_quantity(name)
+        if convergence is None or not len(convergence) or convergence.mask[-1, -1]:
             return
+        return convergence[-1, -1]
 
-        # this is really problematic if some scf steps dont have the quantity
-        # the only thing that we can do is to assume that the first steps are the
-        # ones with the missing quantity
-        if len(quantity) < n_scf:
-            quantity = [None] * (n_scf - len(quantity)) + quantity
-
-        return quantity
+    def get_scf_quantity(self, name):
+        reference = self.get('groundstate', self.get('hybrids', {}))
+        return reference.get('scf_iterations', {}).get(name)
 
     def get_xc_functional_name(self):
         # TODO expand list to include other xcf
@@ -671,9 +1009,8 @@ class InfoReader(TextParser):
         return n_spin
 
     def get_unit_cell_volume(self):
-        return self.get('initialization', {}).get(
-            'x_exciting_unit_cell_volume', 1.0 * ureg.bohr**3
-        )
+        volume = self.get('initialization', {}).get('x_exciting_unit_cell_volume', 1.0)
+        return volume if hasattr(volume, 'units') else volume * ureg.bohr**3
 
     def get_initialization_parameter(self, key, default=None):
         return self.get('initialization', {}).get(key, default)
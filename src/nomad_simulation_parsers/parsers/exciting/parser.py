@@ -1,7 +1,9 @@
+import gc
 import os
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Optional
 
 import numpy as np
+from lxml import etree
 
 if TYPE_CHECKING:
     from nomad.datamodel.datamodel import (
@@ -11,23 +13,115 @@ if TYPE_CHECKING:
         BoundLogger,
     )
 
-from nomad.parsing.file_parser import Parser
+from nomad.config import config
 from nomad.parsing.file_parser.mapping_parser import (
-    MetainfoParser,
+    MappingParser,
     TextParser,
     XMLParser,
 )
 from nomad.units import ureg
-from nomad_simulations.schema_packages.general import Simulation
+from nomad.utils import get_logger
 
 import nomad_simulation_parsers.schema_packages.exciting  # noqa
-from nomad_simulation_parsers.parsers.utils import search_files
+from nomad_simulation_parsers.parsers import EntryPoint, exciting_parser_entry_point
+from nomad_simulation_parsers.parsers.base import (
+    BaseParser,
+    ParseContext,
+    build_mappers,
+)
+from nomad_simulation_parsers.parsers.utils import (
+    ArrayBuffer,
+    compile_patterns,
+    decompressed,
+    memoize_transform,
+    open_file,
+    read_blocks,
+    read_stacked_blocks,
+)
 
+from .band_edges import (
+    FERMI_ENERGY_TOLERANCE,
+    OCCUPANCY_TOLERANCE,
+    get_band_edges,
+)
+from .cost_model import (
+    COST_MODEL,
+    OPTIMIZATION_STEP_MARKER,
+    CostModel,
+    read_features,
+)
 from .eigval_reader import EigvalReader
-from .info_reader import InfoReader
+from .gw_reader import EvalqpReader, GWInfoReader
+from .info_reader import InfoReader, scan_modules
+from .plot_reader import (
+    RE_PDOS_FILE,
+    file_indices,
+    find_band_characters,
+    find_pdos,
+)
+from .previews import get_previews
+from .species_reader import SPECIES_CACHE
+from .spectra_reader import find_spectra, read_spectra
+
+# annotation keys of the auxiliary files, which also name their parsing stages
+AUXILIARY_FILES = {
+    'input.xml': 'input_xml',
+    'EIGVAL.OUT': 'eigval',
+    'bandstructure.xml': 'bandstructure_xml',
+    'dos.xml': 'dos_xml',
+    'EVALQP.DAT': 'evalqp',
+    'GW_INFO.OUT': 'gw_info',
+    'TDOS.OUT': 'dos_out',
+    'BAND.OUT': 'band_out',
+}
+# text plot files only read if the XML file with the same data is missing
+XML_FALLBACKS = {'dos.xml': 'TDOS.OUT', 'bandstructure.xml': 'BAND.OUT'}
+# groups of files found by a name pattern: the optics spectra, which is also their
+# annotation key and stage, and the projected densities of states read with TDOS.OUT
+SPECTRA = 'spectra'
+PDOS = 'PDOS'
+# auxiliary files written by the modules started in INFO.OUT and by the tasks of
+# input.xml, the optics spectra are written by the xs task
+TASK_FILES = {
+    'groundstate': ['EIGVAL.OUT'],
+    'hybrids': ['EIGVAL.OUT'],
+    'bandstructure': ['bandstructure.xml'],
+    'dos': ['dos.xml'],
+    'gw': ['EVALQP.DAT', 'GW_INFO.OUT'],
+}
+# self-energy components of EVALQP.DAT stored as contributions to the quasiparticle
+# energies
+QP_CONTRIBUTIONS = ['E_KS', 'Sx', 'Re(Sc)', 'Im(Sc)', 'Vxc']
+# stages whose mappers include nested sections, the projected densities of states and
+# the self-energy components
+NESTED_STAGES = {'dos_out', 'evalqp'}
+
+
+def get_entry_point() -> EntryPoint:
+    """
+    Returns the configured exciting parser entry point or, if the plugins are not
+    loaded, the default one.
+    """
+    try:
+        return config.get_plugin_entry_point(
+            'nomad_simulation_parsers.parsers:exciting_parser_entry_point'
+        )
+    except Exception:
+        return exciting_parser_entry_point
 
 
 class InfoParser(TextParser):
+    # read the species definitions from the species files next to INFO.OUT
+    read_species_files: bool = True
+    # only keep the first, the last and every optimization_stride-th optimization
+    # step in the configurations and store the full trajectory in pages of
+    # trajectory_page_size steps, all steps are kept if 0
+    optimization_stride: int = 0
+    trajectory_page_size: int = 100
+    _species: tuple[list[dict[str, Any]], np.ndarray] = None
+    _distinct_species: list[dict[str, Any]] = None
+    _species_key: tuple = None
+
     def get_xc_functionals(self, xc_type: int) -> list[dict[str, Any]]:
         xc_functional_map = {
             2: ['LDA_C_PZ', 'LDA_X_PZ'],
@@ -45,6 +139,7 @@ class InfoParser(TextParser):
         }
         return [dict(libxc=name) for name in xc_functional_map.get(xc_type, [])]
 
+    @memoize_transform
     def get_forces(self, source: dict[str, Any]) -> dict[str, Any]:
         return dict(
             forces=source.get('forces'),
@@ -52,22 +147,114 @@ class InfoParser(TextParser):
             rank=[3],
         )
 
+    @memoize_transform
     def get_configurations(self, root: dict[str, Any]) -> list[dict[str, Any]]:
         configurations = [
             root[key] for key in ['groundstate', 'hybrid'] if root.get(key)
         ]
         optimization = root.get('structure_optimization')
         if optimization:
-            configurations.extend(optimization.get('optimization_step', []))
+            steps = optimization.get('optimization_step', [])
+            configurations.extend(steps[n] for n in self.get_kept_steps(len(steps)))
             configurations.append(optimization)
         return configurations
 
-    def get_atoms(self, source: dict[str, Any]) -> dict[str, Any]:
+    def get_kept_steps(self, n_steps: int) -> list[int]:
+        """
+        Returns the indices of the optimization steps kept in the configurations.
+        """
+        stride = self.optimization_stride
+        if not stride:
+            return list(range(n_steps))
+        return [n for n in range(n_steps) if n % stride == 0 or n == n_steps - 1]
+
+    @memoize_transform
+    def get_trajectory(self, root: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """
+        Returns the full trajectory of the structure optimization in pages of stacked
+        positions, energies and forces if not all steps are kept in the
+        configurations.
+        """
+        optimization = root.get('structure_optimization') or {}
+        steps = optimization.get('optimization_step', [])
+        kept_steps = self.get_kept_steps(len(steps))
+        if len(kept_steps) == len(steps):
+            return None
+        page_size = self.trajectory_page_size
+        pages = []
+        for start in range(0, len(steps), page_size):
+            page = steps[start : start + page_size]
+            positions = np.array(
+                [self.get_positions(step.get('atomic_positions', {})) for step in page]
+            )
+            forces = [step.get('forces') for step in page]
+            pages.append(
+                dict(
+                    first_step=start,
+                    n_steps=len(page),
+                    n_atoms=positions.shape[1],
+                    positions=positions,
+                    total_energies=np.array(
+                        [step.get('energy_total', np.nan) for step in page],
+                        dtype=float,
+                    ),
+                    forces=np.array(forces, dtype=float)
+                    if all(f is not None for f in forces)
+                    else None,
+                )
+            )
+        return dict(
+            n_steps=len(steps),
+            page_size=page_size,
+            kept_steps=np.array(kept_steps, dtype=np.int32),
+            pages=pages,
+        )
+
+    def get_species(self, source: dict[str, Any]) -> tuple[list[dict], np.ndarray]:
+        """
+        Returns the distinct species and the index of the species of each atom.
+        """
+        initial = self.data.get('initialization', {})
+        if initial.get('species'):
+            # species from the initialization are the same for all configurations
+            if self._species is None:
+                exclude = ['positions', 'positions_format', 'radial_points']
+                species = [
+                    {k: v for k, v in s.items() if k not in exclude}
+                    for s in initial['species']
+                ]
+                if self.read_species_files and self.filepath:
+                    directory = os.path.dirname(self.filepath)
+                    for specie in species:
+                        if specie.get('file'):
+                            specie['definition'] = SPECIES_CACHE.get(
+                                os.path.join(directory, specie['file'].strip())
+                            )
+                indices = np.repeat(
+                    np.arange(len(species), dtype=np.int32),
+                    [len(s.get('positions', [])) for s in initial['species']],
+                )
+                self._species = species, indices
+            return self._species
+        symbols = source.get('symbols')
+        unique = {symbol: n for n, symbol in enumerate(dict.fromkeys(symbols))}
+        return (
+            [dict(symbol=symbol) for symbol in unique],
+            np.array([unique[symbol] for symbol in symbols], dtype=np.int32),
+        )
+
+    @memoize_transform
+    def get_positions(self, source: dict[str, Any]) -> np.ndarray:
+        """
+        Returns the cartesian positions of the atoms of a configuration or, if not
+        given, of the initial structure.
+        """
         positions = source.get('positions')
         initial = self.data.get('initialization', {})
         lattice_vectors = initial.get('lattice_vectors')
+        lattice_vectors = getattr(lattice_vectors, 'magnitude', lattice_vectors)
         if positions is not None and source.get('positions_format') == 'lattice':
-            positions = np.dot(positions, lattice_vectors.magnitude)
+            positions = np.dot(positions, lattice_vectors)
         if positions is None:
             positions = []
             for species in initial.get('species', []):
@@ -75,24 +262,108 @@ class InfoParser(TextParser):
                 if species.get('positions_format') == 'lattice':
                     positions_specie = np.dot(positions_specie, lattice_vectors)
                 positions.extend(positions_specie)
-        atoms = []
-        exclude = ['positions', 'positions_format', 'radial_points']
-        for species in initial.get('species', []):
-            atom = {k: v for k, v in species.items() if k not in exclude}
-            atoms.extend([atom] * len(species.get('positions', [])))
-        if not atoms:
-            atoms = [dict(symbol=s) for s in source.get('symbols')]
-        return dict(positions=np.array(positions, dtype=float), atoms=atoms)
-
+        return np.array(positions, dtype=float)
+
+    def get_distinct_species(self, root: dict[str, Any]) -> list[dict[str, Any]]:
+        """
+        Returns the distinct species of all configurations, which are stored once in
+        the simulation and referenced by the cells.
+        """
+        if self._distinct_species is None:
+            if self.data.get('initialization', {}).get('species'):
+                self._distinct_species = self.get_species({})[0]
+            else:
+                symbols = dict.fromkeys(
+                    symbol
+                    for configuration in self.get_configurations(self.data)
+                    for symbol in (configuration.get('atomic_positions') or {}).get(
+                        'symbols', []
+                    )
+                )
+                self._distinct_species = [dict(symbol=symbol) for symbol in symbols]
+        return self._distinct_species
+
+    @memoize_transform
+    def get_atoms(self, source: dict[str, Any]) -> dict[str, Any]:
+        species, indices = self.get_species(source)
+        # the details of the species are only stored once in the simulation, each
+        # cell references them and gives the index of the species of each atom
+        distinct = [s.get('symbol') for s in self.get_distinct_species(self.data)]
+        atoms = dict(
+            positions=self.get_positions(source),
+            species=[
+                f'#/data/x_exciting_species/{distinct.index(s.get("symbol"))}'
+                for s in species
+            ],
+            species_indices=indices,
+        )
+        # the per-atom states with the chemical symbols are only written for the
+        # first of the configurations sharing the same species list
+        key = (tuple(s.get('symbol') for s in species), indices.tobytes())
+        if key != self._species_key:
+            self._species_key = key
+            atoms['atoms'] = [dict(symbol=species[n].get('symbol')) for n in indices]
+        return atoms
+
+
+class CompressedXMLParser(XMLParser):
+    """
+    XMLParser which also reads gz, bz2, xz and zstd compressed files.
+    """
+
+    def to_dict(self, **kwargs) -> dict[str, Any]:
+        filepath = self.filepath
+        if filepath is None:
+            return super().to_dict(**kwargs)
+        # XMLParser.to_dict iterates over a plain file so compressed files are
+        # decompressed in chunks into a temporary file
+        with decompressed(filepath) as path:
+            self._filepath = path
+            try:
+                return super().to_dict(**kwargs)
+            finally:
+                self._filepath = filepath
+
+    def load_file(self) -> etree._ElementTree:
+        try:
+            with open_file(self.filepath) as f:
+                return etree.parse(f)
+        except Exception:
+            self.logger.error('Cannot read XML file')
+
+
+class InputXMLParser(CompressedXMLParser):
+    def get_tasks(self) -> set[str]:
+        """
+        Returns the tasks of the input: the top-level elements, e.g. groundstate, gw or
+        xs, and the properties, e.g. bandstructure or dos.
+        """
+        tree = self.data_object
+        if tree is None:
+            return set()
+        root = tree.getroot()
+        tasks = {element.tag for element in root if isinstance(element.tag, str)}
+        for properties in root.iterfind('properties'):
+            tasks.update(e.tag for e in properties if isinstance(e.tag, str))
+        return tasks
 
-class InputXMLParser(XMLParser):
     def get_xc_functionals(self, xc_funcs: dict[str, str]) -> list[dict[str, str]]:
         return [dict(libxc=val, type=key) for key, val in xc_funcs.items()]
 
 
-class BandstructureXMLParser(XMLParser):
+class BandstructureXMLParser(CompressedXMLParser):
     n_spin = 1
-
+    # storage dtype of the band energies
+    precision: dict[str, str] = {}
+    # energy (Hartree) separating the occupied from the unoccupied states, the band
+    # energies of exciting are given relative to the Fermi energy of INFO.OUT
+    fermi_energy: float = 0.0
+    # write the band gaps to the outputs, off if they are taken from EIGVAL.OUT
+    band_gaps: bool = True
+    # allocator of the band energies, on the heap by default
+    buffer: ArrayBuffer = ArrayBuffer()
+
+    @memoize_transform
     def get_bandstructures(self, source: dict[str, Any]) -> list[dict[str, Any]]:
         # TODO determine format for spin pol case
         energies = [
@@ -101,32 +372,187 @@ class BandstructureXMLParser(XMLParser):
         n_spin = source.get('n_spin', self.n_spin)
         n_band = len(source['bandstructure']['band']) // n_spin
         n_kpoints = len(source['bandstructure']['band'][0]['point'])
-        energies = np.array(energies, dtype=float).reshape((n_spin, n_band, n_kpoints))
+        energies = self.buffer.array(
+            energies, dtype=self.precision.get('band_energies', 'float64')
+        ).reshape((n_spin, n_band, n_kpoints))
+        # band edges and gaps of each spin channel from the (n_spin, n_kpoints,
+        # n_band) view of the energies
+        energies = energies.transpose((0, 2, 1))
+        edges = get_band_edges(
+            energies, energies <= self.fermi_energy + FERMI_ENERGY_TOLERANCE
+        )
         return [
-            dict(energies=e.T * ureg.hartree, n_states=n_band, n_kpoints=n_kpoints)
-            for e in energies
+            dict(
+                energies=e * ureg.hartree,
+                n_states=n_band,
+                n_kpoints=n_kpoints,
+                variables=dict(n_points=n_kpoints),
+                spin_channel=spin if n_spin > 1 else None,
+                previews=get_previews(e),
+                **edges[spin],
+            )
+            for spin, e in enumerate(energies)
+        ]
+
+    def get_band_gaps(self, source: dict[str, Any]) -> list[dict[str, Any]]:
+        if not self.band_gaps:
+            return []
+        return [
+            gap
+            for bandstructure in self.get_bandstructures(source)
+            for gap in bandstructure['band_gaps']
         ]
 
+    @memoize_transform
     def reshape_coords(self, source: list[str]) -> np.ndarray:
         return np.array([v.split() for v in source], dtype=float)
 
 
-class DosXMLParser(XMLParser):
-    def to_float(self, source: list[str]) -> np.ndarray:
-        return np.array(source, dtype=float)
+class DosXMLParser(CompressedXMLParser):
+    # storage dtypes of the densities of states and their energies
+    precision: dict[str, str] = {}
+    # allocator of the densities of states and their energies, on the heap by default
+    buffer: ArrayBuffer = ArrayBuffer()
+
+    @memoize_transform
+    def to_dos(self, source: list[str]) -> np.ndarray:
+        return self.buffer.array(source, dtype=self.precision.get('dos', 'float64'))
 
+    @memoize_transform
+    def to_dos_energies(self, source: list[str]) -> np.ndarray:
+        return self.buffer.array(
+            source, dtype=self.precision.get('dos_energies', 'float64')
+        )
+
+    @memoize_transform
     def get_dos(self, source: list[dict[str, Any]]) -> dict[str, Any]:
         return dict(
-            dos=np.array([p['@dos'] for p in source.get('point', [])], dtype=float),
-            energy=np.array([p['@e'] for p in source.get('point', [])], dtype=float),
+            dos=self.to_dos([p['@dos'] for p in source.get('point', [])]),
+            energy=self.to_dos_energies([p['@e'] for p in source.get('point', [])]),
         )
 
+    @memoize_transform
+    def get_dos_previews(self, source: dict[str, Any]) -> list[dict[str, Any]]:
+        dos = self.get_dos(source)
+        return get_previews(dos['dos'], dos['energy'])
+
+
+class BandTextParser(MappingParser):
+    """
+    Parser for the band energies in the exciting text plot file BAND.OUT or, if it is
+    missing, in one of the atom resolved BAND_S*_A*.OUT files, which hold the same
+    energies.
+    """
+
+    # storage dtype of the band energies
+    precision: dict[str, str] = {}
+
+    def load_file(self) -> np.ndarray:
+        return read_blocks(
+            self.filepath, dtype=self.precision.get('band_energies', 'float64')
+        )
+
+    def to_dict(self, **kwargs) -> dict[str, Any]:
+        blocks = self.data_object
+        if blocks.size == 0:
+            return {}
+        n_band, n_kpoints = blocks.shape[:2]
+        energies = blocks[:, :, 1].T
+        return dict(
+            bandstructure=[
+                dict(energies=energies, n_states=n_band, n_kpoints=n_kpoints)
+            ]
+        )
+
+    def from_dict(self, dct: dict[str, Any]):
+        pass
+
+
+class DosTextParser(MappingParser):
+    """
+    Parser for the total density of states in the exciting text plot file TDOS.OUT
+    and the projected densities of states of the PDOS_S*_A*.OUT files on the same
+    energy grid. The latter are stacked into one (n_atoms, n_spin, n_lm, n_points)
+    array and stored as atom projected densities of states.
+    """
+
+    pdos_files: list[str] = []
+    # storage dtypes of the densities of states and their energies
+    precision: dict[str, str] = {}
+
+    def load_file(self) -> np.ndarray:
+        # the energies and the densities of states are read in the wider of their
+        # storage dtypes, only the other column is cast
+        dtype = np.promote_types(
+            self.precision.get('dos', 'float64'),
+            self.precision.get('dos_energies', 'float64'),
+        )
+        return read_blocks(self.filepath, dtype=dtype)
+
+    def to_dict(self, **kwargs) -> dict[str, Any]:
+        tdos = self.data_object
+        if tdos.size == 0:
+            return {}
+        n_spin, n_points = tdos.shape[:2]
+        dtype = self.precision.get('dos', 'float64')
+        energies = tdos[0, :, 0].astype(
+            self.precision.get('dos_energies', 'float64'), copy=False
+        )
+        pdos, indices = read_stacked_blocks(self.pdos_files, dtype=dtype)
+        if pdos.shape[2] != n_points or pdos.shape[1] % n_spin:
+            pdos, indices = pdos[:0], []
+        pdos = pdos.reshape((len(indices), n_spin, -1, n_points))
+        labels = [
+            'S{:02d}_A{:04d}'.format(*file_indices(self.pdos_files[n], RE_PDOS_FILE))
+            for n in indices
+        ]
+        return dict(
+            pdos=pdos,
+            pdos_labels=labels,
+            dos=[
+                dict(
+                    n_points=n_points,
+                    energies=energies,
+                    value=tdos[spin, :, 1].astype(dtype, copy=False),
+                    spin_channel=spin if n_spin > 1 else None,
+                    projected_dos=[
+                        dict(
+                            n_points=n_points,
+                            energies=energies,
+                            value=pdos[n, spin].sum(axis=0),
+                            label=label,
+                        )
+                        for n, label in enumerate(labels)
+                    ],
+                )
+                for spin in range(n_spin)
+            ],
+        )
+
+    def from_dict(self, dct: dict[str, Any]):
+        pass
+
 
 class EigvalParser(TextParser):
+    # allocator of the eigenvalues and occupancies, on the heap by default
+    buffer: ArrayBuffer = ArrayBuffer()
+
+    @memoize_transform
     def get_eigenvalues(self, source: dict[str, Any]):
         eigs_occs = source.get('eigenvalues_occupancies')
-        eigs = np.array([v.get('eigenvalues') for v in eigs_occs])
-        occs = np.array([v.get('occupancies') for v in eigs_occs])
+        eigs = self.buffer.stack([v.get('eigenvalues') for v in eigs_occs])
+        occs = self.buffer.stack([v.get('occupancies') for v in eigs_occs])
+        k_points = source.get('k_points')
+        if k_points is not None:
+            k_points = np.array(k_points, dtype=float)[:, :3]
+        # band edges and gaps of each spin channel from the (n_spin, n_kpoints,
+        # n_states) views of the eigenvalues and occupancies
+        n_spin = len(eigs[0])
+        edges = get_band_edges(
+            eigs.transpose((1, 0, 2)),
+            occs.transpose((1, 0, 2)) > OCCUPANCY_TOLERANCE,
+            k_points,
+        )
 
         return [
             dict(
@@ -134,72 +560,383 @@ class EigvalParser(TextParser):
                 occupancies=occs[:, spin, :],
                 # n_states printed on file is actual n of states * n spin channels
                 n_states=len(eigs[0][spin]),
+                variables=dict(n_points=len(eigs)),
+                spin_channel=spin if n_spin > 1 else None,
+                **edges[spin],
             )
-            for spin in range(len(eigs[0]))
+            for spin in range(n_spin)
         ]
 
+    def get_band_gaps(self, source: dict[str, Any]) -> list[dict[str, Any]]:
+        return [
+            gap
+            for eigenvalues in self.get_eigenvalues(source)
+            for gap in eigenvalues['band_gaps']
+        ]
 
-class ExcitingParser(Parser):
-    def parse(
-        self, mainfile: str, archive: 'EntryArchive', logger: 'BoundLogger'
-    ) -> None:
-        maindir = os.path.dirname(mainfile)
-        mainbase = os.path.basename(mainfile)
 
-        # mainfile INFO.OUT parser
-        info_parser = InfoParser(text_parser=InfoReader())
-        info_parser.filepath = mainfile
+class EvalqpParser(TextParser):
+    def get_quasiparticle_eigenvalues(
+        self, source: dict[str, Any]
+    ) -> list[dict[str, Any]]:
+        columns = source.get('columns', {})
+        if 'E_GW' not in columns:
+            return []
+        n_points, n_bands = columns['E_GW'].shape
+        return [
+            dict(
+                value=columns['E_GW'],
+                n_bands=n_bands,
+                n_points=n_points,
+                label='GW',
+                quasiparticle_weights=columns.get('Znk'),
+                contributions=[
+                    dict(
+                        value=columns[label],
+                        n_bands=n_bands,
+                        n_points=n_points,
+                        label=label,
+                    )
+                    for label in QP_CONTRIBUTIONS
+                    if label in columns
+                ],
+            )
+        ]
+
 
-        data_parser = MetainfoParser(data_object=Simulation())
-        data_parser.annotation_key = 'info'
+class GWInfoParser(TextParser):
+    def get_band_gaps(self, source: dict[str, Any]) -> list[dict[str, Any]]:
+        return [
+            dict(type=gap_type, value=source[f'band_gap_{gap_type}'], label='GW')
+            for gap_type in ['indirect', 'direct']
+            if source.get(f'band_gap_{gap_type}') is not None
+        ]
 
-        info_parser.convert(data_parser)
+
+class SpectraParser(MappingParser):
+    """
+    Parser for the BSE and TDDFT spectrum files of a calculation. The files of a kind
+    sharing a frequency axis are stacked into a single (n_files, n_frequencies)
+    complex array.
+    """
+
+    files: list[str] = []
+
+    def load_file(self) -> list[str]:
+        return self.files
+
+    def to_dict(self, **kwargs) -> dict[str, Any]:
+        return dict(spectra=read_spectra(self.data_object))
+
+    def from_dict(self, dct: dict[str, Any]):
+        pass
+
+
+class ExcitingParser(BaseParser):
+    file_stages = AUXILIARY_FILES
+    nested_stages = NESTED_STAGES
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        read_ahead: bool = True,
+        summary: bool = False,
+        max_file_size: Optional[dict[str, int]] = None,
+        max_parse_time: Optional[dict[str, float]] = None,
+        workers: Optional[int] = None,
+        precision: Optional[dict[str, str]] = None,
+        optimization_stride: Optional[int] = None,
+        max_memory: Optional[int] = None,
+        parallel_min_size: Optional[int] = None,
+    ):
+        # the budgets, workers, parallel block size, precision and memory ceiling
+        # default to the options of the entry point, see `BaseParser`
+        entry_point = get_entry_point()
+        super().__init__(
+            entry_point,
+            read_ahead=read_ahead,
+            max_file_size=max_file_size,
+            max_parse_time=max_parse_time,
+            workers=workers,
+            parallel_min_size=parallel_min_size,
+            precision=precision,
+            max_memory=max_memory,
+        )
+        # only parse the metadata needed for indexing: the program, system, xc
+        # functional and final energies, skipping the SCF iterations, optimization
+        # steps and the auxiliary array files
+        self.summary = summary
+        # only keep every optimization_stride-th structure optimization step in the
+        # model systems and outputs and store the full trajectory in pages of the
+        # trajectory_page_size of the entry point, all steps are kept if not given
+        self.optimization_stride = (
+            entry_point.optimization_stride
+            if optimization_stride is None
+            else optimization_stride
+        )
+        self.trajectory_page_size = entry_point.trajectory_page_size
+
+    def estimate_cost(
+        self,
+        mainfile: str,
+        model: Optional[CostModel] = None,
+        logger: Optional['BoundLogger'] = None,
+    ) -> dict[str, Any]:
+        """
+        Estimates the wall time in seconds and the peak traced memory in bytes of
+        parsing the entry of `mainfile` without parsing it, e.g. to schedule entries
+        by cost. The auxiliary files are found as in `parse` and the cost `model` is
+        applied to their sizes and a few header values. INFO.OUT is only scanned once
+        for both the started modules and the optimization steps. Returns the
+        estimated time and memory together with the features they are estimated
+        from.
+        """
+        logger = logger if logger is not None else get_logger(__name__)
+        modules, n_steps = scan_modules(mainfile, OPTIMIZATION_STEP_MARKER)
+        auxiliary_files = self._discover(mainfile, {}, logger, modules=modules)
+        features = read_features(mainfile, auxiliary_files, n_steps=n_steps)
+        model = model if model is not None else COST_MODEL
+        return dict(**model.estimate(features), features=features)
+
+    def _read_ahead_files(self, context: ParseContext) -> list[str]:
+        # the summary mode at most reads input.xml, only if INFO.OUT has no xc
+        # functional
+        return [] if self.summary else super()._read_ahead_files(context)
+
+    def _discover(
+        self,
+        mainfile: str,
+        metrics: dict[str, Any],
+        logger: 'BoundLogger',
+        modules: Optional[set[str]] = None,
+    ) -> dict[str, list[str]]:
+        """
+        Finds the auxiliary files and file groups which the run can have produced: the
+        files of the modules started in INFO.OUT, scanned for if not given, and, once
+        input.xml is found, of its tasks. The files are searched in a few combined
+        lookups, the searched and skipped files and the directory scans are recorded
+        in `metrics`.
+        """
+        maindir = os.path.dirname(mainfile)
+        auxiliary_files: dict[str, list[str]] = {}
+        metrics.update(searched=[], directory_scans=0, levels=[])
+        if self.summary:
+            modules = set()
+        elif modules is None:
+            # the module run first, the ground state or hybrids, writes EIGVAL.OUT and
+            # the modules following it no other files, such that INFO.OUT is only
+            # scanned up to the first module banner
+            modules = scan_modules(mainfile)[0]
+        self._search(
+            [
+                'input.xml',
+                *[f for module in sorted(modules) for f in TASK_FILES.get(module, [])],
+            ],
+            maindir,
+            auxiliary_files,
+            metrics,
+            logger,
+        )
+        tasks: set[str] = set()
+        if not self.summary:
+            input_files = auxiliary_files['input.xml']
+            # without input.xml, all outputs are searched
+            tasks = (
+                InputXMLParser(filepath=input_files[0]).get_tasks()
+                if input_files
+                else {*TASK_FILES, 'xs'}
+            )
+            names = [f for task in sorted(tasks) for f in TASK_FILES.get(task, [])]
+            self._search(names, maindir, auxiliary_files, metrics, logger)
+            # the text plot files are only read without the XML files
+            names = [
+                filename
+                for xml_filename, filename in XML_FALLBACKS.items()
+                if xml_filename in auxiliary_files and not auxiliary_files[xml_filename]
+            ]
+            self._search(names, maindir, auxiliary_files, metrics, logger)
+        # separate searches of each file, as done without the modules and tasks, list
+        # at least the directories up to the level the file is found on
+        levels = metrics.pop('levels')
+        separate_scans = 0
+        for filename in AUXILIARY_FILES if not self.summary else ['input.xml']:
+            files = auxiliary_files.get(filename)
+            depth = (
+                os.path.relpath(files[0], maindir).count(os.sep)
+                if files
+                else len(levels)
+            )
+            separate_scans += sum(levels[: depth + 1])
+        metrics['avoided_scans'] = max(0, separate_scans - metrics['directory_scans'])
+        # the band energies are also given by any of the atom resolved band character
+        # files
+        if auxiliary_files.get('BAND.OUT') == []:
+            auxiliary_files['BAND.OUT'] = self._check_size(
+                'BAND.OUT', find_band_characters(maindir)[:1], logger
+            )
+            metrics['directory_scans'] += 1
+        # groups of files found in a single listing of the directory, their size
+        # budget applies to all files of the group together
+        file_groups = {}
+        if auxiliary_files.get('TDOS.OUT'):
+            file_groups[PDOS] = find_pdos(maindir)
+        if 'xs' in tasks:
+            file_groups[SPECTRA] = find_spectra(maindir)
+        metrics['directory_scans'] += len(file_groups)
+        for group in [PDOS, SPECTRA]:
+            auxiliary_files[group] = self._check_size(
+                group, file_groups.get(group, []), logger
+            )
+        metrics['skipped'] = [f for f in AUXILIARY_FILES if f not in auxiliary_files]
+        for filename in metrics['skipped']:
+            auxiliary_files[filename] = []
+        return auxiliary_files
+
+    def _parse(self, context: ParseContext, archive: 'EntryArchive') -> None:
+        # mainfile INFO.OUT parser, units are applied by the mappers
+        info_parser = InfoParser(
+            read_species_files=not self.summary,
+            optimization_stride=self.optimization_stride or 0,
+            trajectory_page_size=self.trajectory_page_size,
+            text_parser=InfoReader(
+                units=False,
+                summary=self.summary,
+                workers=self.workers,
+                parallel_min_size=self.parallel_min_size,
+            ),
+        )
+        info_parser.filepath = context.mainfile
+
+        auxiliary_files = context.auxiliary_files
+        data_parser = context.data_parser
+        self._convert_stage(context, info_parser, 'info')
 
         # read xc functionals from input.xml
         input_xml_files = (
-            search_files('input.xml', maindir, mainbase)
+            auxiliary_files['input.xml']
             if not archive.m_xpath('data.model_method[0].xc_functionals')
             else []
         )
+        # archive.data is only set at the end, the summary checks the converted data
+        if self.summary and data_parser.data_object.m_xpath(
+            'model_method[0].xc_functionals'
+        ):
+            input_xml_files = []
         if input_xml_files:
-            input_xml_parser = InputXMLParser(filepath=input_xml_files[0])
-            data_parser.annotation_key = 'input_xml'
-            input_xml_parser.convert(data_parser)
+            self._convert_auxiliary(
+                context,
+                InputXMLParser(filepath=input_xml_files[0]),
+                'input.xml',
+                update_mode='merge',
+            )
 
         # eigenvalues from eigval.out
-        eigval_files = search_files('EIGVAL.OUT', maindir, mainbase)
+        eigval_files = auxiliary_files.get('EIGVAL.OUT')
         if eigval_files:
             eigval_parser = EigvalParser(
-                filepath=eigval_files[0], text_parser=EigvalReader()
+                filepath=eigval_files[0],
+                text_parser=EigvalReader(precision=self.precision),
+                buffer=context.buffer,
             )
-            data_parser.annotation_key = 'eigval'
-            eigval_parser.convert(data_parser, update_mode='merge@-1')
-            self.eigval_parser = eigval_parser
+            self._convert_auxiliary(context, eigval_parser, 'EIGVAL.OUT')
 
         # bandstructure from bandstructure.xml
-        bandstructure_files = search_files('bandstructure.xml', maindir, mainbase)
+        bandstructure_files = auxiliary_files.get('bandstructure.xml')
         if bandstructure_files:
             bandstructure_parser = BandstructureXMLParser(
-                filepath=bandstructure_files[0]
+                filepath=bandstructure_files[0],
+                precision=self.precision,
+                band_gaps=not eigval_files,
+                buffer=context.buffer,
             )
             # TODO set n_spin from info
-            data_parser.annotation_key = 'bandstructure_xml'
-            bandstructure_parser.convert(data_parser, update_mode='merge@-1')
-            self.bandstructure_parser = bandstructure_parser
+            self._convert_auxiliary(context, bandstructure_parser, 'bandstructure.xml')
+
+        # bandstructure from BAND.OUT if bandstructure.xml is missing
+        band_files = auxiliary_files.get('BAND.OUT')
+        if band_files:
+            band_parser = BandTextParser(
+                filepath=band_files[0], precision=self.precision
+            )
+            self._convert_auxiliary(context, band_parser, 'BAND.OUT')
 
         # dos from dos.xml
-        dos_files = search_files('dos.xml', maindir, mainbase)
+        dos_files = auxiliary_files.get('dos.xml')
         if dos_files:
-            dos_parser = DosXMLParser(filepath=dos_files[0])
-            data_parser.annotation_key = 'dos_xml'
-            dos_parser.convert(data_parser, update_mode='merge@-1')
-            self.dos_parser = dos_parser
+            dos_parser = DosXMLParser(
+                filepath=dos_files[0], precision=self.precision, buffer=context.buffer
+            )
+            self._convert_auxiliary(context, dos_parser, 'dos.xml')
+
+        # dos from TDOS.OUT and PDOS_S*_A*.OUT if dos.xml is missing
+        tdos_files = auxiliary_files.get('TDOS.OUT')
+        if tdos_files:
+            dos_text_parser = DosTextParser(
+                filepath=tdos_files[0],
+                pdos_files=auxiliary_files.get(PDOS, []),
+                precision=self.precision,
+            )
+            self._convert_auxiliary(context, dos_text_parser, 'TDOS.OUT')
+
+        # BSE and TDDFT spectra
+        spectrum_files = auxiliary_files.get(SPECTRA)
+        if spectrum_files:
+            spectra_parser = SpectraParser(
+                filepath=os.path.dirname(context.mainfile), files=spectrum_files
+            )
+            self._convert_auxiliary(context, spectra_parser, SPECTRA)
+
+        self._parse_gw(context)
 
         archive.data = data_parser.data_object
 
-        self.info_parser = info_parser
         # close parsers
         # info_parser.close()
         # input_xml_parser.close()
         # eigval_parser.close()
         # data_parser.close()
+
+    def _parse_gw(self, context: ParseContext) -> None:
+        """
+        Converts the GW quasiparticle energies of EVALQP.DAT and the band gaps of
+        GW_INFO.OUT, which are stored in a separate output.
+        """
+        update_mode = 'append'
+        evalqp_files = context.auxiliary_files.get('EVALQP.DAT')
+        if evalqp_files:
+            evalqp_parser = EvalqpParser(
+                filepath=evalqp_files[0], text_parser=EvalqpReader()
+            )
+            if self._convert_auxiliary(
+                context, evalqp_parser, 'EVALQP.DAT', update_mode
+            ):
+                update_mode = 'merge@-1'
+
+        gw_info_files = context.auxiliary_files.get('GW_INFO.OUT')
+        if gw_info_files:
+            gw_info_parser = GWInfoParser(
+                filepath=gw_info_files[0], text_parser=GWInfoReader()
+            )
+            self._convert_auxiliary(context, gw_info_parser, 'GW_INFO.OUT', update_mode)
+
+
+def warmup(freeze: bool = True) -> None:
+    """
+    Builds the state shared by all parses once in the current process: the schema
+    annotations are registered on import, the regular expressions of the INFO.OUT,
+    EIGVAL.OUT and GW readers are compiled into the `re` cache, the metainfo
+    definition ids are computed and the mappers of all annotation keys are built.
+    Called in the parent of forked parser workers, the children share this state
+    copy-on-write. With `freeze`, all objects are moved out of the garbage collector
+    such that collections in the children do not write to the shared pages.
+    """
+    for text_parser in [
+        InfoReader(units=False),
+        InfoReader(units=False, summary=True),
+        EigvalReader(),
+        EvalqpReader(),
+        GWInfoReader(),
+    ]:
+        compile_patterns(text_parser)
+    build_mappers(['info', *AUXILIARY_FILES.values(), SPECTRA], NESTED_STAGES)
+    if freeze:
+        gc.freeze()
@@ -0,0 +1,33 @@
+import os
+import re
+from typing import Optional
+
+from nomad_simulation_parsers.parsers.utils import scan_files, strip_compression
+
+# species and atom resolved text plot files, e.g. PDOS_S01_A0001.OUT
+RE_PDOS_FILE = re.compile(r'^PDOS_S(\d+)_A(\d+)\.OUT$')
+RE_BAND_FILE = re.compile(r'^BAND_S(\d+)_A(\d+)\.OUT$')
+
+
+def find_pdos(directory: str) -> list[str]:
+    """
+    Returns the paths of the PDOS_S*_A*.OUT files in `directory` sorted by species and
+    atom.
+    """
+    return scan_files(directory, RE_PDOS_FILE)
+
+
+def find_band_characters(directory: str) -> list[str]:
+    """
+    Returns the paths of the BAND_S*_A*.OUT files in `directory` sorted by species and
+    atom.
+    """
+    return scan_files(directory, RE_BAND_FILE)
+
+
+def file_indices(filepath: str, pattern: re.Pattern) -> Optional[tuple[int, int]]:
+    """
+    Returns the species and atom numbers of a species and atom resolved plot file.
+    """
+    match = pattern.match(strip_compression(os.path.basename(filepath)))
+    return (int(match.group(1)), int(match.group(2))) if match else None
@@ -0,0 +1,49 @@
+from typing import Any, Optional
+
+import numpy as np
+
+# number of bins of the previews of the densities of states and band structures
+PREVIEW_RESOLUTIONS = (64, 256, 1024)
+
+
+def get_previews(
+    values: np.ndarray,
+    points: Optional[np.ndarray] = None,
+    resolutions: tuple[int, ...] = PREVIEW_RESOLUTIONS,
+) -> list[dict[str, Any]]:
+    """
+    Returns downsampled previews of `values` along its first axis, one for each
+    resolution lower than its number of points. The points are split into `n_bins`
+    contiguous bins of nearly equal size and each bin keeps the minimum and the
+    maximum of its values, such that narrow peaks, which a plain subsampling skips,
+    are still drawn.
+
+    Args:
+        values (np.ndarray): (n_points, ...) values, e.g. the density of states at
+            each energy or the band energies at each k-point
+        points (np.ndarray, optional): (n_points,) coordinates of the values, of
+            which each bin keeps the mean
+        resolutions (tuple[int]): numbers of bins of the previews
+
+    Returns:
+        list[dict]: n_points, n_bins, first_points, i.e. the index of the first point
+            of each bin, minimum, maximum and the mean points of each preview
+    """
+    n_points = len(values)
+    previews = []
+    for n_bins in sorted(resolutions):
+        if n_bins >= n_points:
+            break
+        first_points = np.arange(n_bins) * n_points // n_bins
+        preview = dict(
+            n_points=n_points,
+            n_bins=n_bins,
+            first_points=first_points,
+            minimum=np.minimum.reduceat(values, first_points, axis=0),
+            maximum=np.maximum.reduceat(values, first_points, axis=0),
+        )
+        if points is not None:
+            counts = np.diff(first_points, append=n_points)
+            preview['points'] = np.add.reduceat(points, first_points) / counts
+        previews.append(preview)
+    return previews
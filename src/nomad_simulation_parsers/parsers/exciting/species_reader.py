@@ -0,0 +1,110 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from lxml import etree
+
+from nomad_simulation_parsers.parsers.utils import open_file
+
+# number of species definitions kept in the process-wide cache
+SPECIES_CACHE_SIZE = 256
+
+
+def parse_species(content: bytes) -> dict[str, Any]:
+    """
+    Parses an exciting species file, e.g. Si.xml, into the species definition: the
+    symbol, name, atomic number and mass, the muffin-tin radius and radial points, the
+    atomic states and the type of the default basis and number of local orbitals.
+    """
+    root = etree.fromstring(content)
+    species = root if root.tag == 'sp' else root.find('sp')
+    muffin_tin = species.find('muffinTin')
+    basis = species.find('basis')
+    default = basis.find('default') if basis is not None else None
+    states = []
+    for state in species.iter('atomicState'):
+        l_number = int(state.get('l'))
+        # kappa is l + 1 for j = l + 1/2 and l for j = l - 1/2
+        kappa = int(state.get('kappa'))
+        states.append(
+            dict(
+                n_quantum_number=int(state.get('n')),
+                l_quantum_number=l_number,
+                j_quantum_number=[
+                    l_number + 0.5 if kappa > l_number else l_number - 0.5
+                ],
+                occupation=float(state.get('occ')),
+                core=state.get('core') == 'true',
+            )
+        )
+    return dict(
+        symbol=species.get('chemicalSymbol'),
+        name=species.get('name'),
+        atomic_number=round(-float(species.get('z'))),
+        mass=float(species.get('mass')),
+        muffin_tin_radius=float(muffin_tin.get('radius')),
+        radial_points=int(muffin_tin.get('radialmeshPoints')),
+        atomic_states=states,
+        basis_type=default.get('type') if default is not None else None,
+        n_local_orbitals=len(basis.findall('lo')) if basis is not None else 0,
+    )
+
+
+class SpeciesCache:
+    """
+    Least recently used cache of parsed species definitions keyed by the size and the
+    content hash of the species file, such that the standard species files copied into
+    the directories of many calculations are only parsed once per process while
+    modified files are parsed again. The cached definitions are shared and must not be
+    modified.
+    """
+
+    def __init__(self, max_size: int = SPECIES_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._definitions: OrderedDict[tuple[int, bytes], dict[str, Any]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._definitions)
+
+    def get(self, filepath: str) -> Optional[dict[str, Any]]:
+        """
+        Returns the definition of the species file or None if it cannot be read.
+        """
+        try:
+            with open_file(filepath) as f:
+                content = f.read()
+        except OSError:
+            return None
+        key = (len(content), hashlib.blake2b(content, digest_size=16).digest())
+        with self._lock:
+            definition = self._definitions.get(key)
+            if definition is not None:
+                self._definitions.move_to_end(key)
+                self.hits += 1
+                return definition
+        try:
+            definition = parse_species(content)
+        except (etree.XMLSyntaxError, AttributeError, TypeError, ValueError):
+            return None
+        with self._lock:
+            self.misses += 1
+            self._definitions[key] = definition
+            while len(self._definitions) > self.max_size:
+                self._definitions.popitem(last=False)
+        return definition
+
+    def clear(self) -> None:
+        with self._lock:
+            self._definitions.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# shared by all parsers of the process
+SPECIES_CACHE = SpeciesCache()
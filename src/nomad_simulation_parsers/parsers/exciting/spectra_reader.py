@@ -0,0 +1,90 @@
+import os
+import re
+from typing import Any
+
+import numpy as np
+from nomad.units import ureg
+
+from nomad_simulation_parsers.parsers.utils import (
+    open_file,
+    scan_files,
+    strip_compression,
+)
+
+# optics output files by kind, e.g. EPSILON_BSE-singlet-TDA-BAR_SCR-full_OC11.OUT
+RE_SPECTRUM_FILE = re.compile(r'^(EPSILON|LOSS|EXCITON)_(.+)\.OUT$')
+# comment lines and the leading block of comment and blank lines
+RE_COMMENT = re.compile(rb'^[ \t]*#.*$', re.MULTILINE)
+RE_HEADER = re.compile(rb'(?:[ \t]*(?:#[^\n]*)?\n)*')
+# columns of the frequency axis and the real and imaginary parts of the value by
+# kind, None if the value is real
+SPECTRUM_COLUMNS = {
+    'EPSILON': (0, 1, 2),
+    'LOSS': (0, 1, None),
+    'EXCITON': (1, 4, 5),
+}
+# energy unit given in Hartree in the header, e.g. 0.3674932539796232E-01 for eV
+RE_ENERGY_UNIT = re.compile(rb'Energy unit:\s*([-+\d.Ee]+)\s*Hartree')
+EV_TO_HARTREE = ureg.convert(1.0, 'eV', 'hartree')
+
+
+def find_spectra(directory: str) -> list[str]:
+    """
+    Returns the paths of the optics spectrum files in `directory` sorted by name.
+    """
+    return scan_files(directory, RE_SPECTRUM_FILE)
+
+
+def read_columns(filepath: str) -> tuple[np.ndarray, float]:
+    """
+    Reads the numeric columns of a spectrum file in a single numpy call after cutting
+    out the comment lines. Returns the (n_rows, n_columns) table and the factor
+    converting the frequencies into Hartree, which is read from the header.
+    """
+    with open_file(filepath) as f:
+        text = f.read()
+    # the comments are usually a header block, only scan the body if it has any
+    start = RE_HEADER.match(text).end()
+    header, body = text[:start], text[start:]
+    if b'#' in body:
+        header += b'\n'.join(RE_COMMENT.findall(body))
+        body = RE_COMMENT.sub(b'', body)
+    unit = RE_ENERGY_UNIT.search(header)
+    if unit:
+        scale = float(unit.group(1))
+    else:
+        scale = EV_TO_HARTREE if re.search(rb'\beV\b', header) else 1.0
+    first = body.lstrip().split(b'\n', 1)[0]
+    values = np.array(body.split(), dtype=float)
+    return values.reshape((-1, len(first.split()))), scale
+
+
+def read_spectra(filepaths: list[str]) -> list[dict[str, Any]]:
+    """
+    Reads the spectrum files into groups of files of the same kind sharing the same
+    frequency axis. Each group holds the kind, the file labels, the frequencies in
+    Hartree and the stacked (n_files, n_frequencies) complex values.
+    """
+    groups: dict[tuple[str, bytes], dict[str, Any]] = {}
+    for filepath in filepaths:
+        kind, label = RE_SPECTRUM_FILE.match(
+            strip_compression(os.path.basename(filepath))
+        ).groups()
+        table, scale = read_columns(filepath)
+        if table.size == 0:
+            continue
+        axis_column, real_column, imag_column = SPECTRUM_COLUMNS[kind]
+        frequencies = table[:, axis_column] * scale
+        values = table[:, real_column].astype(np.complex128)
+        if imag_column is not None:
+            values.imag = table[:, imag_column]
+        group = groups.setdefault(
+            (kind, frequencies.tobytes()),
+            dict(kind=kind, labels=[], frequencies=frequencies, values=[]),
+        )
+        group['labels'].append(label)
+        group['values'].append(values)
+    for group in groups.values():
+        group['values'] = np.stack(group['values'])
+        group['n_files'], group['n_frequencies'] = group['values'].shape
+    return list(groups.values())
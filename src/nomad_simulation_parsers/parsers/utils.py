@@ -1,6 +1,41 @@
+import bz2
+import functools
+import gzip
+import io
+import lzma
+import multiprocessing
 import os
 import re
+import shutil
+import signal
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from glob import glob
+from typing import IO, Any, Callable, Optional
+
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# leading bytes identifying the supported compression formats
+COMPRESSION_MAGIC = {
+    'gz': b'\x1f\x8b',
+    'bz2': b'BZh',
+    'xz': b'\xfd7zXZ\x00',
+    'zst': b'\x28\xb5\x2f\xfd',
+}
+COMPRESSION_EXTENSIONS = ['.gz', '.bz2', '.xz', '.zst']
+# size of the chunks in which compressed files are decompressed
+CHUNK_SIZE = 1 << 20
+# blank line separating the blocks of numeric text files
+RE_BLOCK_END = re.compile(rb'\n[ \t]*\r?\n')
 
 
 def search_files(
@@ -12,6 +47,7 @@ def search_files(
 ) -> list[str]:
     """Search files following the `pattern` starting from `basedir`. The search is
     performed recursively in all sub-folders (deep=True) or parent folders (deep=False).
+    Compressed variants of the matching files, e.g. `EIGVAL.OUT.xz`, are also found.
     A futher regex search with `re_pattern` is done to filter the matching files.
 
     Args:
@@ -25,7 +61,12 @@ def search_files(
     """
 
     for _ in range(max_dirs):
-        filenames = glob(f'{basedir}/{pattern}')
+        # uncompressed files take precedence over their compressed variants
+        filenames = [
+            filename
+            for extension in ['', *COMPRESSION_EXTENSIONS]
+            for filename in glob(f'{basedir}/{pattern}{extension}')
+        ]
         pattern = os.path.join('**' if deep else '..', pattern)
         if filenames:
             break
@@ -37,3 +78,617 @@ def search_files(
 
     filenames = [f for f in filenames if os.access(f, os.F_OK)]
     return filenames
+
+
+def strip_compression(filename: str) -> str:
+    """Returns the file name without its compression extension, if any."""
+    for extension in COMPRESSION_EXTENSIONS:
+        if filename.endswith(extension):
+            return filename[: -len(extension)]
+    return filename
+
+
+def scan_files(directory: str, pattern: re.Pattern) -> list[str]:
+    """Returns the paths of the files in `directory` whose names, without compression
+    extension, match `pattern`, sorted by name. Unlike search_files, the directory is
+    listed only once, which is cheaper for many files. Compressed files are only used
+    if the uncompressed file is missing.
+
+    Args:
+        directory (str): directory to list
+        pattern (re.Pattern): compiled pattern matched against the file names
+
+    Returns:
+        list: list of matching files
+    """
+    matches: dict[str, str] = {}
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return []
+    for entry in entries:
+        name = strip_compression(entry.name)
+        if not pattern.match(name) or not entry.is_file():
+            continue
+        if name not in matches or entry.name == name:
+            matches[name] = entry.path
+    return [matches[name] for name in sorted(matches)]
+
+
+def search_many_files(
+    filenames: list[str], basedir: str, max_dirs: int = 10
+) -> tuple[dict[str, list[str]], list[int]]:
+    """Searches several files at once in `basedir` and its sub-folders. Like
+    search_files, each file is taken from the shallowest level where it is found, with
+    the uncompressed file first, but every directory is listed only once for all files
+    instead of once per file. The search stops as soon as all files are found.
+
+    Args:
+        filenames (list[str]): names of the files to search
+        basedir (str): directory to start the search
+        max_dirs (int, optional): maximum number of levels to search
+
+    Returns:
+        tuple: the matching files of each name and the number of directories listed
+            on each level
+    """
+    found: dict[str, list[str]] = {}
+    scans: list[int] = []
+    directories = [basedir]
+    for _ in range(max_dirs):
+        if not directories or len(found) == len(set(filenames)):
+            break
+        scans.append(len(directories))
+        subdirectories = []
+        matches: dict[str, list[tuple[int, str]]] = {}
+        for directory in directories:
+            try:
+                entries = sorted(os.scandir(directory), key=lambda e: e.name)
+            except OSError:
+                continue
+            for entry in entries:
+                # like glob, hidden files and folders are skipped
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_dir():
+                    subdirectories.append(entry.path)
+                    continue
+                name = strip_compression(entry.name)
+                if name in filenames and name not in found:
+                    # uncompressed files take precedence over their compressed variants
+                    extension = entry.name[len(name) :]
+                    order = (
+                        COMPRESSION_EXTENSIONS.index(extension) + 1 if extension else 0
+                    )
+                    matches.setdefault(name, []).append((order, entry.path))
+        for name, files in matches.items():
+            found[name] = [path for _, path in sorted(files)]
+        directories = subdirectories
+    return {name: found.get(name, []) for name in filenames}, scans
+
+
+def read_compression(f: IO[bytes]) -> Optional[str]:
+    """Returns the compression format from the leading bytes of the open file or None
+    if it is not compressed. The file position is reset to the start.
+    """
+    head = f.read(max(len(magic) for magic in COMPRESSION_MAGIC.values()))
+    f.seek(0)
+    for compression, magic in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def get_compression(filepath: str) -> Optional[str]:
+    """Returns the compression format of the file from its leading bytes or None if
+    it is not compressed.
+    """
+    with open(filepath, 'rb') as f:
+        return read_compression(f)
+
+
+def open_file(filepath: str) -> IO[bytes]:
+    """Opens the file for binary reading. Compressed files (gz, bz2, xz, zst) are
+    decompressed on the fly while reading. The handle of a file read ahead by
+    `ReadAhead` is reused.
+    """
+    f = ReadAhead.claim(filepath) or open(filepath, 'rb')
+    compression = read_compression(f)
+    if compression is None:
+        return f
+    f.close()
+    if compression == 'gz':
+        return gzip.open(filepath, 'rb')
+    if compression == 'bz2':
+        return bz2.open(filepath, 'rb')
+    if compression == 'xz':
+        return lzma.open(filepath, 'rb')
+    if zstandard is None:
+        raise ImportError('zstandard is required to read zstd compressed files.')
+    return zstandard.open(filepath, 'rb')
+
+
+def decompress(filepath: str, target: IO[bytes]) -> None:
+    """Decompresses the file in chunks of `CHUNK_SIZE` into `target`."""
+    with open_file(filepath) as f:
+        shutil.copyfileobj(f, target, CHUNK_SIZE)
+    target.flush()
+    target.seek(0)
+
+
+def open_text_file(filepath: str) -> IO[str]:
+    """Opens the file for text reading. Compressed files are decompressed into an
+    anonymous temporary file such that the result can still be memory-mapped.
+    """
+    f = open_file(filepath)
+    # plain files are opened as io.BufferedReader
+    if isinstance(f, io.BufferedReader):
+        return io.TextIOWrapper(f)
+    target = tempfile.TemporaryFile()
+    with f:
+        shutil.copyfileobj(f, target, CHUNK_SIZE)
+    target.seek(0)
+    return io.TextIOWrapper(target)
+
+
+@contextmanager
+def decompressed(filepath: str):
+    """Yields the path to a decompressed copy of the file which is removed on exit. The
+    path of the file itself is yielded if it is not compressed.
+    """
+    if get_compression(filepath) is None:
+        yield filepath
+        return
+    with tempfile.NamedTemporaryFile(suffix=os.path.basename(filepath)) as target:
+        decompress(filepath, target)
+        yield target.name
+
+
+def read_blocks(filepath: str, dtype: str = 'float64') -> np.ndarray:
+    """
+    Reads a numeric text file made of blank line separated blocks of the same number
+    of rows, e.g. the text plot files of exciting, in a single numpy call. Returns the
+    (n_blocks, n_points, n_columns) table.
+    """
+    with open_file(filepath) as f:
+        text = f.read()
+    text = text.lstrip()
+    end = RE_BLOCK_END.search(text)
+    first = text[: end.start()] if end else text.rstrip()
+    if not first:
+        return np.empty((0, 0, 0), dtype=dtype)
+    n_points = first.count(b'\n') + 1
+    n_columns = len(first.split(b'\n', 1)[0].split())
+    return np.array(text.split(), dtype=dtype).reshape((-1, n_points, n_columns))
+
+
+def read_stacked_blocks(
+    filepaths: list[str],
+    shape: Optional[tuple[int, int]] = None,
+    column: int = 1,
+    dtype: str = 'float64',
+) -> tuple[np.ndarray, list[int]]:
+    """
+    Reads a column of the blocks of many numeric text files sharing the same axis into
+    one preallocated (n_files, n_blocks, n_points) array, where `shape` gives the
+    (n_blocks, n_points) of each file, by default that of the first file. Returns the
+    stacked array and the indices of the files which were read, files of a different
+    shape are left out.
+    """
+    stacked = None
+    indices: list[int] = []
+    for index, filepath in enumerate(filepaths):
+        blocks = read_blocks(filepath, dtype=dtype)
+        if shape is None and blocks.size:
+            shape = blocks.shape[:2]
+        if blocks.shape[:2] != shape or blocks.shape[2] <= column:
+            continue
+        if stacked is None:
+            stacked = np.empty((len(filepaths), *shape), dtype=dtype)
+        stacked[len(indices)] = blocks[:, :, column]
+        indices.append(index)
+    if stacked is None:
+        return np.empty((0, *(shape or (0, 0))), dtype=dtype), indices
+    return stacked[: len(indices)], indices
+
+
+class ReadAhead:
+    """
+    Reads files sequentially in the background to fill the filesystem caches while the
+    caller is busy, e.g. parsing the mainfile. Each of the `max_workers` threads reads
+    in chunks of `chunk_size` into a single reused buffer such that the memory is
+    bounded. The open handles are kept and handed out by `open_file` and
+    `open_text_file` instead of opening the files again. Handles which are not claimed
+    are closed on exit.
+
+    Args:
+        filepaths (list): files to read ahead
+        max_workers (int, optional): number of files read concurrently
+        chunk_size (int, optional): size of the sequential reads in bytes
+    """
+
+    # handles of the files being read ahead by all instances
+    _handles: dict[str, Future] = {}
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        filepaths: list[str],
+        max_workers: int = 2,
+        chunk_size: int = 4 * CHUNK_SIZE,
+    ):
+        self.chunk_size = chunk_size
+        self._buffers = threading.local()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='read_ahead'
+        )
+        self._futures: dict[str, Future] = {}
+        with self._lock:
+            for filepath in map(os.path.abspath, filepaths):
+                if filepath in self._handles or filepath in self._futures:
+                    continue
+                future = self._executor.submit(self._read, filepath)
+                self._futures[filepath] = future
+                self._handles[filepath] = future
+
+    def _read(self, filepath: str) -> IO[bytes]:
+        buffer = getattr(self._buffers, 'buffer', None)
+        if buffer is None:
+            buffer = self._buffers.buffer = bytearray(self.chunk_size)
+        f = open(filepath, 'rb')
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        while f.readinto(buffer) == self.chunk_size:
+            pass
+        f.seek(0)
+        return f
+
+    @classmethod
+    def claim(cls, filepath: str) -> Optional[IO[bytes]]:
+        """Returns the handle of the file if it is read ahead after waiting for the
+        read to finish or None otherwise, also if the read has not started yet, as
+        the caller would wait for the reads of the files queued before it. The caller
+        is responsible to close the handle.
+        """
+        with cls._lock:
+            future = cls._handles.pop(os.path.abspath(filepath), None)
+        if future is None or future.cancel():
+            return None
+        try:
+            return future.result()
+        except Exception:
+            return None
+
+    def close(self):
+        with self._lock:
+            unclaimed = [
+                future
+                for filepath, future in self._futures.items()
+                if self._handles.get(filepath) is future
+            ]
+            for filepath in self._futures:
+                if self._handles.get(filepath) in unclaimed:
+                    del self._handles[filepath]
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        for future in unclaimed:
+            if not future.cancelled() and future.exception() is None:
+                future.result().close()
+        self._futures = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+@contextmanager
+def profile_stage(name: str, stages: dict[str, dict[str, Any]], n_top: int = 10):
+    """Records the wall time of the enclosed block in `stages[name]`. If tracemalloc
+    is tracing, the peak and retained memory of the block together with its `n_top`
+    allocation sites are also recorded.
+
+    Args:
+        name (str): name of the stage
+        stages (dict): container for the metrics of all stages
+        n_top (int, optional): number of allocation sites to report
+    """
+    metrics: dict[str, Any] = {}
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        memory_start = tracemalloc.get_traced_memory()[0]
+    time_start = time.perf_counter()
+    try:
+        yield metrics
+    finally:
+        metrics['time'] = time.perf_counter() - time_start
+        if tracing:
+            memory, memory_peak = tracemalloc.get_traced_memory()
+            metrics['memory_peak'] = memory_peak - memory_start
+            metrics['memory_retained'] = memory - memory_start
+            metrics['top_allocations'] = [
+                (str(stat.traceback), stat.size_diff)
+                for stat in tracemalloc.take_snapshot().compare_to(snapshot, 'lineno')[
+                    :n_top
+                ]
+            ]
+        stages[name] = metrics
+
+
+class TimeBudgetExceeded(BaseException):
+    """
+    Raised in the main thread when a block exceeds its wall-time budget. It derives
+    from BaseException such that it is not swallowed by the broad exception handling
+    of the file parsers.
+    """
+
+
+@contextmanager
+def time_budget(seconds: Optional[float]):
+    """Raises `TimeBudgetExceeded` if the enclosed block runs longer than `seconds`.
+    The budget is enforced with an interval timer signal, so it only applies in the
+    main thread and is checked between Python instructions, i.e. a long running C
+    call is only interrupted when it returns. A timer already set, e.g. by an
+    enclosing budget, is passed on to its handler if it expires first and otherwise
+    restored with its remaining time on exit.
+
+    Args:
+        seconds (float, optional): wall-time budget, no budget if None
+    """
+    if (
+        not seconds
+        or not hasattr(signal, 'setitimer')
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        yield
+        return
+
+    outer, interval = signal.getitimer(signal.ITIMER_REAL)
+    outer_pending = outer > 0
+    start = time.monotonic()
+
+    def handler(signum, frame):
+        nonlocal outer_pending
+        if not outer_pending or outer >= seconds:
+            raise TimeBudgetExceeded(f'Exceeded time budget of {seconds} s')
+        # the outer timer expired first, the budget continues after its handler
+        outer_pending = False
+        elapsed = time.monotonic() - start
+        signal.setitimer(signal.ITIMER_REAL, max(seconds - elapsed, 1e-6))
+        if callable(previous):
+            previous(signum, frame)
+        else:
+            signal.signal(signal.SIGALRM, previous)
+            signal.raise_signal(signal.SIGALRM)
+            signal.signal(signal.SIGALRM, handler)
+
+    previous = signal.signal(signal.SIGALRM, handler)
+    signal.setitimer(
+        signal.ITIMER_REAL, min(seconds, outer) if outer_pending else seconds
+    )
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+        if outer:
+            remaining = outer - (time.monotonic() - start)
+            if not outer_pending and interval:
+                # the next expiry of the periodic outer timer
+                remaining = remaining % interval or interval
+            elif outer_pending:
+                remaining = max(remaining, 1e-6)
+            if remaining > 0:
+                signal.setitimer(signal.ITIMER_REAL, remaining, interval)
+
+
+def parallel_map(function: Callable, items: list, workers: int = 1) -> list:
+    """Applies `function` to each of `items` in a pool of `workers` processes and
+    returns the results in order. The items are mapped serially for a single worker
+    and in daemonic processes, e.g. celery workers, which cannot have children. The
+    workers are not forked from the calling process, whose read-ahead threads and
+    concurrent parses may hold locks which would never be released in the children,
+    but from a forkserver, or spawned where it is not available.
+
+    Args:
+        function (Callable): picklable function of a single item
+        items (list): picklable items
+        workers (int, optional): number of worker processes
+
+    Returns:
+        list: results of the items
+    """
+    workers = min(workers, len(items))
+    if workers <= 1 or multiprocessing.current_process().daemon:
+        return [function(item) for item in items]
+    methods = multiprocessing.get_all_start_methods()
+    if 'forkserver' in methods:
+        context = multiprocessing.get_context('forkserver')
+        # the server, started on first use, imports the module of the function once
+        # such that the workers forked from it do not import it again
+        target = function.func if isinstance(function, functools.partial) else function
+        context.set_forkserver_preload([target.__module__])
+    else:
+        context = multiprocessing.get_context('spawn')
+    # a few chunks per worker balance the load with little pickling overhead
+    chunksize = max(1, len(items) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        return list(executor.map(function, items, chunksize=chunksize))
+
+
+class ArrayBuffer:
+    """
+    Allocates the large arrays built by the file parsers of one parse. The arrays are
+    kept on the heap until their total size would exceed `max_memory` bytes, all
+    following arrays are backed by temporary memory-mapped files in `directory`. The
+    files are unlinked when created, such that their disk space is freed with the last
+    reference to the arrays even if the parse fails, and `close` closes them once the
+    archive is written. Without `max_memory` all arrays are kept on the heap.
+
+    Args:
+        max_memory (int, optional): memory ceiling of the heap arrays in bytes
+        directory (str, optional): directory of the files, the temporary directory
+            if not given, which should not be a tmpfs as it is backed by memory
+    """
+
+    def __init__(
+        self, max_memory: Optional[int] = None, directory: Optional[str] = None
+    ):
+        self.max_memory = max_memory
+        self.directory = directory
+        # bytes of the arrays on the heap and in files
+        self.heap_size = 0
+        self.spilled_size = 0
+        self._files: list[IO[bytes]] = []
+        self._lock = threading.Lock()
+
+    def empty(self, shape: tuple[int, ...], dtype: Any = 'float64') -> np.ndarray:
+        """Returns a new uninitialized array on the heap or in a file."""
+        dtype = np.dtype(dtype)
+        size = int(np.prod(shape)) * dtype.itemsize
+        with self._lock:
+            spill = (
+                self.max_memory is not None
+                and size > 0
+                and self.heap_size + size > self.max_memory
+            )
+            if spill:
+                self.spilled_size += size
+            elif self.max_memory is not None:
+                self.heap_size += size
+        if not spill:
+            return np.empty(shape, dtype=dtype)
+        f = tempfile.TemporaryFile(dir=self.directory)
+        with self._lock:
+            self._files.append(f)
+        return np.memmap(f, dtype=dtype, mode='w+', shape=shape)
+
+    def array(self, values: Any, dtype: Any = 'float64') -> np.ndarray:
+        """
+        Returns a new array of a sequence of values, e.g. numbers or number strings,
+        which are converted in chunks such that only one chunk is copied on the heap.
+        """
+        array = self.empty((len(values),), dtype)
+        chunk = max(1, CHUNK_SIZE // array.itemsize)
+        for start in range(0, len(values), chunk):
+            array[start : start + chunk] = values[start : start + chunk]
+        return array
+
+    def stack(self, arrays: list[Any], dtype: Any = None) -> np.ndarray:
+        """Returns a new array of the arrays of the same shape along a first axis."""
+        first = np.asarray(arrays[0])
+        array = self.empty((len(arrays), *first.shape), dtype or first.dtype)
+        for n, values in enumerate(arrays):
+            array[n] = values
+        return array
+
+    def close(self) -> None:
+        """Closes the files, the arrays remain mapped until they are released."""
+        with self._lock:
+            files, self._files = self._files, []
+        for f in files:
+            f.close()
+
+
+# marks the arguments without a cached transform, as None is a valid result
+_MISSING = object()
+
+
+class TransformCache:
+    """
+    Results of the transform functions of a mapping parser keyed by the function name
+    and the identity of its arguments, i.e. the source nodes of the parser data. The
+    arguments are kept with the results such that their ids are not reused while the
+    cache is filled.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._results: dict[tuple, tuple[tuple, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def call(self, function: Callable, *args, **kwargs) -> Any:
+        """Returns the cached result of `function` for the arguments or calls it."""
+        values = (*args, *kwargs.values())
+        key = (function, *kwargs, *map(id, values))
+        _, result = self._results.get(key, (None, _MISSING))
+        if result is not _MISSING:
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = function(*args, **kwargs)
+        self._results[key] = (values, result)
+        return result
+
+    def get_stats(self) -> dict[str, Any]:
+        """Returns the number of hits and misses and the hit rate."""
+        calls = self.hits + self.misses
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            hit_rate=self.hits / calls if calls else 0.0,
+        )
+
+    def clear(self) -> None:
+        self._results.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def memoize_transform(function: Callable) -> Callable:
+    """
+    Memoizes a transform function of a mapping parser by the identity of its
+    arguments, such that a source node revisited by the mappers, e.g. a configuration
+    mapped to both the model systems and the outputs, is only transformed once. The
+    results are kept in the `transform_cache` of the parser, which is to be cleared
+    once the parser data is converted.
+    """
+
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        cache = self.__dict__.get('transform_cache')
+        if cache is None:
+            cache = self.transform_cache = TransformCache()
+        return cache.call(function, self, *args, **kwargs)
+
+    return wrapper
+
+
+def clear_transform_cache(parser: Any) -> Optional[dict[str, Any]]:
+    """
+    Clears the memoized transforms of a mapping parser and returns their hit and miss
+    counts, or None if no transform was memoized.
+    """
+    cache = parser.__dict__.get('transform_cache')
+    if cache is None:
+        return None
+    stats = cache.get_stats()
+    cache.clear()
+    return stats
+
+
+def compile_patterns(text_parser: Any) -> int:
+    """
+    Compiles the patterns a text parser and its sub parsers match against the file,
+    i.e. the pattern of each quantity and the combined pattern of the quantities
+    without a sub parser, into the `re` cache and returns their number. The combined
+    patterns are only reused if the parser finds its quantities with findall.
+    """
+    quantities = text_parser.quantities
+    findall = [q for q in quantities if q.sub_parser is None]
+    n_patterns = len(quantities)
+    if findall:
+        pattern = '|'.join([q.re_pattern.pattern.decode() for q in findall])
+        if len(findall) == 1:
+            pattern = f'{pattern}|(__dummy__)'
+        re.compile(pattern.encode())
+        n_patterns += 1
+    for quantity in quantities:
+        if quantity.sub_parser is not None:
+            n_patterns += compile_patterns(quantity.sub_parser)
+    return n_patterns
@@ -1,5 +1,7 @@
+import numpy as np
+from nomad.datamodel.data import ArchiveSection
 from nomad.datamodel.metainfo.annotations import Mapper
-from nomad.metainfo import SchemaPackage
+from nomad.metainfo import Quantity, Reference, SchemaPackage, Section, SubSection
 from nomad.parsing.file_parser.mapping_parser import MAPPING_ANNOTATION_KEY
 from nomad_simulations.schema_packages import (
     atoms_state,
@@ -15,6 +17,392 @@ from nomad_simulations.schema_packages import (
 m_package = SchemaPackage()
 
 
+class AtomicCell(model_system.AtomicCell):
+    m_def = Section(extends_base_section=True)
+
+    x_exciting_species = Quantity(
+        type=Reference(atoms_state.AtomsState.m_def),
+        shape=['*'],
+        description="""
+        Distinct atomic species of the cell, which reference the species of the
+        simulation in `Simulation.x_exciting_species` shared by all cells. Only the
+        first cell with a given species list also stores the atoms states with the
+        chemical symbol of each atom, the following cells only give the species of
+        their atoms by `x_exciting_species_indices`.
+        """,
+    )
+
+    x_exciting_species_indices = Quantity(
+        type=np.int32,
+        shape=['*'],
+        description="""
+        Index of the species of each atom in `x_exciting_species`.
+        """,
+    )
+
+
+class AtomsState(atoms_state.AtomsState):
+    m_def = Section(extends_base_section=True)
+
+    x_exciting_species_file = Quantity(
+        type=str,
+        description="""
+        Species file the parameters of the species are loaded from.
+        """,
+    )
+
+    x_exciting_muffin_tin_radius = Quantity(
+        type=np.float64,
+        unit='bohr',
+        description="""
+        Radius of the muffin-tin sphere of the species.
+        """,
+    )
+
+    x_exciting_radial_points = Quantity(
+        type=np.int32,
+        description="""
+        Number of radial mesh points in the muffin-tin sphere given in the species
+        file.
+        """,
+    )
+
+    x_exciting_basis_type = Quantity(
+        type=str,
+        description="""
+        Type of the default basis of the species file, e.g. `lapw` or `apw+lo`.
+        """,
+    )
+
+    x_exciting_n_local_orbitals = Quantity(
+        type=np.int32,
+        description="""
+        Number of local orbitals of the basis given in the species file.
+        """,
+    )
+
+
+class OrbitalsState(atoms_state.OrbitalsState):
+    m_def = Section(extends_base_section=True)
+
+    x_exciting_core = Quantity(
+        type=bool,
+        description="""
+        Whether the atomic state is treated as a core state.
+        """,
+    )
+
+
+class ElectronicEigenvalues(outputs.ElectronicEigenvalues):
+    m_def = Section(extends_base_section=True)
+
+    x_exciting_quasiparticle_weights = Quantity(
+        type=np.float64,
+        shape=['*', 'n_bands'],
+        description="""
+        Quasiparticle renormalization factors Z of the GW quasiparticle energies for
+        each k-point and band.
+        """,
+    )
+
+
+class Preview(ArchiveSection):
+    """
+    Downsampled version of a large property array to draw thumbnail plots without
+    loading it. The points of the array are split into `n_bins` contiguous bins and
+    each bin keeps the minimum and the maximum of its values, which preserves the
+    peaks.
+    """
+
+    n_points = Quantity(
+        type=np.int32,
+        description="""
+        Number of points of the full array.
+        """,
+    )
+
+    n_bins = Quantity(
+        type=np.int32,
+        description="""
+        Number of bins of the preview.
+        """,
+    )
+
+    first_points = Quantity(
+        type=np.int32,
+        shape=['n_bins'],
+        description="""
+        Index of the first point of the full array in each bin.
+        """,
+    )
+
+
+class DOSPreview(Preview):
+    """
+    Preview of a density of states along the energies.
+    """
+
+    energies = Quantity(
+        type=np.float64,
+        shape=['n_bins'],
+        unit='joule',
+        description="""
+        Mean energy of each bin.
+        """,
+    )
+
+    minimum = Quantity(
+        type=np.float64,
+        shape=['n_bins'],
+        unit='1/joule',
+        description="""
+        Minimum density of states in each bin.
+        """,
+    )
+
+    maximum = Quantity(
+        type=np.float64,
+        shape=['n_bins'],
+        unit='1/joule',
+        description="""
+        Maximum density of states in each bin.
+        """,
+    )
+
+
+class BandStructurePreview(Preview):
+    """
+    Preview of a band structure along the k-point path.
+    """
+
+    minimum = Quantity(
+        type=np.float64,
+        shape=['n_bins', '*'],
+        unit='joule',
+        description="""
+        Minimum energy of each band in each bin.
+        """,
+    )
+
+    maximum = Quantity(
+        type=np.float64,
+        shape=['n_bins', '*'],
+        unit='joule',
+        description="""
+        Maximum energy of each band in each bin.
+        """,
+    )
+
+
+class ElectronicDensityOfStates(outputs.ElectronicDensityOfStates):
+    m_def = Section(extends_base_section=True)
+
+    x_exciting_previews = SubSection(
+        sub_section=DOSPreview.m_def,
+        repeats=True,
+        description="""
+        Previews of `value` at increasing resolutions.
+        """,
+    )
+
+
+class ElectronicBandStructure(outputs.ElectronicBandStructure):
+    m_def = Section(extends_base_section=True)
+
+    x_exciting_previews = SubSection(
+        sub_section=BandStructurePreview.m_def,
+        repeats=True,
+        description="""
+        Previews of `value` at increasing resolutions.
+        """,
+    )
+
+
+class Spectra(ArchiveSection):
+    """
+    BSE or TDDFT spectra of one kind of exciting output file sharing the same
+    frequency axis, e.g. the dielectric function of each polarization in the
+    `EPSILON_*.OUT` files.
+    """
+
+    kind = Quantity(
+        type=str,
+        description="""
+        Kind of the spectrum files: `EPSILON` for the dielectric function, `LOSS` for
+        the loss function or `EXCITON` for the exciton energies and oscillator
+        strengths.
+        """,
+    )
+
+    n_files = Quantity(
+        type=np.int32,
+        description="""
+        Number of spectrum files.
+        """,
+    )
+
+    n_frequencies = Quantity(
+        type=np.int32,
+        description="""
+        Number of frequencies of the shared frequency axis.
+        """,
+    )
+
+    labels = Quantity(
+        type=str,
+        shape=['n_files'],
+        description="""
+        Label of each spectrum file, i.e. its name without kind and extension, which
+        gives the method, polarization and momentum transfer.
+        """,
+    )
+
+    frequencies = Quantity(
+        type=np.float64,
+        shape=['n_frequencies'],
+        unit='joule',
+        description="""
+        Shared frequency axis of the spectra, the exciton energies for `EXCITON`.
+        """,
+    )
+
+    value = Quantity(
+        type=np.complex128,
+        shape=['n_files', 'n_frequencies'],
+        description="""
+        Spectrum of each file on the frequency axis, the oscillator strengths for
+        `EXCITON`. The loss function is real.
+        """,
+    )
+
+
+class Outputs(outputs.Outputs):
+    m_def = Section(extends_base_section=True)
+
+    x_exciting_spectra = SubSection(
+        sub_section=Spectra.m_def,
+        repeats=True,
+        description="""
+        BSE and TDDFT spectra read from the exciting spectrum files.
+        """,
+    )
+
+
+class TrajectoryPage(ArchiveSection):
+    """
+    Consecutive steps of a structure optimization trajectory stored as arrays.
+    """
+
+    first_step = Quantity(
+        type=np.int32,
+        description="""
+        Index of the first step of the page in the trajectory.
+        """,
+    )
+
+    n_steps = Quantity(
+        type=np.int32,
+        description="""
+        Number of steps in the page.
+        """,
+    )
+
+    n_atoms = Quantity(
+        type=np.int32,
+        description="""
+        Number of atoms of the structures.
+        """,
+    )
+
+    positions = Quantity(
+        type=np.float64,
+        shape=['n_steps', 'n_atoms', 3],
+        unit='meter',
+        description="""
+        Cartesian positions of the atoms at each step.
+        """,
+    )
+
+    total_energies = Quantity(
+        type=np.float64,
+        shape=['n_steps'],
+        unit='joule',
+        description="""
+        Total energy at each step.
+        """,
+    )
+
+    forces = Quantity(
+        type=np.float64,
+        shape=['n_steps', 'n_atoms', 3],
+        unit='newton',
+        description="""
+        Total forces on the atoms at each step.
+        """,
+    )
+
+
+class Trajectory(ArchiveSection):
+    """
+    Full trajectory of a long structure optimization, of which the model systems and
+    outputs of the simulation only keep the steps in `kept_steps`. The steps are
+    split into pages of `page_size` steps such that a client can load only the pages
+    it needs.
+    """
+
+    n_steps = Quantity(
+        type=np.int32,
+        description="""
+        Number of optimization steps.
+        """,
+    )
+
+    page_size = Quantity(
+        type=np.int32,
+        description="""
+        Number of steps per page, the page of step `n` is `n // page_size`.
+        """,
+    )
+
+    kept_steps = Quantity(
+        type=np.int32,
+        shape=['*'],
+        description="""
+        Indices of the steps kept in the model systems and outputs of the simulation,
+        which follow the ground state in the same order.
+        """,
+    )
+
+    pages = SubSection(
+        sub_section=TrajectoryPage.m_def,
+        repeats=True,
+        description="""
+        Pages of consecutive steps of the trajectory.
+        """,
+    )
+
+
+class Simulation(general.Simulation):
+    m_def = Section(extends_base_section=True)
+
+    x_exciting_species = SubSection(
+        sub_section=atoms_state.AtomsState.m_def,
+        repeats=True,
+        description="""
+        Distinct atomic species of all cells with the parameters of their species
+        files, stored once and referenced by `AtomicCell.x_exciting_species`.
+        """,
+    )
+
+    x_exciting_trajectory = SubSection(
+        sub_section=Trajectory.m_def,
+        description="""
+        Full trajectory of the structure optimization if only every n-th step is kept
+        in the model systems and outputs.
+        """,
+    )
+
+
 # simulation
 general.Simulation.m_def.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
     info=Mapper(mapper='@'),
@@ -22,6 +410,11 @@ general.Simulation.m_def.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
     eigval=Mapper(mapper='@'),
     bandstructure_xml=Mapper(mapper='@'),
     dos_xml=Mapper(mapper='@'),
+    evalqp=Mapper(mapper='@'),
+    gw_info=Mapper(mapper='@'),
+    spectra=Mapper(mapper='@'),
+    band_out=Mapper(mapper='@'),
+    dos_out=Mapper(mapper='@'),
 )
 ## program
 general.Simulation.program.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
@@ -31,6 +424,9 @@ general.Simulation.program.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
 general.Program.version.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
     info=Mapper(mapper='.program_version')
 )
+general.Program.version_internal.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.hash_id')
+)
 ## model_method
 model_method.DFT.m_def.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
     info=Mapper(mapper='.initialization.xc_functional'),
@@ -75,27 +471,80 @@ model_system.AtomicCell.m_def.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
 )
 #### cell quantities
 model_system.AtomicCell.positions.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
-    info=Mapper(mapper='.positions')
+    info=Mapper(mapper='.positions', unit='bohr')
 )
 model_system.AtomicCell.atoms_state.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
     info=Mapper(mapper='.atoms')
 )
+AtomicCell.x_exciting_species.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.species')
+)
+Simulation.x_exciting_species.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper=('get_distinct_species', ['.@']))
+)
+AtomicCell.x_exciting_species_indices.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.species_indices')
+)
 ##### atoms_state quantities
 atoms_state.AtomsState.chemical_symbol.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
     info=Mapper(mapper='.symbol')
 )
+AtomsState.x_exciting_species_file.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.file')
+)
+AtomsState.x_exciting_muffin_tin_radius.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.muffin_tin_radius', unit='bohr')
+)
+##### species definitions from the species files
+atoms_state.AtomsState.atomic_number.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.definition.atomic_number')
+)
+AtomsState.x_exciting_radial_points.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.definition.radial_points')
+)
+AtomsState.x_exciting_basis_type.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.definition.basis_type')
+)
+AtomsState.x_exciting_n_local_orbitals.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.definition.n_local_orbitals')
+)
+atoms_state.AtomsState.orbitals_state.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.definition.atomic_states')
+)
+atoms_state.OrbitalsState.n_quantum_number.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.n_quantum_number')
+)
+atoms_state.OrbitalsState.l_quantum_number.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.l_quantum_number')
+)
+atoms_state.OrbitalsState.j_quantum_number.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.j_quantum_number')
+)
+atoms_state.OrbitalsState.occupation.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.occupation')
+)
+OrbitalsState.x_exciting_core.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.core')
+)
 ## outputs
 general.Simulation.outputs.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
     info=Mapper(mapper=('get_configurations', ['.@'])),
     eigval=Mapper(mapper='.@'),
     bandstructure_xml=Mapper(mapper='.@'),
     dos_xml=Mapper(mapper='.@'),
+    evalqp=Mapper(mapper='.@'),
+    gw_info=Mapper(mapper='.@'),
+    spectra=Mapper(mapper='.@'),
+    band_out=Mapper(mapper='.@'),
+    dos_out=Mapper(mapper='.@'),
 )
 ### variables
 variables.Variables.n_points.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
     info=Mapper(mapper='.n_points'),
-    eigval=Mapper(mapper='n_k_points'),
-    bandstructure_xml=Mapper(mapper='.n_kpoints'),
+    eigval=Mapper(mapper='.n_points'),
+    bandstructure_xml=Mapper(mapper='.n_points'),
+    evalqp=Mapper(mapper='.n_points'),
+    band_out=Mapper(mapper='.n_kpoints'),
 )
 ### total_energies
 outputs.Outputs.total_energies.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
@@ -103,7 +552,10 @@ outputs.Outputs.total_energies.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
 )
 #### total_energies quantities
 properties.TotalEnergy.value.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
-    info=Mapper(mapper='.final.energy_total || energy_total')
+    info=Mapper(mapper='.final.energy_total || energy_total', unit='hartree')
+)
+properties.TotalEnergy.is_scf_converged.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.converged')
 )
 ### total_forces
 outputs.Outputs.total_forces.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
@@ -117,7 +569,7 @@ properties.forces.TotalForce.rank.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
     info=Mapper(mapper='.rank')
 )
 properties.forces.TotalForce.value.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
-    info=Mapper(mapper='.forces')
+    info=Mapper(mapper='.forces', unit='hartree/bohr')
 )
 ### electronic_eigenvalues
 outputs.Outputs.electronic_eigenvalues.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
@@ -130,7 +582,7 @@ outputs.ElectronicEigenvalues.n_bands.m_annotations[MAPPING_ANNOTATION_KEY] = di
 ##### we need to use setdefault when annot was defined previously
 outputs.ElectronicEigenvalues.variables.m_annotations.setdefault(
     MAPPING_ANNOTATION_KEY, {}
-).update(dict(eigval=Mapper(mapper='@')))
+).update(dict(eigval=Mapper(mapper='.variables')))
 outputs.ElectronicEigenvalues.value.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
     eigval=Mapper(mapper='.eigenvalues'),
 )
@@ -147,10 +599,71 @@ outputs.ElectronicBandStructure.n_bands.m_annotations.setdefault(
 ).update(dict(bandstructure_xml=Mapper(mapper='.n_states')))
 outputs.ElectronicBandStructure.variables.m_annotations.setdefault(
     MAPPING_ANNOTATION_KEY, {}
-).update(dict(bandstructure_xml=Mapper(mapper='.@')))
+).update(dict(bandstructure_xml=Mapper(mapper='.variables')))
 outputs.ElectronicBandStructure.value.m_annotations.setdefault(
     MAPPING_ANNOTATION_KEY, {}
 ).update(dict(bandstructure_xml=Mapper(mapper='.energies')))
+#### band edges of the eigenvalues and band structures
+outputs.ElectronicEigenvalues.spin_channel.m_annotations.setdefault(
+    MAPPING_ANNOTATION_KEY, {}
+).update(
+    dict(
+        eigval=Mapper(mapper='.spin_channel'),
+        bandstructure_xml=Mapper(mapper='.spin_channel'),
+    )
+)
+outputs.ElectronicEigenvalues.highest_occupied.m_annotations.setdefault(
+    MAPPING_ANNOTATION_KEY, {}
+).update(
+    dict(
+        eigval=Mapper(mapper='.highest_occupied', unit='hartree'),
+        bandstructure_xml=Mapper(mapper='.highest_occupied', unit='hartree'),
+    )
+)
+outputs.ElectronicEigenvalues.lowest_unoccupied.m_annotations.setdefault(
+    MAPPING_ANNOTATION_KEY, {}
+).update(
+    dict(
+        eigval=Mapper(mapper='.lowest_unoccupied', unit='hartree'),
+        bandstructure_xml=Mapper(mapper='.lowest_unoccupied', unit='hartree'),
+    )
+)
+### band gaps of the eigenvalues and band structures
+outputs.Outputs.electronic_band_gaps.m_annotations.setdefault(
+    MAPPING_ANNOTATION_KEY, {}
+).update(
+    dict(
+        eigval=Mapper(mapper=('get_band_gaps', ['.@'])),
+        bandstructure_xml=Mapper(mapper=('get_band_gaps', ['.@'])),
+    )
+)
+properties.ElectronicBandGap.type.m_annotations.setdefault(
+    MAPPING_ANNOTATION_KEY, {}
+).update(
+    dict(
+        eigval=Mapper(mapper='.type'),
+        bandstructure_xml=Mapper(mapper='.type'),
+    )
+)
+properties.ElectronicBandGap.value.m_annotations.setdefault(
+    MAPPING_ANNOTATION_KEY, {}
+).update(
+    dict(
+        eigval=Mapper(mapper='.value', unit='hartree'),
+        bandstructure_xml=Mapper(mapper='.value', unit='hartree'),
+    )
+)
+properties.ElectronicBandGap.spin_channel.m_annotations.setdefault(
+    MAPPING_ANNOTATION_KEY, {}
+).update(
+    dict(
+        eigval=Mapper(mapper='.spin_channel'),
+        bandstructure_xml=Mapper(mapper='.spin_channel'),
+    )
+)
+properties.ElectronicBandGap.momentum_transfer.m_annotations.setdefault(
+    MAPPING_ANNOTATION_KEY, {}
+).update(dict(eigval=Mapper(mapper='.momentum_transfer')))
 ### electronic_dos
 outputs.Outputs.electronic_dos.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
     dos_xml=Mapper(mapper=('dos.totaldos.diagram'))
@@ -163,13 +676,182 @@ variables.Energy2.n_points.m_annotations.setdefault(MAPPING_ANNOTATION_KEY, {}).
     dict(dos_xml=Mapper(mapper='length(.point)'))
 )
 variables.Energy2.points.m_annotations.setdefault(MAPPING_ANNOTATION_KEY, {}).update(
-    dict(dos_xml=Mapper(mapper=('to_float', [r'.point[*]."@e"']), unit='hartree'))
+    dict(
+        dos_xml=Mapper(mapper=('to_dos_energies', [r'.point[*]."@e"']), unit='hartree')
+    )
 )
 ###### TODO read unit from axis
 outputs.ElectronicDensityOfStates.value.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
-    dos_xml=Mapper(mapper=('to_float', [r'.point[*]."@dos"']), unit='1/hartree')
+    dos_xml=Mapper(mapper=('to_dos', [r'.point[*]."@dos"']), unit='1/hartree')
 )
 outputs.ElectronicDensityOfStates.projected_dos.m_annotations[
     MAPPING_ANNOTATION_KEY
 ] = dict(dos_xml=Mapper(mapper='dos.partialdos.diagram'))
+### previews of the dos and bandstructure
+ElectronicDensityOfStates.x_exciting_previews.m_annotations[MAPPING_ANNOTATION_KEY] = (
+    dict(dos_xml=Mapper(mapper=('get_dos_previews', ['.@'])))
+)
+ElectronicBandStructure.x_exciting_previews.m_annotations[MAPPING_ANNOTATION_KEY] = (
+    dict(bandstructure_xml=Mapper(mapper='.previews'))
+)
+Preview.n_points.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    dos_xml=Mapper(mapper='.n_points'), bandstructure_xml=Mapper(mapper='.n_points')
+)
+Preview.n_bins.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    dos_xml=Mapper(mapper='.n_bins'), bandstructure_xml=Mapper(mapper='.n_bins')
+)
+Preview.first_points.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    dos_xml=Mapper(mapper='.first_points'),
+    bandstructure_xml=Mapper(mapper='.first_points'),
+)
+DOSPreview.energies.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    dos_xml=Mapper(mapper='.points', unit='hartree')
+)
+DOSPreview.minimum.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    dos_xml=Mapper(mapper='.minimum', unit='1/hartree')
+)
+DOSPreview.maximum.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    dos_xml=Mapper(mapper='.maximum', unit='1/hartree')
+)
+BandStructurePreview.minimum.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    bandstructure_xml=Mapper(mapper='.minimum', unit='hartree')
+)
+BandStructurePreview.maximum.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    bandstructure_xml=Mapper(mapper='.maximum', unit='hartree')
+)
+### bandstructure and dos from the text plot files
+outputs.Outputs.electronic_band_structures.m_annotations[MAPPING_ANNOTATION_KEY].update(
+    band_out=Mapper(mapper='.bandstructure')
+)
+outputs.ElectronicBandStructure.n_bands.m_annotations[MAPPING_ANNOTATION_KEY].update(
+    band_out=Mapper(mapper='.n_states')
+)
+outputs.ElectronicBandStructure.variables.m_annotations[MAPPING_ANNOTATION_KEY].update(
+    band_out=Mapper(mapper='.@')
+)
+outputs.ElectronicBandStructure.value.m_annotations[MAPPING_ANNOTATION_KEY].update(
+    band_out=Mapper(mapper='.energies', unit='hartree')
+)
+outputs.Outputs.electronic_dos.m_annotations[MAPPING_ANNOTATION_KEY].update(
+    dos_out=Mapper(mapper='.dos')
+)
+variables.Energy2.m_def.m_annotations[MAPPING_ANNOTATION_KEY].update(
+    dos_out=Mapper(mapper='.@')
+)
+variables.Energy2.n_points.m_annotations[MAPPING_ANNOTATION_KEY].update(
+    dos_out=Mapper(mapper='.n_points')
+)
+variables.Energy2.points.m_annotations[MAPPING_ANNOTATION_KEY].update(
+    dos_out=Mapper(mapper='.energies', unit='hartree')
+)
+outputs.ElectronicDensityOfStates.value.m_annotations[MAPPING_ANNOTATION_KEY].update(
+    dos_out=Mapper(mapper='.value', unit='1/hartree')
+)
+outputs.ElectronicDensityOfStates.spin_channel.m_annotations.setdefault(
+    MAPPING_ANNOTATION_KEY, {}
+).update(dict(dos_out=Mapper(mapper='.spin_channel')))
+outputs.ElectronicDensityOfStates.projected_dos.m_annotations[
+    MAPPING_ANNOTATION_KEY
+].update(dos_out=Mapper(mapper='.projected_dos'))
+outputs.ElectronicDensityOfStates.label.m_annotations.setdefault(
+    MAPPING_ANNOTATION_KEY, {}
+).update(dict(dos_out=Mapper(mapper='.label')))
+### GW quasiparticle eigenvalues
+outputs.Outputs.electronic_eigenvalues.m_annotations[MAPPING_ANNOTATION_KEY].update(
+    evalqp=Mapper(mapper=('get_quasiparticle_eigenvalues', ['.quasiparticles']))
+)
+outputs.ElectronicEigenvalues.n_bands.m_annotations[MAPPING_ANNOTATION_KEY].update(
+    evalqp=Mapper(mapper='.n_bands')
+)
+outputs.ElectronicEigenvalues.variables.m_annotations[MAPPING_ANNOTATION_KEY].update(
+    evalqp=Mapper(mapper='.@')
+)
+outputs.ElectronicEigenvalues.value.m_annotations[MAPPING_ANNOTATION_KEY].update(
+    evalqp=Mapper(mapper='.value', unit='hartree')
+)
+outputs.ElectronicEigenvalues.label.m_annotations.setdefault(
+    MAPPING_ANNOTATION_KEY, {}
+).update(dict(evalqp=Mapper(mapper='.label')))
+ElectronicEigenvalues.x_exciting_quasiparticle_weights.m_annotations[
+    MAPPING_ANNOTATION_KEY
+] = dict(evalqp=Mapper(mapper='.quasiparticle_weights'))
+#### self-energy components
+outputs.ElectronicEigenvalues.value_contributions.m_annotations.setdefault(
+    MAPPING_ANNOTATION_KEY, {}
+).update(dict(evalqp=Mapper(mapper='.contributions')))
+### GW band gaps and fermi level
+outputs.Outputs.electronic_band_gaps.m_annotations.setdefault(
+    MAPPING_ANNOTATION_KEY, {}
+).update(dict(gw_info=Mapper(mapper=('get_band_gaps', ['.gw']))))
+properties.ElectronicBandGap.type.m_annotations.setdefault(
+    MAPPING_ANNOTATION_KEY, {}
+).update(dict(gw_info=Mapper(mapper='.type')))
+properties.ElectronicBandGap.label.m_annotations.setdefault(
+    MAPPING_ANNOTATION_KEY, {}
+).update(dict(gw_info=Mapper(mapper='.label')))
+properties.ElectronicBandGap.value.m_annotations.setdefault(
+    MAPPING_ANNOTATION_KEY, {}
+).update(dict(gw_info=Mapper(mapper='.value', unit='eV')))
+outputs.Outputs.fermi_levels.m_annotations.setdefault(
+    MAPPING_ANNOTATION_KEY, {}
+).update(dict(gw_info=Mapper(mapper='.gw')))
+properties.FermiLevel.value.m_annotations.setdefault(MAPPING_ANNOTATION_KEY, {}).update(
+    dict(gw_info=Mapper(mapper='.fermi_energy', unit='hartree'))
+)
+### BSE and TDDFT spectra
+Outputs.x_exciting_spectra.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    spectra=Mapper(mapper='.spectra')
+)
+Spectra.kind.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    spectra=Mapper(mapper='.kind')
+)
+Spectra.n_files.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    spectra=Mapper(mapper='.n_files')
+)
+Spectra.n_frequencies.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    spectra=Mapper(mapper='.n_frequencies')
+)
+Spectra.labels.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    spectra=Mapper(mapper='.labels')
+)
+Spectra.frequencies.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    spectra=Mapper(mapper='.frequencies', unit='hartree')
+)
+Spectra.value.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    spectra=Mapper(mapper='.values')
+)
+### structure optimization trajectory
+Simulation.x_exciting_trajectory.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper=('get_trajectory', ['.@']))
+)
+Trajectory.n_steps.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.n_steps')
+)
+Trajectory.page_size.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.page_size')
+)
+Trajectory.kept_steps.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.kept_steps')
+)
+Trajectory.pages.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.pages')
+)
+TrajectoryPage.first_step.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.first_step')
+)
+TrajectoryPage.n_steps.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.n_steps')
+)
+TrajectoryPage.n_atoms.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.n_atoms')
+)
+TrajectoryPage.positions.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.positions', unit='bohr')
+)
+TrajectoryPage.total_energies.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.total_energies', unit='hartree')
+)
+TrajectoryPage.forces.m_annotations[MAPPING_ANNOTATION_KEY] = dict(
+    info=Mapper(mapper='.forces', unit='hartree/bohr')
+)
 m_package.__init_metainfo__()
@@ -0,0 +1,124 @@
+import builtins
+import json
+import os
+import re
+import threading
+import time
+
+import numpy as np
+import pytest
+
+BASELINES_FILE = os.path.join(os.path.dirname(__file__), 'baselines.json')
+# relative slowdown with respect to the baseline that is flagged as a regression
+TOLERANCE = 0.5
+# timings below this many calibration units are dominated by noise
+MIN_UNITS = 1.0
+
+
+def calibrate(rounds: int = 5) -> float:
+    """
+    Times a fixed regex and numpy workload representative of the parsers. Benchmark
+    timings are stored in units of this workload such that baselines recorded on one
+    machine remain meaningful on another.
+    """
+    text = '\n'.join(f' Total energy : {-n * 1.5:20.8f}' for n in range(20000))
+    pattern = re.compile(r'energy : +([\-\d\.]+)')
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        np.array(pattern.findall(text), dtype=float)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+@pytest.fixture(scope='session')
+def benchmark_baselines(request):
+    """
+    Loads the stored baselines and writes the collected results back at the end of
+    the session if --benchmark-update is given.
+    """
+    baselines = {}
+    if os.path.isfile(BASELINES_FILE):
+        with open(BASELINES_FILE) as f:
+            baselines = json.load(f)
+    baselines = baselines.get('results', {})
+    results = {}
+    yield baselines, results
+
+    if request.config.getoption('--benchmark-update') and results:
+        # only the benchmarks that were run are updated
+        baselines.update(results)
+        with open(BASELINES_FILE, 'w') as f:
+            json.dump(dict(results=baselines), f, indent=2, sort_keys=True)
+            f.write('\n')
+
+
+@pytest.fixture(scope='session')
+def benchmark_unit():
+    return calibrate()
+
+
+@pytest.fixture
+def benchmark(request, benchmark_baselines, benchmark_unit):
+    """
+    Returns a function timing a callable over a number of rounds. The best time is
+    compared against the stored baseline and a regression beyond `TOLERANCE` fails
+    the test.
+    """
+    baselines, results = benchmark_baselines
+    update = request.config.getoption('--benchmark-update')
+
+    def run(func, *args, rounds: int = 3, **kwargs) -> float:
+        times = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            func(*args, **kwargs)
+            times.append(time.perf_counter() - start)
+        elapsed = min(times)
+        relative = elapsed / benchmark_unit
+        name = request.node.name
+        results[name] = round(relative, 3)
+        print(f'{name}: {elapsed:.4f} s ({relative:.1f} units)')
+
+        baseline = baselines.get(name)
+        if baseline is not None and not update:
+            assert relative <= max(baseline, MIN_UNITS) * (1 + TOLERANCE), (
+                f'{name} regressed: {relative:.1f} units, baseline {baseline:.1f}'
+            )
+        return elapsed
+
+    return run
+
+
+@pytest.fixture
+def throttled_filesystem(monkeypatch):
+    """
+    Returns a function emulating a high-latency shared filesystem for the files in a
+    directory. The first open of a file costs `latency` plus its size over `bandwidth`,
+    concurrent opens wait for it and later opens find the file in the emulated client
+    cache. Each call starts with a cold cache.
+    """
+    real_open = builtins.open
+
+    def throttle(directory: str, latency: float = 0.05, bandwidth: float = 50e6):
+        directory = os.path.abspath(directory)
+        cache: dict[str, threading.Event] = {}
+        lock = threading.Lock()
+
+        def throttled_open(file, *args, **kwargs):
+            path = os.path.abspath(file) if isinstance(file, str) else ''
+            if path.startswith(directory):
+                with lock:
+                    event = cache.get(path)
+                    cold = event is None
+                    if cold:
+                        event = cache[path] = threading.Event()
+                if cold:
+                    time.sleep(latency + os.path.getsize(path) / bandwidth)
+                    event.set()
+                event.wait()
+            return real_open(file, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, 'open', throttled_open)
+
+    return throttle
@@ -0,0 +1,324 @@
+import logging
+import os
+
+import pytest
+from generators.exciting import SPECIES, ExcitingInputSize, write_calculation
+from nomad.datamodel import EntryArchive
+
+from nomad_simulation_parsers.parsers.exciting.eigval_reader import EigvalReader
+from nomad_simulation_parsers.parsers.exciting.gw_reader import EvalqpReader
+from nomad_simulation_parsers.parsers.exciting.info_reader import InfoReader
+from nomad_simulation_parsers.parsers.exciting.parser import (
+    BandstructureXMLParser,
+    BandTextParser,
+    DosTextParser,
+    DosXMLParser,
+    EigvalParser,
+    ExcitingParser,
+    InputXMLParser,
+    SpectraParser,
+)
+from nomad_simulation_parsers.parsers.exciting.plot_reader import find_pdos
+from nomad_simulation_parsers.parsers.exciting.species_reader import SpeciesCache
+from nomad_simulation_parsers.parsers.exciting.spectra_reader import find_spectra
+
+pytestmark = pytest.mark.benchmark
+
+# scaling axes of the individual readers, all other sizes are kept at their default
+INFO_SCALING = [
+    ('n_atoms', 2),
+    ('n_atoms', 64),
+    ('n_atoms', 512),
+    ('n_scf', 10),
+    ('n_scf', 100),
+    ('n_scf', 1000),
+    ('n_optimization_steps', 10),
+    ('n_optimization_steps', 100),
+]
+# SCF heavy files to compare the readers with and without units
+SCF_SCALING = [
+    ('n_scf', 100),
+    ('n_scf', 1000),
+]
+EIGVAL_SCALING = [
+    ('n_kpoints', 10),
+    ('n_kpoints', 100),
+    ('n_kpoints', 1000),
+    ('n_bands', 100),
+    ('n_bands', 1000),
+]
+DOS_SCALING = [
+    ('n_dos_points', 100),
+    ('n_dos_points', 1000),
+    ('n_dos_points', 10000),
+    ('n_dos_channels', 16),
+    ('n_atoms', 32),
+]
+# number of PDOS_S*_A*.OUT files read with TDOS.OUT
+PDOS_SCALING = [
+    ('n_atoms', 64),
+    ('n_atoms', 1024),
+    ('n_dos_points', 10000),
+]
+# number of files of each spectrum kind and frequencies per file
+SPECTRA_SCALING = [
+    ('n_spectra', 10),
+    ('n_spectra', 100),
+    ('n_spectra', 300),
+    ('n_frequencies', 10000),
+]
+ENTRY_SCALING = {
+    'small': ExcitingInputSize(),
+    'medium': ExcitingInputSize(
+        n_atoms=32, n_species=2, n_scf=50, n_kpoints=100, n_bands=100
+    ),
+    'large': ExcitingInputSize(
+        n_atoms=128,
+        n_species=3,
+        n_scf=100,
+        n_optimization_steps=20,
+        n_kpoints=400,
+        n_bands=200,
+        n_dos_points=2000,
+    ),
+}
+
+# entry with large auxiliary files and SCF loop to compare the full and summary modes
+SUMMARY_SCALING = ExcitingInputSize(
+    n_atoms=128,
+    n_species=3,
+    n_scf=100,
+    n_kpoints=400,
+    n_bands=200,
+    n_dos_points=2000,
+)
+
+# long relaxation to measure the scaling of the parallel parsing of the SCF iterations
+# and optimization steps with the number of worker processes
+PARALLEL_SCALING = ExcitingInputSize(n_atoms=16, n_scf=40, n_optimization_steps=200)
+PARALLEL_WORKERS = [1, 2, 4, 8, 16]
+
+
+def scaling_id(case: tuple[str, int]) -> str:
+    return f'{case[0]}-{case[1]}'
+
+
+@pytest.fixture(scope='module')
+def calculations(tmp_path_factory):
+    """
+    Writes each requested calculation once per module.
+    """
+    written = {}
+
+    def get(size: ExcitingInputSize, files: list[str] = None) -> str:
+        key = (tuple(size.to_dict().items()), tuple(files or []))
+        if key not in written:
+            directory = tmp_path_factory.mktemp('exciting')
+            written[key] = os.path.dirname(
+                write_calculation(str(directory), size, files=files)
+            )
+        return written[key]
+
+    return get
+
+
+@pytest.mark.parametrize('case', INFO_SCALING, ids=scaling_id)
+def test_info_reader(benchmark, calculations, case):
+    directory = calculations(ExcitingInputSize(**dict([case])), ['INFO.OUT'])
+
+    def parse():
+        reader = InfoReader()
+        reader.mainfile = os.path.join(directory, 'INFO.OUT')
+        reader.parse()
+
+    benchmark(parse)
+
+
+@pytest.mark.parametrize('units', [True, False], ids=['units', 'raw'])
+@pytest.mark.parametrize('case', SCF_SCALING, ids=scaling_id)
+def test_info_reader_units(benchmark, calculations, case, units):
+    directory = calculations(ExcitingInputSize(**dict([case])), ['INFO.OUT'])
+
+    def parse():
+        reader = InfoReader(units=units)
+        reader.mainfile = os.path.join(directory, 'INFO.OUT')
+        reader.parse()
+
+    benchmark(parse)
+
+
+@pytest.mark.parametrize('case', EIGVAL_SCALING, ids=scaling_id)
+def test_eigval_reader(benchmark, calculations, case):
+    directory = calculations(ExcitingInputSize(**dict([case])), ['EIGVAL.OUT'])
+
+    def parse():
+        parser = EigvalParser(
+            filepath=os.path.join(directory, 'EIGVAL.OUT'), text_parser=EigvalReader()
+        )
+        parser.get_eigenvalues(parser.data)
+
+    benchmark(parse)
+
+
+@pytest.mark.parametrize('case', EIGVAL_SCALING, ids=scaling_id)
+def test_evalqp_reader(benchmark, calculations, case):
+    directory = calculations(ExcitingInputSize(**dict([case])), ['EVALQP.DAT'])
+
+    def parse():
+        reader = EvalqpReader()
+        reader.mainfile = os.path.join(directory, 'EVALQP.DAT')
+        reader.parse()
+
+    benchmark(parse)
+
+
+@pytest.mark.parametrize('case', EIGVAL_SCALING, ids=scaling_id)
+def test_band_text_reader(benchmark, calculations, case):
+    directory = calculations(ExcitingInputSize(**dict([case])), ['BAND.OUT'])
+
+    def parse():
+        parser = BandTextParser(filepath=os.path.join(directory, 'BAND.OUT'))
+        parser.data  # noqa: B018
+
+    benchmark(parse)
+
+
+@pytest.mark.parametrize('case', PDOS_SCALING, ids=scaling_id)
+def test_dos_text_reader(benchmark, calculations, case):
+    directory = calculations(ExcitingInputSize(**dict([case])), ['TDOS.OUT', 'PDOS'])
+
+    def parse():
+        parser = DosTextParser(
+            filepath=os.path.join(directory, 'TDOS.OUT'),
+            pdos_files=find_pdos(directory),
+        )
+        parser.data  # noqa: B018
+
+    benchmark(parse)
+
+
+@pytest.mark.parametrize('case', SPECTRA_SCALING, ids=scaling_id)
+def test_spectra_reader(benchmark, calculations, case):
+    directory = calculations(ExcitingInputSize(**dict([case])), ['spectra'])
+
+    def parse():
+        parser = SpectraParser(filepath=directory, files=find_spectra(directory))
+        parser.data  # noqa: B018
+
+    benchmark(parse)
+
+
+@pytest.mark.parametrize('case', EIGVAL_SCALING, ids=scaling_id)
+def test_bandstructure_reader(benchmark, calculations, case):
+    directory = calculations(ExcitingInputSize(**dict([case])), ['bandstructure.xml'])
+
+    def parse():
+        parser = BandstructureXMLParser(
+            filepath=os.path.join(directory, 'bandstructure.xml')
+        )
+        parser.get_bandstructures(parser.data)
+
+    benchmark(parse)
+
+
+@pytest.mark.parametrize('case', DOS_SCALING, ids=scaling_id)
+def test_dos_reader(benchmark, calculations, case):
+    directory = calculations(ExcitingInputSize(**dict([case])), ['dos.xml'])
+
+    def parse():
+        parser = DosXMLParser(filepath=os.path.join(directory, 'dos.xml'))
+        assert parser.data
+
+    benchmark(parse)
+
+
+@pytest.mark.parametrize('case', [('n_atoms', 2), ('n_atoms', 512)], ids=scaling_id)
+def test_input_reader(benchmark, calculations, case):
+    directory = calculations(ExcitingInputSize(**dict([case])), ['input.xml'])
+
+    def parse():
+        parser = InputXMLParser(filepath=os.path.join(directory, 'input.xml'))
+        assert parser.data
+
+    benchmark(parse)
+
+
+@pytest.mark.parametrize('name', ENTRY_SCALING.keys())
+def test_exciting_parser(benchmark, calculations, name):
+    directory = calculations(ENTRY_SCALING[name])
+
+    def parse():
+        ExcitingParser().parse(
+            os.path.join(directory, 'INFO.OUT'), EntryArchive(), logging.getLogger()
+        )
+
+    benchmark(parse, rounds=1)
+
+
+@pytest.mark.parametrize('read_ahead', [False, True], ids=['sequential', 'read_ahead'])
+def test_exciting_parser_throttled(
+    benchmark, calculations, throttled_filesystem, read_ahead
+):
+    directory = calculations(ENTRY_SCALING['medium'])
+
+    def parse():
+        throttled_filesystem(directory)
+        ExcitingParser(read_ahead=read_ahead).parse(
+            os.path.join(directory, 'INFO.OUT'), EntryArchive(), logging.getLogger()
+        )
+
+    benchmark(parse, rounds=1)
+
+
+@pytest.mark.parametrize('summary', [False, True], ids=['full', 'summary'])
+def test_exciting_parser_summary(benchmark, calculations, summary):
+    directory = calculations(SUMMARY_SCALING)
+
+    def parse():
+        ExcitingParser(summary=summary).parse(
+            os.path.join(directory, 'INFO.OUT'), EntryArchive(), logging.getLogger()
+        )
+
+    benchmark(parse, rounds=1)
+
+
+@pytest.mark.parametrize('workers', PARALLEL_WORKERS, ids=lambda n: f'workers-{n}')
+def test_info_reader_parallel(benchmark, calculations, workers):
+    directory = calculations(PARALLEL_SCALING, ['INFO.OUT'])
+
+    def parse():
+        reader = InfoReader(workers=workers, parallel_min_size=0)
+        reader.mainfile = os.path.join(directory, 'INFO.OUT')
+        reader.parse()
+
+    benchmark(parse, rounds=1)
+
+
+@pytest.mark.parametrize('cached', [False, True], ids=['cold', 'warm'])
+def test_species_cache(benchmark, calculations, cached):
+    directory = calculations(ExcitingInputSize(n_atoms=5, n_species=5), ['species'])
+    filepaths = [os.path.join(directory, f'{s[0]}.xml') for s in SPECIES]
+    cache = SpeciesCache()
+
+    def parse():
+        if not cached:
+            cache.clear()
+        for filepath in filepaths:
+            cache.get(filepath)
+
+    benchmark(parse)
+
+
+@pytest.mark.parametrize('n_folders', [10, 100])
+def test_discovery(benchmark, calculations, n_folders):
+    # a ground-state run in an upload with many sibling calculation folders
+    directory = calculations(ExcitingInputSize(), ['INFO.OUT', 'input.xml'])
+    for n in range(n_folders):
+        os.makedirs(os.path.join(directory, f'run_{n}', 'output'), exist_ok=True)
+    mainfile = os.path.join(directory, 'INFO.OUT')
+    parser = ExcitingParser()
+
+    def discover():
+        parser._discover(mainfile, {}, logging.getLogger())
+
+    benchmark(discover)
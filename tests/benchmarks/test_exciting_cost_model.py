@@ -0,0 +1,121 @@
+import logging
+import time
+import tracemalloc
+
+import numpy as np
+import pytest
+from generators.exciting import DEFAULT_FILES, ExcitingInputSize, write_calculation
+from nomad.datamodel import EntryArchive
+
+from nomad_simulation_parsers.parsers.exciting.cost_model import (
+    COST_MODEL,
+    CostModel,
+)
+from nomad_simulation_parsers.parsers.exciting.parser import ExcitingParser
+
+pytestmark = pytest.mark.benchmark
+
+# entries of the calibration corpus spanning each of the cost features
+COST_CORPUS = {
+    'default': (ExcitingInputSize(), DEFAULT_FILES),
+    'info_only': (ExcitingInputSize(n_atoms=8, n_scf=50), ['INFO.OUT']),
+    'scf': (ExcitingInputSize(n_scf=300), ['INFO.OUT', 'input.xml']),
+    'atoms': (ExcitingInputSize(n_atoms=256, n_species=3), ['INFO.OUT', 'input.xml']),
+    'optimization': (
+        ExcitingInputSize(n_atoms=32, n_scf=10, n_optimization_steps=50),
+        ['INFO.OUT', 'input.xml'],
+    ),
+    'eigval': (
+        ExcitingInputSize(n_kpoints=500, n_bands=200),
+        ['INFO.OUT', 'input.xml', 'EIGVAL.OUT'],
+    ),
+    'bandstructure': (
+        ExcitingInputSize(n_kpoints=500, n_bands=100),
+        ['INFO.OUT', 'input.xml', 'bandstructure.xml'],
+    ),
+    'dos': (
+        ExcitingInputSize(n_atoms=16, n_dos_points=5000),
+        ['INFO.OUT', 'input.xml', 'dos.xml'],
+    ),
+    'gw': (
+        ExcitingInputSize(n_kpoints=200, n_bands=100),
+        ['INFO.OUT', 'EIGVAL.OUT', 'EVALQP.DAT', 'GW_INFO.OUT'],
+    ),
+    'medium': (
+        ExcitingInputSize(
+            n_atoms=32, n_species=2, n_scf=50, n_kpoints=100, n_bands=100
+        ),
+        DEFAULT_FILES,
+    ),
+    'large': (
+        ExcitingInputSize(
+            n_atoms=128,
+            n_species=3,
+            n_scf=100,
+            n_kpoints=400,
+            n_bands=200,
+            n_dos_points=2000,
+        ),
+        DEFAULT_FILES,
+    ),
+}
+# maximum factor between the estimated and the measured memory, and the maximum
+# spread of the factors between the estimated and measured times, the machine speed
+# only scales all times alike
+MEMORY_FACTOR = 2.0
+TIME_SPREAD = 4.0
+
+
+def measure(mainfile: str) -> tuple[float, float]:
+    """
+    Returns the best wall time of two parses and the peak traced memory of a parse.
+    """
+    times = []
+    for _ in range(2):
+        start = time.perf_counter()
+        ExcitingParser().parse(mainfile, EntryArchive(), logging.getLogger())
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        ExcitingParser().parse(mainfile, EntryArchive(), logging.getLogger())
+        memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return min(times), memory
+
+
+@pytest.fixture(scope='module')
+def cost_corpus(tmp_path_factory):
+    """
+    Writes the calibration corpus and returns the estimate and the measured time and
+    memory of each entry.
+    """
+    parser = ExcitingParser()
+    corpus = {}
+    for name, (size, files) in COST_CORPUS.items():
+        directory = tmp_path_factory.mktemp(name)
+        mainfile = write_calculation(str(directory), size, files=files)
+        corpus[name] = (parser.estimate_cost(mainfile), *measure(mainfile))
+    return corpus
+
+
+def test_cost_model(cost_corpus):
+    estimates, times, memories = zip(*cost_corpus.values())
+    model = CostModel.fit([e['features'] for e in estimates], times, memories)
+    # coefficients to be stored in the cost model after a calibration
+    print(f'\ntime: {model.time_coefficients}\nmemory: {model.memory_coefficients}')
+    for name, (estimate, measured_time, memory) in cost_corpus.items():
+        print(
+            f'{name:<16s}{measured_time:>10.3f}{estimate["time"]:>10.3f}'
+            f'{memory:>14d}{estimate["memory"]:>14.0f}'
+        )
+
+    memory_factors = np.array([e['memory'] for e in estimates]) / memories
+    assert memory_factors.min() >= 1 / MEMORY_FACTOR
+    assert memory_factors.max() <= MEMORY_FACTOR
+    time_factors = np.array([e['time'] for e in estimates]) / times
+    assert time_factors.max() / time_factors.min() <= TIME_SPREAD
+    # the estimate ranks the entries like the measured times
+    order = np.argsort(times)
+    assert np.argsort([e['time'] for e in estimates])[-1] == order[-1]
+    assert COST_MODEL.estimate(estimates[0]['features'])['time'] > 0
@@ -0,0 +1,95 @@
+import logging
+import os
+import tracemalloc
+from typing import Any
+
+import pytest
+from generators.exciting import ExcitingInputSize, write_calculation
+from nomad.datamodel import EntryArchive
+
+from nomad_simulation_parsers.parsers.exciting.parser import ExcitingParser
+
+pytestmark = pytest.mark.benchmark
+
+# input file read in each stage of ExcitingParser.parse
+STAGE_FILES = {
+    'discovery': 'INFO.OUT',
+    'info': 'INFO.OUT',
+    'input_xml': 'input.xml',
+    'eigval': 'EIGVAL.OUT',
+    'bandstructure_xml': 'bandstructure.xml',
+    'dos_xml': 'dos.xml',
+}
+# upper bound of the peak traced memory of each stage per byte of its input file
+MEMORY_BUDGETS = {
+    'discovery': 2.0,
+    'info': 4.0,
+    'input_xml': 30.0,
+    'eigval': 4.0,
+    'bandstructure_xml': 12.0,
+    'dos_xml': 12.0,
+}
+# size independent allowance, e.g. for the schema sections created by each stage
+MEMORY_OVERHEAD = 1_000_000
+SIZES = {
+    'small': ExcitingInputSize(n_atoms=8, n_species=2, n_kpoints=20, n_bands=40),
+    'medium': ExcitingInputSize(
+        n_atoms=32,
+        n_species=2,
+        n_scf=50,
+        n_kpoints=100,
+        n_bands=100,
+        n_dos_points=500,
+    ),
+    'large': ExcitingInputSize(
+        n_atoms=128,
+        n_species=3,
+        n_scf=100,
+        n_kpoints=400,
+        n_bands=200,
+        n_dos_points=500,
+    ),
+}
+
+
+def profile_parse(mainfile: str, n_frames: int = 1) -> dict[str, dict[str, Any]]:
+    """
+    Parses `mainfile` with tracemalloc tracing and returns the metrics of each stage.
+    """
+    parser = ExcitingParser()
+    tracemalloc.start(n_frames)
+    try:
+        parser.parse(mainfile, EntryArchive(), logging.getLogger())
+    finally:
+        tracemalloc.stop()
+    return parser.stages
+
+
+def format_report(stages: dict[str, dict[str, Any]], directory: str) -> str:
+    lines = [
+        f'{"stage":<20s}{"input":>12s}{"peak":>12s}{"retained":>12s}'
+        f'{"peak/byte":>12s}{"time":>10s}'
+    ]
+    for name, metrics in stages.items():
+        n_bytes = os.path.getsize(os.path.join(directory, STAGE_FILES[name]))
+        lines.append(
+            f'{name:<20s}{n_bytes:>12d}{metrics["memory_peak"]:>12d}'
+            f'{metrics["memory_retained"]:>12d}'
+            f'{metrics["memory_peak"] / n_bytes:>12.2f}{metrics["time"]:>10.3f}'
+        )
+        for site, size in metrics['top_allocations'][:3]:
+            lines.append(f'    {size:>12d}  {site}')
+    return '\n'.join(lines)
+
+
+@pytest.mark.parametrize('name', SIZES.keys())
+def test_memory_budgets(tmp_path, name):
+    mainfile = write_calculation(str(tmp_path), SIZES[name])
+    stages = profile_parse(mainfile)
+    print(f'\n{name}\n{format_report(stages, str(tmp_path))}')
+
+    assert set(stages) == set(STAGE_FILES)
+    for stage, metrics in stages.items():
+        n_bytes = os.path.getsize(os.path.join(str(tmp_path), STAGE_FILES[stage]))
+        budget = MEMORY_OVERHEAD + MEMORY_BUDGETS[stage] * n_bytes
+        assert metrics['memory_peak'] <= budget, stage
@@ -0,0 +1,91 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from generators.exciting import DEFAULT_FILES, ExcitingInputSize, write_calculation
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires os.fork'),
+]
+
+# maximum ratio of the first-parse latency of a forked worker with and without warmup
+# of the parent
+WARMUP_FACTOR = 0.8
+# parent process forking workers which each time their first parse and report it
+# together with the private memory they dirtied, in kB if available
+WORKER_SCRIPT = """
+import json, logging, os, sys, time
+
+from nomad.datamodel import EntryArchive
+
+from nomad_simulation_parsers.parsers import exciting_parser_entry_point
+from nomad_simulation_parsers.parsers.exciting.parser import ExcitingParser
+
+mainfile, warmup, rounds = sys.argv[1], sys.argv[2] == 'True', int(sys.argv[3])
+if warmup:
+    exciting_parser_entry_point.warmup()
+
+
+def private_dirty():
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Private_Dirty:'):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+
+
+results = []
+for _ in range(rounds):
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read)
+        before = private_dirty()
+        start = time.perf_counter()
+        ExcitingParser().parse(mainfile, EntryArchive(), logging.getLogger())
+        latency = time.perf_counter() - start
+        after = private_dirty()
+        memory = after - before if before is not None and after is not None else None
+        os.write(write, json.dumps([latency, memory]).encode())
+        os._exit(0)
+    os.close(write)
+    with os.fdopen(read) as f:
+        results.append(json.loads(f.read()))
+    os.waitpid(pid, 0)
+print(json.dumps(results))
+"""
+
+
+def fork_workers(mainfile: str, warmup: bool, rounds: int = 3) -> list[list]:
+    """
+    Starts a fresh parent process, which is warmed up if `warmup`, and returns the
+    first-parse latency and dirtied memory of each of the `rounds` workers it forks.
+    """
+    output = subprocess.run(
+        [sys.executable, '-c', WORKER_SCRIPT, mainfile, str(warmup), str(rounds)],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_forked_first_parse(tmp_path):
+    mainfile = write_calculation(
+        str(tmp_path), ExcitingInputSize(), files=DEFAULT_FILES
+    )
+    latencies = {}
+    for warmup in (False, True):
+        results = fork_workers(mainfile, warmup)
+        latencies[warmup] = min(latency for latency, _ in results)
+        memories = [memory for _, memory in results if memory is not None]
+        print(
+            f'warmup={warmup}: first parse {latencies[warmup]:.4f} s'
+            + (f', dirtied {min(memories)} kB' if memories else '')
+        )
+    assert latencies[True] <= WARMUP_FACTOR * latencies[False]
@@ -0,0 +1,45 @@
+import pytest
+from generators.exciting import ExcitingInputSize, write_calculation
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--benchmark',
+        action='store_true',
+        default=False,
+        help='run the benchmark suite in tests/benchmarks',
+    )
+    parser.addoption(
+        '--benchmark-update',
+        action='store_true',
+        default=False,
+        help='overwrite the stored benchmark baselines with the current results',
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'benchmark: performance benchmark')
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--benchmark') or config.getoption('--benchmark-update'):
+        return
+    skip = pytest.mark.skip(reason='use --benchmark to run benchmarks')
+    for item in items:
+        if 'benchmark' in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def exciting_calculation(tmp_path):
+    """
+    Returns a function writing a synthetic exciting calculation into a temporary
+    directory and returning the path to its INFO.OUT.
+    """
+
+    def write(files: list[str] = None, **kwargs) -> str:
+        return write_calculation(
+            str(tmp_path), ExcitingInputSize(**kwargs), files=files
+        )
+
+    return write
@@ -0,0 +1,923 @@
+"""
+Writers for synthetic exciting outputs.
+
+The generated files follow the layout of the exciting nitrogen outputs closely enough
+to be parsed by the readers in `nomad_simulation_parsers.parsers.exciting`. All
+writers are deterministic for a given `seed` and scale linearly with their size
+parameters so that they can be used to benchmark the parser along each axis.
+"""
+
+import os
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+RULE_STAR = '*' * 80
+RULE_DASH = '+' + '-' * 78 + '+'
+RULE_PLUS = '+' * 80
+# Fermi energy in Hartree, larger than the band gap such that band energies relative
+# to it are told apart from absolute ones
+FERMI_ENERGY = 0.75
+
+SPECIES = [
+    ('Si', 'silicon', 14, 51196.73454316),
+    ('O', 'oxygen', 8, 29165.12203240),
+    ('Ga', 'gallium', 31, 127097.26045200),
+    ('As', 'arsenic', 33, 136573.71553900),
+    ('N', 'nitrogen', 7, 25532.65218210),
+]
+
+
+@dataclass
+class ExcitingInputSize:
+    """
+    Size parameters of a synthetic exciting calculation.
+
+    Args:
+        n_atoms (int): number of atoms in the unit cell
+        n_species (int): number of distinct species
+        n_scf (int): number of SCF iterations per self-consistent loop
+        n_optimization_steps (int): number of structure optimization steps
+        n_kpoints (int): number of k-points in EIGVAL.OUT and bandstructure.xml
+        n_bands (int): number of states per k-point
+        n_dos_points (int): number of energy points in dos.xml
+        n_dos_channels (int): number of (l, m) channels per atom in dos.xml
+        n_spin (int): number of spin channels
+        n_spectra (int): number of BSE spectrum files of each kind
+        n_frequencies (int): number of frequencies of the spectra
+        seed (int): seed for the random number generator
+    """
+
+    n_atoms: int = 2
+    n_species: int = 1
+    n_scf: int = 10
+    n_optimization_steps: int = 0
+    n_kpoints: int = 10
+    n_bands: int = 20
+    n_dos_points: int = 100
+    n_dos_channels: int = 4
+    n_spin: int = 1
+    n_spectra: int = 3
+    n_frequencies: int = 100
+    seed: int = 0
+
+    def __post_init__(self):
+        self.n_species = max(1, min(self.n_species, self.n_atoms, len(SPECIES)))
+
+    def to_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+def _species_atoms(size: ExcitingInputSize) -> list[list[int]]:
+    atoms = [[] for _ in range(size.n_species)]
+    for n in range(size.n_atoms):
+        atoms[n % size.n_species].append(n)
+    return atoms
+
+
+def _positions(size: ExcitingInputSize, rng: np.random.Generator) -> np.ndarray:
+    return rng.random((size.n_atoms, 3))
+
+
+def _lattice_vectors(size: ExcitingInputSize) -> np.ndarray:
+    scale = 5.13 * max(1.0, size.n_atoms / 2) ** (1 / 3)
+    return scale * np.array([[1.0, 1.0, 0.0], [1.0, 0.0, 1.0], [0.0, 1.0, 1.0]])
+
+
+def _atoms_block(
+    title: str, symbols: list[str], vectors: np.ndarray, fmt: str = '%14.8f'
+) -> str:
+    lines = [f' {title} :']
+    for n, (symbol, vector) in enumerate(zip(symbols, vectors)):
+        values = ' '.join(fmt % v for v in vector)
+        lines.append(f'     atom {n + 1:5d}    {symbol:<2s}{"":23s}:{values}')
+    return '\n'.join(lines)
+
+
+def _scf_block(
+    size: ExcitingInputSize, symbols: list[str], energy: float, n: int
+) -> str:
+    decay = 0.5**n
+    charges = '\n'.join(
+        f'                  atom {i + 1:5d}    {s:<2s}          :'
+        f'{12.91475296 + 1e-3 * decay:20.8f}'
+        for i, s in enumerate(symbols)
+    )
+    return '\n'.join(
+        [
+            f' Total energy                               :{energy:20.8f}',
+            ' ' + '_' * 63,
+            f' Fermi energy{"":31s}:{FERMI_ENERGY + decay:20.8f}',
+            f' Kinetic energy                             :{-energy:20.8f}',
+            f' Coulomb energy                             :{2 * energy:20.8f}',
+            f' Exchange energy                            :{-27.38 - decay:20.8f}',
+            f' Correlation energy                         :{-0.61 - decay:20.8f}',
+            ' ',
+            ' DOS at Fermi energy (states/Ha/cell)       :          0.00000000',
+            ' ',
+            ' Electron charges :',
+            f'     core                                   :{20.0:20.8f}',
+            f'     core leakage                           :{3.051e-5:20.8f}',
+            f'     valence                                :{8.0:20.8f}',
+            f'     interstitial                           :{2.17 + decay:20.8f}',
+            '     charge in muffin-tin spheres :',
+            charges,
+            f'     total charge                           :{28.0:20.8f}',
+            ' ',
+            f' Estimated fundamental gap                  :{0.0205 + decay:20.8f}',
+            f' Wall time (seconds)                        :{1.04 * (n + 1):20.2f}',
+            ' ',
+            f' RMS change in effective potential (target) :  {decay * 5.8e-3:.6E}'
+            '  ( 0.100000E-05)',
+            f' Absolute change in total energy   (target) :  {decay * 5.1e-2:.6E}'
+            '  ( 0.100000E-05)',
+            f' Charge distance                   (target) :  {decay * 2.9e-3:.6E}'
+            '  ( 0.100000E-04)',
+            f' Abs. change in max-nonIBS-force   (target) :  {decay * 1.1e-3:.6E}'
+            '  ( 0.100000E-03)',
+        ]
+    )
+
+
+def _scf_loop(
+    size: ExcitingInputSize, symbols: list[str], energy: float
+) -> tuple[str, float]:
+    lines = []
+    for n in range(size.n_scf):
+        energy_n = energy - 0.1 * 0.5**n
+        lines.extend(
+            [
+                RULE_STAR,
+                f'* SCF iteration number : {n + 1:4d}{"":52s}*',
+                RULE_STAR,
+                _scf_block(size, symbols, energy_n, n),
+                ' ',
+                RULE_DASH,
+            ]
+        )
+    lines.extend(
+        [
+            f'| Convergence targets achieved. Performing final SCF iteration{"":17s}|',
+            RULE_DASH,
+            _scf_block(size, symbols, energy, size.n_scf),
+            ' ',
+            RULE_PLUS,
+            f'| Self-consistent loop stopped{"":49s}|',
+            RULE_PLUS,
+        ]
+    )
+    return '\n'.join(lines), energy
+
+
+def write_info(filename: str, size: ExcitingInputSize) -> str:
+    """
+    Writes a synthetic exciting INFO.OUT file.
+
+    Args:
+        filename (str): path to the output file
+        size (ExcitingInputSize): size parameters of the calculation
+
+    Returns:
+        str: path to the written file
+    """
+    rng = np.random.default_rng(size.seed)
+    lattice_vectors = _lattice_vectors(size)
+    reciprocal = 2 * np.pi * np.linalg.inv(lattice_vectors).T
+    positions = _positions(size, rng)
+    species_atoms = _species_atoms(size)
+    symbols = [''] * size.n_atoms
+    for n_species, atoms in enumerate(species_atoms):
+        for n in atoms:
+            symbols[n] = SPECIES[n_species][0]
+
+    lines = [
+        '=' * 80,
+        f'| EXCITING NITROGEN-14 started{"":49s}=',
+        f'| version hash id: 1775bff4453c84689fb848894a9224f155377cfc{"":20s}=',
+        f'|{"":78s}=',
+        f'| Date (DD-MM-YYYY) : 10-12-2020{"":48s}=',
+        f'| All units are atomic (Hartree, Bohr, etc.){"":35s}=',
+        '=' * 80,
+        ' ',
+        RULE_STAR,
+        f'* Ground-state run starting from atomic densities{"":29s}*',
+        RULE_STAR,
+        ' ',
+        RULE_DASH,
+        f'| Starting initialization{"":54s}|',
+        RULE_DASH,
+        ' ',
+        ' Lattice vectors (cartesian) :',
+        *[' '.join(f'{v:18.10f}' for v in vec) for vec in lattice_vectors],
+        ' ',
+        ' Reciprocal lattice vectors (cartesian) :',
+        *[' '.join(f'{v:18.10f}' for v in vec) for vec in reciprocal],
+        ' ',
+        f' Unit cell volume                           :'
+        f'{abs(np.linalg.det(lattice_vectors)):20.10f}',
+        f' Brillouin zone volume                      :'
+        f'{abs(np.linalg.det(reciprocal)):20.10f}',
+        ' ',
+    ]
+    for n_species, atoms in enumerate(species_atoms):
+        symbol, name, charge, mass = SPECIES[n_species]
+        lines.extend(
+            [
+                f' Species : {n_species + 1:4d} ({symbol})',
+                f'     parameters loaded from                 :    {symbol}.xml',
+                f'     name                                   :    {name}',
+                f'     nuclear charge                         :{-charge:17.8f}',
+                f'     electronic charge                      :{charge:17.8f}',
+                f'     atomic mass                            :{mass:17.8f}',
+                f'     muffin-tin radius                      :{2.0:17.8f}',
+                '     # of radial points in muffin-tin       :     468',
+                ' ',
+                '     atomic positions (lattice) :',
+                *[
+                    f'{i + 1:8d} : ' + ' '.join(f'{v:12.8f}' for v in positions[atom])
+                    for i, atom in enumerate(atoms)
+                ],
+                ' ',
+            ]
+        )
+    spin = 'spin-unpolarised' if size.n_spin == 1 else 'spin-polarised'
+    lines.extend(
+        [
+            f' Total number of atoms per unit cell        :{size.n_atoms:8d}',
+            ' ',
+            f' Spin treatment                             :    {spin}',
+            ' ',
+            ' Number of Bravais lattice symmetries       :      48',
+            ' Number of crystal symmetries               :      24',
+            ' ',
+            ' k-point grid                               :       4    4    4',
+            ' k-point offset                             :    0.00  0.00  0.00',
+            f' Total number of k-points                   :{size.n_kpoints:8d}',
+            ' ',
+            ' R^MT_min * |G+k|_max (rgkmax)              :      7.00000000',
+            ' Maximum |G+k| for APW functions            :      3.50000000',
+            ' Maximum |G| for potential and density      :     12.00000000',
+            ' G-vector grid sizes                        :      36    36    36',
+            ' Total number of G-vectors                  :   23871',
+            ' ',
+            ' Maximum angular momentum used for',
+            '     APW functions                          :       8',
+            ' ',
+            f' Total nuclear charge                       :{-28.0:20.8f}',
+            f' Total core charge                          :{20.0:20.8f}',
+            f' Total valence charge                       :{8.0:20.8f}',
+            f' Total electronic charge                    :{28.0:20.8f}',
+            ' ',
+            ' Effective Wigner radius, r_s               :      3.55062021',
+            ' ',
+            f' Number of empty states                     :{size.n_bands - 4:8d}',
+            f' Total number of valence states             :{size.n_bands:8d}',
+            ' ',
+            ' Maximum Hamiltonian size                   :     263',
+            ' Maximum number of plane-waves              :     251',
+            ' Total number of local-orbitals             :      12',
+            ' ',
+            ' Exchange-correlation type                  :      20',
+            '     PBE, Perdew-Burke-Ernzerhof : Phys. Rev. Lett. 77, 3865 (1996)',
+            ' ',
+            ' Smearing scheme                            :    Gaussian',
+            ' Smearing width                             :      0.00100000',
+            ' ',
+            RULE_DASH,
+            f'| Ending initialization{"":56s}|',
+            RULE_DASH,
+            ' ',
+            RULE_STAR,
+            f'* Groundstate module started{"":50s}*',
+            RULE_STAR,
+        ]
+    )
+
+    energy = -578.56862058 * size.n_atoms / 2
+    scf_loop, energy = _scf_loop(size, symbols, energy)
+    lines.append(scf_loop)
+    forces = rng.random((size.n_atoms, 3)) * 1e-3
+    lines.extend(
+        [
+            ' ',
+            _atoms_block(
+                'Total atomic forces including IBS (cartesian)', symbols, forces
+            ),
+            ' ',
+            _atoms_block('Atomic positions (lattice)', symbols, positions),
+            '',
+            '',
+            RULE_STAR,
+            f'* Groundstate module stopped{"":50s}*',
+            RULE_STAR,
+            ' ',
+        ]
+    )
+
+    if size.n_optimization_steps:
+        lines.extend(
+            [
+                RULE_STAR,
+                f'* Structure-optimization module started{"":39s}*',
+                RULE_STAR,
+                ' ',
+            ]
+        )
+        for n in range(size.n_optimization_steps):
+            positions = positions + rng.normal(scale=1e-3, size=positions.shape)
+            forces = forces * 0.5
+            energy -= 1e-3 * 0.5**n
+            lines.extend(
+                [
+                    f' Optimization step {n + 1:4d}: (method = newton)',
+                    f' Number of total scf iterations             :{size.n_scf:8d}',
+                    ' Maximum force magnitude           (target) :  '
+                    f'{np.abs(forces).max():.8f}  (  0.00010000)',
+                    f' Total energy at this optimization step     :{energy:20.8f}',
+                    _atoms_block(
+                        'Atomic positions at this step (lattice)', symbols, positions
+                    ),
+                    '',
+                    _atoms_block(
+                        'Total atomic forces including IBS (cartesian)',
+                        symbols,
+                        forces,
+                    ),
+                    f' Time spent in this optimization step       :'
+                    f'{12.34 * (n + 1):14.2f} seconds',
+                    ' ',
+                ]
+            )
+        scf_loop, energy = _scf_loop(size, symbols, energy)
+        lines.extend(
+            [
+                RULE_DASH,
+                f'| Force convergence target achieved{"":43s}|',
+                RULE_DASH,
+                scf_loop,
+                ' ',
+                _atoms_block(
+                    'Optimized atomic positions (lattice)', symbols, positions
+                ),
+                '',
+                '',
+                _atoms_block(
+                    'Total atomic forces including IBS (cartesian)', symbols, forces
+                ),
+                ' ',
+                ' Atomic forces converged',
+                ' ',
+                RULE_STAR,
+                f'* Structure-optimization module stopped{"":39s}*',
+                RULE_STAR,
+                ' ',
+            ]
+        )
+
+    lines.extend(
+        [
+            RULE_STAR,
+            f'| EXCITING NITROGEN-14 stopped{"":49s}=',
+            ' Total time spent (seconds)                 :        12.51',
+            '=' * 80,
+            '',
+        ]
+    )
+
+    with open(filename, 'w') as f:
+        f.write('\n'.join(lines))
+    return filename
+
+
+def _kpoints(size: ExcitingInputSize) -> np.ndarray:
+    return np.linspace(0, 0.5, size.n_kpoints)[:, None] * np.array([1.0, 1.0, 0.0])
+
+
+def _eigenvalues(size: ExcitingInputSize) -> np.ndarray:
+    """
+    Returns (n_spin, n_kpoints, n_bands) band energies in Hartree relative to the
+    Fermi energy with a gap opening between the occupied and unoccupied states, as
+    written to bandstructure.xml and BAND.OUT.
+    """
+    k = np.linspace(0, np.pi, size.n_kpoints)
+    bands = np.arange(size.n_bands)
+    n_occupied = size.n_bands // 2
+    offsets = np.where(bands < n_occupied, -0.5, 0.1) + 0.05 * bands
+    energies = offsets[None, :] + 0.02 * np.cos(k)[:, None] * (1 + bands % 3)
+    return np.stack([energies + 0.001 * spin for spin in range(size.n_spin)])
+
+
+def write_eigval(filename: str, size: ExcitingInputSize) -> str:
+    """
+    Writes a synthetic exciting EIGVAL.OUT file with absolute eigenvalues.
+    """
+    energies = _eigenvalues(size) + FERMI_ENERGY
+    n_occupied = size.n_bands // 2
+    occupancy = 2.0 / size.n_spin
+    n_states = size.n_bands * size.n_spin
+    lines = [f'{size.n_kpoints:6d} : nkpt', f'{n_states:6d} : nstsv', '']
+    for nk, kpoint in enumerate(_kpoints(size)):
+        lines.append(
+            f'{nk + 1:6d}  '
+            + ' '.join(f'{v:.12E}' for v in kpoint)
+            + f'  {1.0 / size.n_kpoints:.12E} : k-point, vkl, wkpt'
+        )
+        lines.append(' (state, eigenvalue and occupancy below)')
+        for spin in range(size.n_spin):
+            for nb in range(size.n_bands):
+                occ = occupancy if nb < n_occupied else 0.0
+                lines.append(
+                    f'{spin * size.n_bands + nb + 1:6d}'
+                    f'{energies[spin, nk, nb]:20.10f}{occ:20.10f}'
+                )
+        lines.append(' ')
+        lines.append('')
+
+    with open(filename, 'w') as f:
+        f.write('\n'.join(lines))
+    return filename
+
+
+# self-energy components of the synthetic GW calculation
+QP_LABELS = ['E_KS', 'E_HF', 'E_GW', 'Sx', 'Re(Sc)', 'Im(Sc)', 'Vxc', 'DE_HF', 'DE_GW']
+
+
+def _quasiparticles(size: ExcitingInputSize) -> dict[str, np.ndarray]:
+    """
+    Returns the (n_kpoints, n_bands) quasiparticle table columns in Hartree and the
+    quasiparticle weights `Znk` of the first spin channel.
+    """
+    e_ks = _eigenvalues(size)[0]
+    occupied = np.arange(size.n_bands) < size.n_bands // 2
+    vxc = -0.4 - 0.01 * e_ks
+    sx = np.where(occupied, -0.6, -0.2) + 0.02 * e_ks
+    re_sc = np.where(occupied, 0.15, -0.05) + 0.01 * e_ks
+    z = np.full_like(e_ks, 0.8)
+    e_hf = e_ks + sx - vxc
+    e_gw = e_ks + z * (sx + re_sc - vxc)
+    return {
+        'E_KS': e_ks,
+        'E_HF': e_hf,
+        'E_GW': e_gw,
+        'Sx': sx,
+        'Re(Sc)': re_sc,
+        'Im(Sc)': np.full_like(e_ks, 1e-4),
+        'Vxc': vxc,
+        'DE_HF': e_hf - e_ks,
+        'DE_GW': e_gw - e_ks,
+        'Znk': z,
+    }
+
+
+def write_evalqp(filename: str, size: ExcitingInputSize) -> str:
+    """
+    Writes a synthetic exciting EVALQP.DAT file with the quasiparticle energies and
+    self-energy components of each k-point.
+    """
+    columns = _quasiparticles(size)
+    table = np.stack(list(columns.values()), axis=-1)
+    header = ' state' + ''.join(f'{label:>11s}' for label in columns)
+    lines = []
+    for nk, kpoint in enumerate(_kpoints(size)):
+        lines.append(
+            f' k-point #{nk + 1:6d}:'
+            + ''.join(f'{v:12.6f}' for v in kpoint)
+            + f'{1.0 / size.n_kpoints:12.6f}'
+        )
+        lines.append(header)
+        for nb in range(size.n_bands):
+            lines.append(f'{nb + 1:6d}' + ''.join(f'{v:11.5f}' for v in table[nk, nb]))
+        lines.append('')
+
+    with open(filename, 'w') as f:
+        f.write('\n'.join(lines))
+    return filename
+
+
+def _band_structure_info(title: str, energies: np.ndarray) -> list[str]:
+    n_occupied = energies.shape[1] // 2
+    vbm = energies[:, :n_occupied].max(axis=1)
+    cbm = energies[:, n_occupied:].min(axis=1)
+    hartree_to_ev = 27.211386245988
+    return [
+        ' ' + '=' * 64,
+        f' {title} band structure',
+        ' ' + '=' * 64,
+        f'  Fermi energy:     {vbm.max():.4f}',
+        f'  Energy range:    {energies.min():.4f}   {energies.max():.4f}',
+        f'  Band index of VBM:{n_occupied:5d}',
+        f'  Band index of CBm:{n_occupied + 1:5d}',
+        '',
+        f'  Indirect BandGap (eV):{(cbm.min() - vbm.max()) * hartree_to_ev:24.4f}',
+        '  Direct Bandgap at k(VBM) (eV):'
+        f'{(cbm - vbm)[vbm.argmax()] * hartree_to_ev:16.4f}',
+        '  Direct Bandgap at k(CBm) (eV):'
+        f'{(cbm - vbm)[cbm.argmin()] * hartree_to_ev:16.4f}',
+        '',
+    ]
+
+
+def write_gw_info(filename: str, size: ExcitingInputSize) -> str:
+    """
+    Writes a synthetic exciting GW_INFO.OUT file with the Kohn-Sham and G0W0 band
+    structure summaries.
+    """
+    columns = _quasiparticles(size)
+    lines = [
+        ' ' + '=' * 64,
+        ' Main GW output file',
+        ' ' + '=' * 64,
+        '',
+        f'  Number of k-points:{size.n_kpoints:6d}',
+        f'  Number of states:{size.n_bands:8d}',
+        '',
+        *_band_structure_info('Kohn-Sham', columns['E_KS']),
+        *_band_structure_info('G0W0', columns['E_GW']),
+    ]
+
+    with open(filename, 'w') as f:
+        f.write('\n'.join(lines))
+    return filename
+
+
+def _spectrum_labels(size: ExcitingInputSize) -> list[str]:
+    return [
+        f'BSE-singlet-TDA-BAR_SCR-full_OC{n % 3 + 1}{n % 3 + 1}_QMT{n // 3 + 1:03d}'
+        for n in range(size.n_spectra)
+    ]
+
+
+def write_spectra(directory: str, size: ExcitingInputSize) -> list[str]:
+    """
+    Writes synthetic exciting BSE EPSILON, LOSS and EXCITON files into `directory`,
+    with the energies in eV.
+    """
+    omega = np.linspace(0.0, 10.0, size.n_frequencies)
+    unit = '# Energy unit:   0.3674932539796232E-01 Hartree'
+    filenames = []
+    for n, label in enumerate(_spectrum_labels(size)):
+        # the excitons only depend on the momentum transfer
+        center = 3.0 + 0.1 * (n // 3)
+        epsilon = 1.0 + 1.0 / (center**2 - (omega + 0.1j) ** 2)
+        loss = (-1.0 / epsilon).imag
+        strengths = np.exp(-np.arange(size.n_frequencies) / 10.0)
+        tables = {
+            'EPSILON': (
+                '#  Omega  Re(eps)  Im(eps)',
+                np.column_stack([omega, epsilon.real, epsilon.imag]),
+            ),
+            'LOSS': ('#  Omega  Loss', np.column_stack([omega, loss])),
+            'EXCITON': (
+                '#  Nr.  E  E-E_gap  |t|^2  Re(t)  Im(t)',
+                np.column_stack(
+                    [
+                        np.arange(1, size.n_frequencies + 1),
+                        center + omega / 10.0,
+                        omega / 10.0,
+                        strengths**2,
+                        strengths,
+                        np.zeros(size.n_frequencies),
+                    ]
+                ),
+            ),
+        }
+        for kind, (header, table) in tables.items():
+            filename = os.path.join(directory, f'{kind}_{label}.OUT')
+            lines = [f'# {kind} of {label}', unit, header]
+            lines.extend(' '.join(f'{v:20.12E}' for v in row) for row in table)
+            with open(filename, 'w') as f:
+                f.write('\n'.join(lines) + '\n')
+            filenames.append(filename)
+    return filenames
+
+
+def write_band(filename: str, size: ExcitingInputSize) -> str:
+    """
+    Writes a synthetic exciting BAND.OUT file with one block per band.
+    """
+    energies = _eigenvalues(size)
+    distances = np.linspace(0, 1.5, size.n_kpoints)
+    return _write_blocks(
+        filename,
+        [
+            np.column_stack([distances, energies[spin, :, nb]])
+            for spin in range(size.n_spin)
+            for nb in range(size.n_bands)
+        ],
+    )
+
+
+def write_band_characters(directory: str, size: ExcitingInputSize) -> list[str]:
+    """
+    Writes synthetic exciting BAND_S*_A*.OUT files of each atom with the band
+    energies, the total band character and the l characters.
+    """
+    energies = _eigenvalues(size)
+    distances = np.linspace(0, 1.5, size.n_kpoints)
+    characters = np.full((size.n_kpoints, 5), 1.0 / size.n_atoms)
+    filenames = []
+    for n_species, atoms in enumerate(_species_atoms(size)):
+        for n_atom in range(len(atoms)):
+            blocks = [
+                np.column_stack([distances, energies[spin, :, nb], characters])
+                for spin in range(size.n_spin)
+                for nb in range(size.n_bands)
+            ]
+            filename = os.path.join(
+                directory, f'BAND_S{n_species + 1:02d}_A{n_atom + 1:04d}.OUT'
+            )
+            filenames.append(_write_blocks(filename, blocks))
+    return filenames
+
+
+def write_bandstructure(filename: str, size: ExcitingInputSize) -> str:
+    """
+    Writes a synthetic exciting bandstructure.xml file.
+    """
+    energies = _eigenvalues(size)
+    distances = np.linspace(0, 1.5, size.n_kpoints)
+    lines = ['<?xml version="1.0"?>', '<bandstructure>', '  <title>Si</title>']
+    for spin in range(size.n_spin):
+        for nb in range(size.n_bands):
+            lines.append('  <band>')
+            lines.extend(
+                f'    <point distance="{d:.8f}" eval="{e:.10f}"/>'
+                for d, e in zip(distances, energies[spin, :, nb])
+            )
+            lines.append('  </band>')
+    labels = ['GAMMA', 'X', 'W', 'L']
+    for n, coord in enumerate(np.linspace(0, 0.5, len(labels))):
+        lines.append(
+            f'  <vertex distance="{0.5 * n:.8f}" upperboundary="1.0" '
+            f'lowerboundary="-1.0" label="{labels[n]}" '
+            f'coord="{coord:.8f} {coord:.8f} 0.00000000"/>'
+        )
+    lines.extend(['</bandstructure>', ''])
+
+    with open(filename, 'w') as f:
+        f.write('\n'.join(lines))
+    return filename
+
+
+def _total_dos(size: ExcitingInputSize) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the energies in Hartree and the total density of states.
+    """
+    energy = np.linspace(-0.6, 0.6, size.n_dos_points)
+    total = np.exp(-((energy - 0.1) ** 2) / 0.01) + np.exp(
+        -((energy + 0.3) ** 2) / 0.02
+    )
+    return energy, total
+
+
+def _write_blocks(filename: str, blocks: list[np.ndarray]) -> str:
+    """
+    Writes the (n_points, n_columns) tables separated by blank lines as in the exciting
+    text plot files.
+    """
+    lines = []
+    for block in blocks:
+        lines.extend(' '.join(f'{v:18.10E}' for v in row) for row in block)
+        lines.append('')
+    with open(filename, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    return filename
+
+
+def write_tdos(filename: str, size: ExcitingInputSize) -> str:
+    """
+    Writes a synthetic exciting TDOS.OUT file with one block per spin channel.
+    """
+    energy, total = _total_dos(size)
+    return _write_blocks(
+        filename,
+        [np.column_stack([energy, total]) for _ in range(size.n_spin)],
+    )
+
+
+def write_pdos(directory: str, size: ExcitingInputSize) -> list[str]:
+    """
+    Writes synthetic exciting PDOS_S*_A*.OUT files of each atom with one block per
+    spin channel and (l, m) channel.
+    """
+    energy, total = _total_dos(size)
+    filenames = []
+    for n_species, atoms in enumerate(_species_atoms(size)):
+        for n_atom in range(len(atoms)):
+            blocks = [
+                np.column_stack([energy, total / (channel + 1) / size.n_atoms])
+                for _ in range(size.n_spin)
+                for channel in range(size.n_dos_channels)
+            ]
+            filename = os.path.join(
+                directory, f'PDOS_S{n_species + 1:02d}_A{n_atom + 1:04d}.OUT'
+            )
+            filenames.append(_write_blocks(filename, blocks))
+    return filenames
+
+
+def write_dos(filename: str, size: ExcitingInputSize) -> str:
+    """
+    Writes a synthetic exciting dos.xml file with the total and partial densities
+    of states.
+    """
+    energy, total = _total_dos(size)
+
+    def diagram(dos: np.ndarray, attributes: str, indent: str) -> list[str]:
+        return [
+            f'{indent}<diagram {attributes}>',
+            *[
+                f'{indent}  <point e="{e:.10f}" dos="{d:.10f}"/>'
+                for e, d in zip(energy, dos)
+            ],
+            f'{indent}</diagram>',
+        ]
+
+    lines = [
+        '<?xml version="1.0"?>',
+        '<dos>',
+        '  <title>Si</title>',
+        '  <axis label="Energy" unit="Hartree"/>',
+        '  <axis label="DOS" unit="states/Hartree/unit cell"/>',
+        '  <totaldos>',
+    ]
+    for spin in range(size.n_spin):
+        lines.extend(diagram(total, f'type="totaldos" nspin="{spin + 1}"', '    '))
+    lines.append('  </totaldos>')
+    species_atoms = _species_atoms(size)
+    for n_species, atoms in enumerate(species_atoms):
+        for atom in atoms:
+            lines.append(
+                f'  <partialdos type="partial" speciessym="{SPECIES[n_species][0]}" '
+                f'speciesrn="{n_species + 1}" atom="{atom + 1}">'
+            )
+            for spin in range(size.n_spin):
+                for channel in range(size.n_dos_channels):
+                    l_number = int(np.sqrt(channel))
+                    lines.extend(
+                        diagram(
+                            total / (channel + 1) / size.n_atoms,
+                            f'type="partial" nspin="{spin + 1}" l="{l_number}" '
+                            f'm="{channel - l_number**2 - l_number}"',
+                            '    ',
+                        )
+                    )
+            lines.append('  </partialdos>')
+    lines.extend(['</dos>', ''])
+
+    with open(filename, 'w') as f:
+        f.write('\n'.join(lines))
+    return filename
+
+
+# shells in the order they are filled
+SHELLS = [(1, 0), (2, 0), (2, 1), (3, 0), (3, 1), (4, 0), (3, 2), (4, 1)]
+
+
+def write_species(directory: str, size: ExcitingInputSize) -> list[str]:
+    """
+    Writes synthetic exciting species files, e.g. Si.xml, of the species of the
+    calculation with the atomic states filled up to the nuclear charge.
+    """
+    filenames = []
+    for symbol, name, charge, mass in SPECIES[: size.n_species]:
+        states, electrons = [], charge
+        for n, l_number in SHELLS:
+            # j = l - 1/2 (kappa = l) and j = l + 1/2 (kappa = l + 1) sub-shells
+            for kappa in ([l_number] if l_number else []) + [l_number + 1]:
+                occupation = min(2 * kappa, electrons)
+                if occupation > 0:
+                    states.append((n, l_number, kappa, occupation))
+                electrons -= occupation
+        n_valence = max(state[0] for state in states)
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<spdb>',
+            f'  <sp chemicalSymbol="{symbol}" name="{name}" z="{-charge:.4f}" '
+            f'mass="{mass:.8f}">',
+            '    <muffinTin rmin="0.100000E-04" radius="2.0000" rinf="25.8" '
+            'radialmeshPoints="300"/>',
+            *[
+                f'    <atomicState n="{n}" l="{l_number}" kappa="{kappa}" '
+                f'occ="{occupation:.5f}" core="{str(n < n_valence).lower()}"/>'
+                for n, l_number, kappa, occupation in states
+            ],
+            '    <basis>',
+            '      <default type="lapw" trialEnergy="0.1500" searchE="false"/>',
+            '      <lo l="0">',
+            '        <wf matchingOrder="0" trialEnergy="0.1500" searchE="false"/>',
+            '        <wf matchingOrder="1" trialEnergy="0.1500" searchE="false"/>',
+            '      </lo>',
+            '    </basis>',
+            '  </sp>',
+            '</spdb>',
+            '',
+        ]
+        filename = os.path.join(directory, f'{symbol}.xml')
+        with open(filename, 'w') as f:
+            f.write('\n'.join(lines))
+        filenames.append(filename)
+    return filenames
+
+
+def write_input(filename: str, size: ExcitingInputSize) -> str:
+    """
+    Writes a synthetic exciting input.xml file.
+    """
+    rng = np.random.default_rng(size.seed)
+    positions = _positions(size, rng)
+    lines = [
+        '<?xml version="1.0"?>',
+        '<input>',
+        '  <title>Si</title>',
+        '  <structure speciespath=".">',
+        '    <crystal scale="1.0">',
+        *[
+            '      <basevect>' + ' '.join(f'{v:.10f}' for v in vec) + '</basevect>'
+            for vec in _lattice_vectors(size)
+        ],
+        '    </crystal>',
+    ]
+    for n_species, atoms in enumerate(_species_atoms(size)):
+        lines.append(f'    <species speciesfile="{SPECIES[n_species][0]}.xml">')
+        lines.extend(
+            '      <atom coord="' + ' '.join(f'{v:.8f}' for v in positions[n]) + '"/>'
+            for n in atoms
+        )
+        lines.append('    </species>')
+    spin = '    <spin/>' if size.n_spin > 1 else ''
+    lines.extend(
+        [
+            '  </structure>',
+            '  <groundstate ngridk="4 4 4" xctype="GGA_PBE" rgkmax="7.0">',
+            *([spin] if spin else []),
+            '    <libxc exchange="XC_GGA_X_PBE" correlation="XC_GGA_C_PBE"/>',
+            '  </groundstate>',
+        ]
+    )
+    if size.n_optimization_steps:
+        lines.append('  <relax method="newton"/>')
+    lines.extend(
+        [
+            '  <properties>',
+            '    <bandstructure>',
+            f'      <plot1d><path steps="{size.n_kpoints}"/></plot1d>',
+            '    </bandstructure>',
+            f'    <dos nsmdos="2" nwdos="{size.n_dos_points}" lmirep="true"/>',
+            '  </properties>',
+            '</input>',
+            '',
+        ]
+    )
+
+    with open(filename, 'w') as f:
+        f.write('\n'.join(lines))
+    return filename
+
+
+WRITERS = {
+    'INFO.OUT': write_info,
+    'input.xml': write_input,
+    'EIGVAL.OUT': write_eigval,
+    'bandstructure.xml': write_bandstructure,
+    'dos.xml': write_dos,
+    'EVALQP.DAT': write_evalqp,
+    'GW_INFO.OUT': write_gw_info,
+    'TDOS.OUT': write_tdos,
+    'BAND.OUT': write_band,
+}
+# writers of groups of files named by their kind, written into the directory
+GROUP_WRITERS = {
+    'spectra': write_spectra,
+    'PDOS': write_pdos,
+    'BAND_S': write_band_characters,
+    'species': write_species,
+}
+# files written by default, the GW outputs, the text plot files and the file groups
+# are only written on request
+DEFAULT_FILES = ['INFO.OUT', 'input.xml', 'EIGVAL.OUT', 'bandstructure.xml', 'dos.xml']
+
+
+def write_calculation(
+    directory: str, size: ExcitingInputSize = None, files: list[str] = None
+) -> str:
+    """
+    Writes a complete synthetic exciting calculation into `directory`.
+
+    Args:
+        directory (str): target directory, created if missing
+        size (ExcitingInputSize, optional): size parameters of the calculation
+        files (list[str], optional): files in `WRITERS` or file groups in
+            `GROUP_WRITERS` to write, by default `DEFAULT_FILES`
+
+    Returns:
+        str: path to the INFO.OUT mainfile
+    """
+    size = size if size is not None else ExcitingInputSize()
+    os.makedirs(directory, exist_ok=True)
+    for name in files if files is not None else DEFAULT_FILES:
+        if name in GROUP_WRITERS:
+            GROUP_WRITERS[name](directory, size)
+        else:
+            WRITERS[name](os.path.join(directory, name), size)
+    return os.path.join(directory, 'INFO.OUT')
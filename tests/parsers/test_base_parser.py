@@ -0,0 +1,92 @@
+import logging
+import os
+from typing import Any
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from nomad.datamodel import EntryArchive
+from nomad.parsing.file_parser.mapping_parser import MappingParser
+
+from nomad_simulation_parsers.parsers import exciting_parser_entry_point
+from nomad_simulation_parsers.parsers.base import BaseParser, ParseContext
+from nomad_simulation_parsers.parsers.utils import read_blocks
+
+
+class BlocksParser(MappingParser):
+    buffer = None
+
+    def load_file(self) -> np.ndarray:
+        return read_blocks(self.filepath)
+
+    def to_dict(self, **kwargs) -> dict[str, Any]:
+        blocks = self.buffer.stack(list(self.data_object))
+        return dict(blocks=blocks)
+
+    def from_dict(self, dct: dict[str, Any]):
+        pass
+
+
+class CodeParser(BaseParser):
+    """Parser of a code with a mainfile and two auxiliary block files."""
+
+    file_stages = {'BANDS.OUT': 'bands', 'DOS.OUT': 'dos'}
+
+    def __init__(self, **kwargs):
+        super().__init__(exciting_parser_entry_point, **kwargs)
+
+    def _parse(self, context: ParseContext, archive: EntryArchive) -> None:
+        for filename in self.file_stages:
+            for filepath in context.auxiliary_files.get(filename, []):
+                parser = BlocksParser(filepath=filepath, buffer=context.buffer)
+                self._convert_auxiliary(context, parser, filename)
+        archive.data = context.data_parser.data_object
+
+
+def test_base_parser(tmp_path):
+    mainfile = os.path.join(tmp_path, 'main.out')
+    with open(mainfile, 'w') as f:
+        f.write('code output\n')
+    os.makedirs(os.path.join(tmp_path, 'bands'))
+    with open(os.path.join(tmp_path, 'bands', 'BANDS.OUT'), 'w') as f:
+        f.write('0 1\n1 2\n\n0 3\n1 4\n')
+    with open(os.path.join(tmp_path, 'DOS.OUT'), 'w') as f:
+        f.write('0 1\n' * 1000)
+
+    parser = CodeParser(max_file_size={'DOS.OUT': 100}, max_memory=0)
+    logger = MagicMock()
+    archive = EntryArchive()
+    parser.parse(mainfile, archive, logger)
+    # the declared files are found in a single lookup, DOS.OUT is over its budget
+    context = parser.context
+    assert context.auxiliary_files == {
+        'BANDS.OUT': [os.path.join(tmp_path, 'bands', 'BANDS.OUT')],
+        'DOS.OUT': [],
+    }
+    assert parser.stages['discovery']['searched'] == ['BANDS.OUT', 'DOS.OUT']
+    assert logger.warning.call_args.kwargs['data']['max_file_size'] == 100
+    # each file is converted in its stage with its arrays in the buffer of the parse
+    assert list(parser.stages) == ['discovery', 'bands']
+    assert parser.stages['bands']['time'] > 0
+    blocks = context.parsers['bands'].to_dict()['blocks']
+    assert isinstance(blocks, np.memmap)
+    assert blocks[:, :, 1].tolist() == [[1, 2], [3, 4]]
+    assert archive.data is not None
+
+    # the options default to those of the entry point
+    parser = CodeParser()
+    parser.parse(mainfile, EntryArchive(), logging.getLogger())
+    assert parser.max_file_size == exciting_parser_entry_point.max_file_size
+    assert CodeParser(parallel_min_size=0).parallel_min_size == 0
+    assert parser.context.auxiliary_files['DOS.OUT']
+    assert parser.context.buffer.spilled_size == 0
+
+    # the parse logs without a logger
+    parser = CodeParser(max_file_size={'DOS.OUT': 100}, max_memory=0)
+    parser.parse(mainfile, EntryArchive(), None)
+    assert parser.context.auxiliary_files['DOS.OUT'] == []
+    assert parser.context.buffer.spilled_size > 0
+
+    # the parsers of the codes implement `_parse`
+    with pytest.raises(TypeError):
+        BaseParser(exciting_parser_entry_point)
@@ -1,9 +1,1137 @@
+import bz2
+import gzip
+import logging
+import lzma
+import os
+import shutil
+import signal
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from generators.exciting import ExcitingInputSize, write_calculation
 from nomad.datamodel import EntryArchive
+from nomad_simulations.schema_packages.atoms_state import AtomsState
+from pydantic import ValidationError
+
+from nomad_simulation_parsers.parsers import exciting_parser_entry_point
+from nomad_simulation_parsers.parsers.base import MAPPERS
+from nomad_simulation_parsers.parsers.exciting.band_edges import get_band_edges
+from nomad_simulation_parsers.parsers.exciting.cost_model import (
+    OPTIMIZATION_STEP_MARKER,
+)
+from nomad_simulation_parsers.parsers.exciting.eigval_reader import EigvalReader
+from nomad_simulation_parsers.parsers.exciting.gw_reader import (
+    EvalqpReader,
+    GWInfoReader,
+)
+from nomad_simulation_parsers.parsers.exciting.info_reader import (
+    InfoReader,
+    scan_modules,
+    str_to_scf_table,
+)
+from nomad_simulation_parsers.parsers.exciting.parser import (
+    BandstructureXMLParser,
+    BandTextParser,
+    DosTextParser,
+    DosXMLParser,
+    EigvalParser,
+    ExcitingParser,
+    warmup,
+)
+from nomad_simulation_parsers.parsers.exciting.plot_reader import find_pdos
+from nomad_simulation_parsers.parsers.exciting.previews import get_previews
+from nomad_simulation_parsers.parsers.exciting.species_reader import (
+    SPECIES_CACHE,
+    SpeciesCache,
+)
+from nomad_simulation_parsers.parsers.exciting.spectra_reader import (
+    find_spectra,
+    read_spectra,
+)
+from nomad_simulation_parsers.parsers.utils import (
+    ArrayBuffer,
+    ReadAhead,
+    TimeBudgetExceeded,
+    clear_transform_cache,
+    read_blocks,
+    read_stacked_blocks,
+    search_many_files,
+    time_budget,
+)
+
+
+def test_parse_file(exciting_calculation):
+    mainfile = exciting_calculation(files=['INFO.OUT'], n_atoms=4, n_species=2)
+    parser = ExcitingParser()
+    archive = EntryArchive()
+    parser.parse(mainfile, archive, logging.getLogger())
+
+    simulation = archive.data
+    assert simulation.program.version == 'NITROGEN-14'
+    assert len(simulation.model_system) == 1
+    cell = simulation.model_system[0].cell[0]
+    assert [atom.chemical_symbol for atom in cell.atoms_state] == [
+        'Si',
+        'Si',
+        'O',
+        'O',
+    ]
+    assert simulation.model_method[0].xc_functionals[0].libxc_name == 'GGA_C_PBE'
+    assert simulation.outputs[0].total_energies[0].value.magnitude < 0
+
+
+def test_parse_optimization(exciting_calculation):
+    mainfile = exciting_calculation(files=['INFO.OUT'], n_optimization_steps=3)
+    archive = EntryArchive()
+    ExcitingParser().parse(mainfile, archive, logging.getLogger())
+
+    # groundstate, optimization steps and the final optimized structure
+    assert len(archive.data.model_system) == 5
+    assert len(archive.data.outputs) == 5
+
+
+def test_optimization_stride(exciting_calculation):
+    mainfile = exciting_calculation(
+        files=['INFO.OUT'], n_atoms=3, n_optimization_steps=25
+    )
+    parser = ExcitingParser(optimization_stride=10)
+    parser.trajectory_page_size = 10
+    archive = EntryArchive()
+    parser.parse(mainfile, archive, logging.getLogger())
+
+    # groundstate, the steps 0, 10, 20 and 24 and the final optimized structure
+    assert len(archive.data.model_system) == 6
+    assert len(archive.data.outputs) == 6
+    trajectory = archive.data.x_exciting_trajectory
+    assert trajectory.n_steps == 25
+    assert trajectory.kept_steps.tolist() == [0, 10, 20, 24]
+    assert [page.first_step for page in trajectory.pages] == [0, 10, 20]
+    assert [page.n_steps for page in trajectory.pages] == [10, 10, 5]
+    last = trajectory.pages[-1]
+    assert last.positions.shape == (5, 3, 3)
+    assert last.forces.shape == (5, 3, 3)
+    # the kept steps are the same as in the trajectory
+    energy = archive.data.outputs[4].total_energies[0].value
+    assert last.total_energies[4].to('hartree').magnitude == pytest.approx(
+        energy.to('hartree').magnitude
+    )
+    cell = archive.data.model_system[4].cell[0]
+    assert cell.positions.to('bohr').magnitude == pytest.approx(
+        last.positions[4].to('bohr').magnitude
+    )
+
+    # all steps are kept by default
+    archive = EntryArchive()
+    ExcitingParser().parse(mainfile, archive, logging.getLogger())
+    assert len(archive.data.model_system) == 27
+    assert archive.data.x_exciting_trajectory is None
+
+
+def test_transform_cache(exciting_calculation):
+    mainfile = exciting_calculation(files=['INFO.OUT'], n_optimization_steps=3)
+    parser = ExcitingParser()
+    parser.parse(mainfile, EntryArchive(), logging.getLogger())
+    # the configurations are mapped to both the model systems and the outputs
+    stats = parser.stages['info']['transform_cache']
+    assert stats['hits'] >= 1
+    assert stats['misses'] > 0
+    assert 0 < stats['hit_rate'] < 1
+    # the cache only lives for the parse
+    assert len(parser.context.parsers['info'].transform_cache) == 0
+
+    info_parser = parser.context.parsers['info']
+    source = dict(forces=np.zeros((2, 3)))
+    forces = info_parser.get_forces(source)
+    assert info_parser.get_forces(source) is forces
+    assert info_parser.get_forces(dict(source)) is not forces
+    assert clear_transform_cache(info_parser) == dict(
+        hits=1, misses=2, hit_rate=pytest.approx(1 / 3)
+    )
+    assert info_parser.get_forces(source) is not forces
+    # transforms without a result are also cached
+    clear_transform_cache(info_parser)
+    assert info_parser.get_trajectory(info_parser.data) is None
+    assert info_parser.get_trajectory(info_parser.data) is None
+    assert clear_transform_cache(info_parser)['hits'] >= 1
+
+
+# entries parsed concurrently, covering each stage of the parser
+CONCURRENT_ENTRIES = {
+    'default': (ExcitingInputSize(), None),
+    'optimization': (
+        ExcitingInputSize(n_optimization_steps=3),
+        ['INFO.OUT', 'input.xml'],
+    ),
+    'text': (
+        ExcitingInputSize(n_atoms=3),
+        ['INFO.OUT', 'BAND.OUT', 'BAND_S', 'TDOS.OUT', 'PDOS'],
+    ),
+    'gw': (
+        ExcitingInputSize(n_kpoints=5, n_bands=8),
+        ['INFO.OUT', 'EIGVAL.OUT', 'EVALQP.DAT', 'GW_INFO.OUT'],
+    ),
+    'spectra': (ExcitingInputSize(n_spectra=2), ['INFO.OUT', 'spectra']),
+}
+
+
+def test_concurrent_parses(tmp_path):
+    mainfiles = [
+        write_calculation(str(tmp_path / name), size, files=files)
+        for name, (size, files) in CONCURRENT_ENTRIES.items()
+    ]
+    parser = ExcitingParser()
+
+    def parse(mainfile: str) -> tuple[dict, list[str]]:
+        archive = EntryArchive()
+        parser.parse(mainfile, archive, logging.getLogger())
+        assert parser.context.mainfile == mainfile
+        return archive.data.m_to_dict(), list(parser.stages)
+
+    expected = [parse(mainfile) for mainfile in mainfiles]
+    # one parser shared by all threads, each parsing every entry several times
+    n_threads, n_repeats = 6, 2
+    barrier = threading.Barrier(n_threads)
+
+    def parse_all(n: int) -> list[tuple[dict, list[str]]]:
+        barrier.wait()
+        order = mainfiles[n % len(mainfiles) :] + mainfiles[: n % len(mainfiles)]
+        results = {}
+        for _ in range(n_repeats):
+            for mainfile in order:
+                results[mainfile] = parse(mainfile)
+        return [results[mainfile] for mainfile in mainfiles]
+
+    with ThreadPoolExecutor(n_threads) as executor:
+        for results in executor.map(parse_all, range(n_threads)):
+            assert results == expected
+
+
+def test_warmup(exciting_calculation):
+    mainfile = exciting_calculation(files=['INFO.OUT', 'EIGVAL.OUT'])
+    archive = EntryArchive()
+    ExcitingParser().parse(mainfile, archive, logging.getLogger())
+
+    MAPPERS.clear()
+    warmup(freeze=False)
+    assert ('info', 1) in [key[1:] for key in MAPPERS]
+    assert ('dos_out', 2) in [key[1:] for key in MAPPERS]
+    mappers = dict(MAPPERS)
+    # the parse reuses the mappers built by the warmup
+    warm_archive = EntryArchive()
+    ExcitingParser().parse(mainfile, warm_archive, logging.getLogger())
+    assert MAPPERS == mappers
+    assert warm_archive.data.m_to_dict() == archive.data.m_to_dict()
+
+
+def test_estimate_cost(exciting_calculation):
+    mainfile = exciting_calculation(
+        n_atoms=4, n_species=2, n_kpoints=5, n_bands=8, n_spin=2, n_optimization_steps=3
+    )
+    parser = ExcitingParser()
+    cost = parser.estimate_cost(mainfile)
+    features = cost['features']
+    assert features['info_bytes'] == os.path.getsize(mainfile)
+    assert features['n_atom_steps'] == 4 * 5
+    assert features['n_eigenvalues'] == 5 * 16
+    directory = os.path.dirname(mainfile)
+    assert features['dos_bytes'] == os.path.getsize(os.path.join(directory, 'dos.xml'))
+    assert features['n_auxiliary'] == 3
+    assert cost['time'] > 0
+    assert cost['memory'] > 0
+    # nothing is parsed
+    assert parser.stages == {}
+    # the modules and the optimization steps are found in a single scan, also if
+    # the markers are split across its chunks
+    assert scan_modules(mainfile, OPTIMIZATION_STEP_MARKER, chunk_size=64) == (
+        {'groundstate', 'structure_optimization'},
+        3,
+    )
+    # larger entries cost more
+    larger = parser.estimate_cost(
+        exciting_calculation(n_atoms=4, n_species=2, n_kpoints=50, n_bands=80)
+    )
+    assert larger['time'] > cost['time']
+    assert larger['memory'] > cost['memory']
+
+
+def test_species(exciting_calculation):
+    mainfile = exciting_calculation(
+        files=['INFO.OUT'], n_atoms=6, n_species=2, n_optimization_steps=2
+    )
+    archive = EntryArchive()
+    ExcitingParser().parse(mainfile, archive, logging.getLogger())
+
+    # the species are stored once in the simulation and referenced by each cell
+    species = archive.data.x_exciting_species
+    assert [s.chemical_symbol for s in species] == ['Si', 'O']
+    cells = [system.cell[0] for system in archive.data.model_system]
+    assert len(cells) == 4
+    for cell in cells:
+        assert cell.x_exciting_species_indices.tolist() == [0, 0, 0, 1, 1, 1]
+        assert [s.m_resolved() for s in cell.x_exciting_species] == list(species)
+    # the per-atom states are only stored in the first cell
+    assert [s.chemical_symbol for s in cells[0].atoms_state] == ['Si'] * 3 + ['O'] * 3
+    for cell in cells[1:]:
+        assert not cell.atoms_state
+    n_sections = sum(
+        isinstance(section, AtomsState) for section in archive.data.m_all_contents()
+    )
+    assert n_sections == len(species) + 6
+
+
+def test_species_files(exciting_calculation):
+    mainfile = exciting_calculation(
+        files=['INFO.OUT', 'species'], n_atoms=4, n_species=2
+    )
+    directory = os.path.dirname(mainfile)
+    cache = SpeciesCache(max_size=1)
+    silicon = cache.get(os.path.join(directory, 'Si.xml'))
+    assert silicon['atomic_number'] == 14
+    assert sum(s['occupation'] for s in silicon['atomic_states']) == 14
+    assert [s['core'] for s in silicon['atomic_states']].count(False) == 2
+    assert cache.get(os.path.join(directory, 'Si.xml')) is silicon
+    assert (cache.hits, cache.misses) == (1, 1)
+    # the least recently used definition is evicted
+    cache.get(os.path.join(directory, 'O.xml'))
+    assert len(cache) == 1
+    assert cache.get(os.path.join(directory, 'Si.xml')) is not silicon
+    # modified files are parsed again
+    with open(os.path.join(directory, 'Si.xml')) as f:
+        content = f.read()
+    with open(os.path.join(directory, 'Si.xml'), 'w') as f:
+        f.write(content.replace('radius="2.0000"', 'radius="2.2000"'))
+    assert cache.get(os.path.join(directory, 'Si.xml'))['muffin_tin_radius'] == 2.2
+    assert cache.get(os.path.join(directory, 'missing.xml')) is None
+    # identical files in the directories of different calculations are parsed once
+    cache = SpeciesCache()
+    os.makedirs(os.path.join(directory, 'other'))
+    shutil.copy(os.path.join(directory, 'Si.xml'), os.path.join(directory, 'other'))
+    silicon = cache.get(os.path.join(directory, 'Si.xml'))
+    assert cache.get(os.path.join(directory, 'other', 'Si.xml')) is silicon
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    SPECIES_CACHE.clear()
+    for _ in range(2):
+        archive = EntryArchive()
+        ExcitingParser().parse(mainfile, archive, logging.getLogger())
+    # the species files are parsed once per process
+    assert (SPECIES_CACHE.hits, SPECIES_CACHE.misses) == (2, 2)
+    cell = archive.data.model_system[0].cell[0]
+    oxygen = cell.x_exciting_species[1]
+    assert oxygen.x_exciting_species_file == 'O.xml'
+    assert oxygen.atomic_number == 8
+    assert oxygen.x_exciting_basis_type == 'lapw'
+    assert oxygen.x_exciting_muffin_tin_radius.to('bohr').magnitude == 2.0
+    assert [
+        (s.n_quantum_number, s.l_quantum_number, s.x_exciting_core)
+        for s in oxygen.orbitals_state
+    ] == [(1, 0, True), (2, 0, False), (2, 1, False), (2, 1, False)]
+    assert oxygen.orbitals_state[3].j_quantum_number.tolist() == [1.5]
+    # the atoms states only keep the symbol
+    assert not cell.atoms_state[0].orbitals_state
+
+    archive = EntryArchive()
+    ExcitingParser(summary=True).parse(mainfile, archive, logging.getLogger())
+    assert SPECIES_CACHE.hits == 2
+
+
+def test_info_reader_units(exciting_calculation):
+    mainfile = exciting_calculation(files=['INFO.OUT'], n_atoms=4, n_scf=3)
+    readers = []
+    for units in [True, False]:
+        reader = InfoReader(units=units)
+        reader.mainfile = mainfile
+        readers.append(reader)
+
+    scf = [r.get('groundstate').get('final') for r in readers]
+    assert scf[0].get('energy_total').units == 'hartree'
+    assert isinstance(scf[1].get('energy_total'), float)
+    assert scf[0].get('energy_total').magnitude == scf[1].get('energy_total')
+    energies = scf[1].get('energy_contributions')
+    assert all(isinstance(v, float) for v in energies.values())
+    charges = scf[1].get('charge_contributions')
+    assert not hasattr(charges['atom_resolved'][0][1], 'units')
+    assert readers[1].quantity_units['energy_total'] == 'hartree'
+    assert readers[1].quantity_units['energy_contributions'] == 'hartree'
+
+    # units are applied by the mappers
+    archive = EntryArchive()
+    ExcitingParser().parse(mainfile, archive, logging.getLogger())
+    energy = archive.data.outputs[0].total_energies[0].value
+    assert energy.to('hartree').magnitude == pytest.approx(scf[1].get('energy_total'))
+
+
+def test_scf_iterations(exciting_calculation):
+    mainfile = exciting_calculation(files=['INFO.OUT'], n_atoms=3, n_scf=4)
+    reader = InfoReader()
+    reader.mainfile = mainfile
+
+    table = reader.get('groundstate').get('scf_iterations')
+    assert table['energy_total'].shape == (4,)
+    assert np.all(np.diff(table['x_exciting_energy_convergence'][:, 0]) < 0)
+    assert table['x_exciting_energy_convergence'].shape == (4, 2)
+    assert reader.get_scf_threshold('x_exciting_energy_convergence') == 1e-6
+    assert list(table['energy_contributions'])[:2] == ['Fermi energy', 'Kinetic energy']
+    assert table['charge_contributions']['atom_resolved'].shape == (4, 3)
+    assert not np.ma.is_masked(table['time_physical'])
 
-from nomad_simulation_parsers.parsers.exciting.parser import ExcitingParser
+    # values missing in an iteration are masked
+    table = str_to_scf_table(
+        ' Iteration number :  1\n Total energy : -1.5\n'
+        ' Estimated fundamental gap : 0.1\n\n+----------\n'
+        ' Iteration number :  2\n Total energy : -1.6\n\n+----------\n'
+    )
+    assert table['energy_total'].tolist() == [-1.5, -1.6]
+    assert table['x_exciting_gap'].mask.tolist() == [False, True]
 
+    # values of a different shape are padded and masked, ragged values left out
+    table = str_to_scf_table(
+        ' Iteration number :  1\n Total energy : -1.5\n'
+        ' Charges :\n   atom 1 Si : 12.9\n   atom 2 Si : 12.8\n'
+        ' Moments :\n   atom 1 Si : 0.1 0.2\n   atom 2 Si : 0.3\n\n+----------\n'
+        ' Iteration number :  2\n Total energy : -1.6\n'
+        ' Charges :\n   atom 1 Si : 12.7\n\n+----------\n'
+    )
+    charges = table['charge_contributions']['atom_resolved']
+    assert charges.shape == (2, 2)
+    assert charges.mask.tolist() == [[False, False], [False, True]]
+    assert charges[1, 0] == 12.7
+    assert 'moment_contributions' not in table
 
-def test_parse_file():
+
+def test_parallel(exciting_calculation):
+    mainfile = exciting_calculation(
+        files=['INFO.OUT'], n_atoms=4, n_scf=6, n_optimization_steps=3
+    )
+    reader = InfoReader(workers=1)
+    reader.mainfile = mainfile
+    parallel_reader = InfoReader(workers=2, parallel_min_size=0)
+    parallel_reader.mainfile = mainfile
+
+    table = reader.get('groundstate').get('scf_iterations')
+    parallel_table = parallel_reader.get('groundstate').get('scf_iterations')
+    assert parallel_table['energy_total'].tolist() == table['energy_total'].tolist()
+    steps = reader.get('structure_optimization').get('optimization_step')
+    parallel_steps = parallel_reader.get('structure_optimization').get(
+        'optimization_step'
+    )
+    assert len(parallel_steps) == len(steps) == 3
+    for step, parallel_step in zip(steps, parallel_steps):
+        assert parallel_step.get('energy_total') == step.get('energy_total')
+
+    archives = []
+    for workers in [1, 2]:
+        archive = EntryArchive()
+        parser = ExcitingParser(workers=workers, parallel_min_size=0)
+        parser.parse(mainfile, archive, logging.getLogger())
+        archives.append(archive.data.m_to_dict())
+    assert archives[0] == archives[1]
+
+
+def test_eigenvalues(exciting_calculation):
+    mainfile = exciting_calculation(files=['EIGVAL.OUT'], n_kpoints=5, n_bands=8)
+    parser = EigvalParser(
+        filepath=mainfile.replace('INFO.OUT', 'EIGVAL.OUT'), text_parser=EigvalReader()
+    )
+    eigenvalues = parser.get_eigenvalues(parser.data)
+    assert len(eigenvalues) == 1
+    assert eigenvalues[0]['eigenvalues'].shape == (5, 8)
+    assert np.all(eigenvalues[0]['occupancies'][:, :4] == 2.0)
+    # the band edges of the occupied states
+    energies = eigenvalues[0]['eigenvalues']
+    assert eigenvalues[0]['highest_occupied'] == energies[:, :4].max()
+    assert eigenvalues[0]['lowest_unoccupied'] == energies[:, 4:].min()
+    gaps = parser.get_band_gaps(parser.data)
+    assert [gap['type'] for gap in gaps] == ['indirect', 'direct']
+    assert gaps[0]['value'] == pytest.approx(
+        energies[:, 4:].min() - energies[:, :4].max()
+    )
+    assert gaps[0]['momentum_transfer'].tolist() == [[0, 0, 0], [0.5, 0.5, 0]]
+
+
+def test_band_edges():
+    energies = np.array(
+        [
+            # indirect gap of 0.3 between k-points 0 and 2, direct gap 0.5 at 1
+            [[-1.0, -0.1, 0.5], [-1.0, -0.3, 0.2], [-1.0, -0.5, 0.2]],
+            # metal
+            [[-1.0, 0.3, 0.5], [-1.0, -0.3, 0.2], [-1.0, -0.5, 0.2]],
+        ]
+    )
+    occupied = np.zeros(energies.shape, dtype=bool)
+    occupied[..., :2] = True
+    kpoints = np.array([[0, 0, 0], [0.25, 0, 0], [0.5, 0, 0]])
+    semiconductor, metal = get_band_edges(energies, occupied, kpoints)
+
+    assert semiconductor['highest_occupied'] == -0.1
+    assert semiconductor['lowest_unoccupied'] == 0.2
+    indirect, direct = semiconductor['band_gaps']
+    assert indirect['type'] == 'indirect'
+    assert indirect['value'] == pytest.approx(0.3)
+    assert indirect['spin_channel'] == 0
+    assert indirect['momentum_transfer'].tolist() == [[0, 0, 0], [0.25, 0, 0]]
+    assert direct == dict(type='direct', value=pytest.approx(0.5), spin_channel=0)
+    assert metal['band_gaps'] == [dict(value=0.0, spin_channel=1)]
+    # no gap without unoccupied states
+    (edges,) = get_band_edges(energies[:1], np.ones((1, 3, 3), dtype=bool))
+    assert edges['lowest_unoccupied'] is None
+    assert edges['band_gaps'] == []
+
+
+def test_bandstructure(exciting_calculation):
+    mainfile = exciting_calculation(files=['bandstructure.xml'], n_kpoints=7, n_bands=6)
+    parser = BandstructureXMLParser(
+        filepath=mainfile.replace('INFO.OUT', 'bandstructure.xml')
+    )
+    bandstructures = parser.get_bandstructures(parser.data)
+    assert bandstructures[0]['energies'].shape == (7, 6)
+    assert bandstructures[0]['n_kpoints'] == 7
+    # the band energies are relative to the Fermi energy
+    energies = bandstructures[0]['energies'].magnitude
+    assert bandstructures[0]['highest_occupied'] == energies[energies <= 0].max()
+    assert bandstructures[0]['lowest_unoccupied'] == energies[energies > 0].min()
+    assert parser.get_band_gaps(parser.data)[0]['type'] == 'indirect'
+
+
+def test_band_gaps(exciting_calculation):
+    mainfile = exciting_calculation(n_spin=2)
+    archive = EntryArchive()
+    ExcitingParser().parse(mainfile, archive, logging.getLogger())
+
+    outputs = archive.data.outputs[-1]
+    eigenvalues = outputs.electronic_eigenvalues
+    assert [e.spin_channel for e in eigenvalues] == [0, 1]
+    assert eigenvalues[1].highest_occupied > eigenvalues[0].highest_occupied
+    # the band gaps of each spin channel are only taken from EIGVAL.OUT
+    gaps = outputs.electronic_band_gaps
+    assert [(gap.type, gap.spin_channel) for gap in gaps] == [
+        ('indirect', 0),
+        ('direct', 0),
+        ('indirect', 1),
+        ('direct', 1),
+    ]
+    assert gaps[0].value.magnitude == pytest.approx(
+        (eigenvalues[0].lowest_unoccupied - eigenvalues[0].highest_occupied).magnitude
+    )
+    assert gaps[0].momentum_transfer is not None
+    assert outputs.electronic_band_structures[0].lowest_unoccupied is not None
+
+
+def test_fermi_energy(exciting_calculation):
+    mainfile = exciting_calculation(
+        files=['INFO.OUT', 'EIGVAL.OUT', 'bandstructure.xml'], n_bands=8
+    )
     parser = ExcitingParser()
     archive = EntryArchive()
-    parser.parse('test/data/exciting/INFO.OUT', archive)
+    parser.parse(mainfile, archive, logging.getLogger())
+    scf_iterations = parser.context.parsers['info'].data['groundstate'][
+        'scf_iterations'
+    ]
+    fermi_energy = scf_iterations['energy_contributions']['Fermi energy'][-1]
+    outputs = archive.data.outputs[-1]
+    eigenvalues = outputs.electronic_eigenvalues[0]
+    band_structure = outputs.electronic_band_structures[0]
+    edges = [
+        [
+            getattr(e, edge).to('hartree').magnitude
+            for e in (eigenvalues, band_structure)
+        ]
+        for edge in ['highest_occupied', 'lowest_unoccupied']
+    ]
+    # the band energies relative to the Fermi energy are split at zero, the Fermi
+    # energy itself is larger than the gap
+    assert edges[0][1] < 0 < edges[1][1]
+    assert fermi_energy > edges[1][1] - edges[0][1]
+    # the band edges agree with those of the absolute eigenvalues
+    assert edges[0][1] == pytest.approx(edges[0][0] - fermi_energy, abs=1e-2)
+    assert edges[1][1] == pytest.approx(edges[1][0] - fermi_energy, abs=1e-2)
+
+    # a state at the Fermi energy is occupied also after rounding to single precision
+    filepath = os.path.join(os.path.dirname(mainfile), 'bandstructure.xml')
+    (edges,) = BandstructureXMLParser(filepath=filepath).get_bandstructures(
+        BandstructureXMLParser(filepath=filepath).data
+    )
+    parser = BandstructureXMLParser(
+        filepath=filepath,
+        precision={'band_energies': 'float32'},
+        fermi_energy=edges['lowest_unoccupied'],
+    )
+    (edges_float32,) = parser.get_bandstructures(parser.data)
+    assert edges_float32['highest_occupied'] == pytest.approx(
+        edges['lowest_unoccupied'], abs=1e-6
+    )
+
+
+def test_previews(exciting_calculation):
+    values = np.zeros(1000)
+    values[501] = 1.0
+    previews = get_previews(values, np.arange(1000.0), resolutions=(10, 100, 1000))
+    # no preview at the full resolution
+    assert [preview['n_bins'] for preview in previews] == [10, 100]
+    preview = previews[0]
+    assert preview['first_points'].tolist() == list(range(0, 1000, 100))
+    # the peak is kept in its bin
+    assert preview['maximum'].tolist() == [0.0] * 5 + [1.0] + [0.0] * 4
+    assert not preview['minimum'].any()
+    assert preview['points'][0] == pytest.approx(49.5)
+
+    mainfile = exciting_calculation(n_kpoints=100, n_dos_points=300)
+    archive = EntryArchive()
+    ExcitingParser().parse(mainfile, archive, logging.getLogger())
+    outputs = archive.data.outputs[-1]
+    dos = outputs.electronic_dos[0]
+    assert [preview.n_bins for preview in dos.x_exciting_previews] == [64, 256]
+    preview = dos.x_exciting_previews[0]
+    assert preview.n_points == 300
+    assert preview.maximum.max() == dos.value.max()
+    assert preview.energies.shape == (64,)
+    (preview,) = outputs.electronic_band_structures[0].x_exciting_previews
+    band_energies = outputs.electronic_band_structures[0].value.magnitude
+    assert preview.minimum.shape == (64, 20)
+    assert preview.minimum[0].magnitude == pytest.approx(band_energies[:2].min(axis=0))
+
+
+def test_text_plot_files(exciting_calculation):
+    mainfile = exciting_calculation(
+        files=[
+            'INFO.OUT',
+            'bandstructure.xml',
+            'dos.xml',
+            'BAND.OUT',
+            'BAND_S',
+            'TDOS.OUT',
+            'PDOS',
+        ],
+        n_atoms=3,
+        n_species=2,
+        n_spin=2,
+        n_kpoints=7,
+        n_bands=6,
+    )
+    directory = os.path.dirname(mainfile)
+    assert [os.path.basename(f) for f in find_pdos(directory)] == [
+        'PDOS_S01_A0001.OUT',
+        'PDOS_S01_A0002.OUT',
+        'PDOS_S02_A0001.OUT',
+    ]
+    blocks = read_blocks(os.path.join(directory, 'BAND.OUT'))
+    assert blocks.shape == (12, 7, 2)
+    pdos, indices = read_stacked_blocks(find_pdos(directory))
+    assert pdos.shape == (3, 8, 100)
+    assert indices == [0, 1, 2]
+
+    def parse():
+        parser = ExcitingParser()
+        archive = EntryArchive()
+        parser.parse(mainfile, archive, logging.getLogger())
+        return parser, archive.data.outputs[-1]
+
+    # the text plot files are only read without the XML files
+    parser, xml_output = parse()
+    assert 'band_out' not in parser.stages
+    assert 'dos_out' not in parser.stages
+    for filename in ['bandstructure.xml', 'dos.xml']:
+        os.remove(os.path.join(directory, filename))
+    parser, output = parse()
+    assert list(parser.stages) == ['discovery', 'info', 'band_out', 'dos_out']
+    band_structure = output.electronic_band_structures[0]
+    assert band_structure.n_bands == 12
+    assert band_structure.value.magnitude == pytest.approx(
+        xml_output.electronic_band_structures[0].value.magnitude
+    )
+    assert len(output.electronic_dos) == 2
+    dos = output.electronic_dos[1]
+    assert dos.spin_channel == 1
+    # dos.xml is written with ten decimals
+    assert dos.value.to('1/hartree').magnitude == pytest.approx(
+        xml_output.electronic_dos[1].value.to('1/hartree').magnitude, abs=1e-9
+    )
+    assert dos.variables[0].points.to('hartree').magnitude[0] == pytest.approx(-0.6)
+    # the projected dos of each atom is summed over its (l, m) channels
+    assert [p.label for p in dos.projected_dos] == [
+        'S01_A0001',
+        'S01_A0002',
+        'S02_A0001',
+    ]
+    assert dos.projected_dos[2].value.to('1/hartree').magnitude == pytest.approx(
+        pdos[2, 4:].sum(0)
+    )
+    assert parser.context.parsers['dos_out'].data['pdos'].shape == (3, 2, 4, 100)
+
+    # the text plot files are parsed directly into the storage dtype
+    precision = dict(band_energies='float32', dos='float32', dos_energies='float32')
+    band_parser = BandTextParser(
+        filepath=os.path.join(directory, 'BAND.OUT'), precision=precision
+    )
+    assert band_parser.data_object.dtype == np.float32
+    assert band_parser.to_dict()['bandstructure'][0]['energies'].dtype == np.float32
+    dos_parser = DosTextParser(
+        filepath=os.path.join(directory, 'TDOS.OUT'),
+        pdos_files=find_pdos(directory),
+        precision=precision,
+    )
+    assert dos_parser.data_object.dtype == np.float32
+    dos_data = dos_parser.to_dict()
+    assert dos_data['pdos'].dtype == dos_data['dos'][0]['value'].dtype == np.float32
+
+    # the band energies are also read from the band character files
+    os.remove(os.path.join(directory, 'BAND.OUT'))
+    parser, band_output = parse()
+    assert band_output.electronic_band_structures[0].value.magnitude == pytest.approx(
+        band_structure.value.magnitude
+    )
+
+
+def test_precision(exciting_calculation):
+    mainfile = exciting_calculation(n_kpoints=20, n_bands=16, n_dos_points=200)
+    directory = os.path.dirname(mainfile)
+    precisions = [
+        {},
+        {
+            name: 'float32'
+            for name in [
+                'eigenvalues',
+                'occupancies',
+                'band_energies',
+                'dos',
+                'dos_energies',
+            ]
+        },
+    ]
+
+    def band_gap(eigenvalues, occupancies):
+        occupied = occupancies > 1e-3
+        return eigenvalues[~occupied].min() - eigenvalues[occupied].max()
+
+    gaps, band_energies, dos = [], [], []
+    for precision in precisions:
+        parser = EigvalParser(
+            filepath=os.path.join(directory, 'EIGVAL.OUT'),
+            text_parser=EigvalReader(precision=precision),
+        )
+        eigenvalues = parser.get_eigenvalues(parser.data)[0]
+        gaps.append(band_gap(eigenvalues['eigenvalues'], eigenvalues['occupancies']))
+        parser = BandstructureXMLParser(
+            filepath=os.path.join(directory, 'bandstructure.xml'), precision=precision
+        )
+        energies = parser.get_bandstructures(parser.data)[0]['energies'].magnitude
+        band_energies.append(energies)
+        parser = DosXMLParser(
+            filepath=os.path.join(directory, 'dos.xml'), precision=precision
+        )
+        dos.append(parser.get_dos(parser.data['dos']['totaldos']['diagram']))
+
+    # the arrays are parsed directly into the storage dtype
+    assert eigenvalues['eigenvalues'].dtype == np.float32
+    assert eigenvalues['occupancies'].dtype == np.float32
+    assert band_energies[1].dtype == np.float32
+    assert dos[1]['dos'].dtype == dos[1]['energy'].dtype == np.float32
+    assert band_energies[0].dtype == dos[0]['dos'].dtype == np.float64
+    # single precision bounds the error of the band gap and the integrated dos
+    assert gaps[0] > 0
+    assert abs(gaps[1] - gaps[0]) < 1e-6
+    assert np.allclose(band_energies[1], band_energies[0], rtol=1e-6, atol=1e-7)
+    integrated = [np.sum(d['dos'] * np.gradient(d['energy'])) for d in dos]
+    assert integrated[1] == pytest.approx(integrated[0], rel=1e-6)
+    # half precision is rejected by the entry point
+    options = exciting_parser_entry_point.model_dump()
+    with pytest.raises(ValidationError):
+        type(exciting_parser_entry_point).model_validate(
+            {**options, 'precision': {'eigenvalues': 'float16'}}
+        )
+
+    archives = []
+    for precision in precisions:
+        archive = EntryArchive()
+        ExcitingParser(precision=precision).parse(
+            mainfile, archive, logging.getLogger()
+        )
+        archives.append(archive)
+    values = [
+        a.data.outputs[-1].electronic_eigenvalues[0].value.magnitude for a in archives
+    ]
+    assert np.allclose(values[1], values[0], rtol=1e-6)
+
+
+def test_gw(exciting_calculation):
+    mainfile = exciting_calculation(
+        files=['INFO.OUT', 'EIGVAL.OUT', 'EVALQP.DAT', 'GW_INFO.OUT'],
+        n_kpoints=5,
+        n_bands=8,
+    )
+    reader = EvalqpReader()
+    reader.mainfile = mainfile.replace('INFO.OUT', 'EVALQP.DAT')
+    quasiparticles = reader.get('quasiparticles')
+    assert quasiparticles['k_points'].shape == (5, 3)
+    assert quasiparticles['k_weights'] == pytest.approx(np.full(5, 0.2), abs=1e-6)
+    assert quasiparticles['states'].tolist() == list(range(1, 9))
+    columns = quasiparticles['columns']
+    assert list(columns)[:3] == ['E_KS', 'E_HF', 'E_GW']
+    assert columns['E_GW'].shape == (5, 8)
+    assert np.allclose(columns['DE_GW'], columns['E_GW'] - columns['E_KS'], atol=1e-4)
+
+    reader = GWInfoReader()
+    reader.mainfile = mainfile.replace('INFO.OUT', 'GW_INFO.OUT')
+    assert reader.get('gw').get('band_index_vbm') == 4
+    assert reader.get('gw').get('band_gap_indirect') > reader.get('kohn_sham').get(
+        'band_gap_indirect'
+    )
+
+    archive = EntryArchive()
+    parser = ExcitingParser()
+    parser.parse(mainfile, archive, logging.getLogger())
+    assert list(parser.stages) == ['discovery', 'info', 'eigval', 'evalqp', 'gw_info']
+    # the ground state keeps the Kohn-Sham eigenvalues and GW gets its own output
+    groundstate, gw = archive.data.outputs
+    assert not groundstate.electronic_eigenvalues[0].label
+    eigenvalues = gw.electronic_eigenvalues[0]
+    assert eigenvalues.label == 'GW'
+    assert eigenvalues.value.to('hartree').magnitude == pytest.approx(columns['E_GW'])
+    assert eigenvalues.x_exciting_quasiparticle_weights.shape == (5, 8)
+    contributions = {c.label: c for c in eigenvalues.value_contributions}
+    assert list(contributions) == ['E_KS', 'Sx', 'Re(Sc)', 'Im(Sc)', 'Vxc']
+    assert contributions['Sx'].value.to('hartree').magnitude == pytest.approx(
+        columns['Sx']
+    )
+    gaps = {gap.type: gap for gap in gw.electronic_band_gaps}
+    assert gaps['indirect'].label == 'GW'
+    assert gaps['indirect'].value.to('eV').magnitude == pytest.approx(
+        reader.get('gw').get('band_gap_indirect')
+    )
+    assert gw.fermi_levels[0].value.to('hartree').magnitude == pytest.approx(
+        reader.get('gw').get('fermi_energy')
+    )
+
+
+def test_spectra(exciting_calculation):
+    mainfile = exciting_calculation(
+        files=['INFO.OUT', 'spectra'], n_spectra=6, n_frequencies=50
+    )
+    directory = os.path.dirname(mainfile)
+    # a compressed copy is only used without the uncompressed file
+    loss = os.path.join(directory, 'LOSS_BSE-singlet-TDA-BAR_SCR-full_OC11_QMT001.OUT')
+    with open(loss, 'rb') as f:
+        data = f.read()
+    for filename in [f'{loss}.gz', os.path.join(directory, 'LOSS_ADDED_OC11.OUT.gz')]:
+        with gzip.open(filename, 'wb') as f:
+            f.write(data)
+    files = find_spectra(directory)
+    assert len(files) == 19
+    assert files[0].endswith('EPSILON_BSE-singlet-TDA-BAR_SCR-full_OC11_QMT001.OUT')
+    assert files[12].endswith('LOSS_ADDED_OC11.OUT.gz')
+    assert files[13] == loss
+
+    groups = {
+        group['kind']: group
+        for group in read_spectra(files)
+        if group['kind'] != 'EXCITON'
+    }
+    epsilon = groups['EPSILON']
+    assert epsilon['values'].shape == (6, 50)
+    assert epsilon['labels'][1] == 'BSE-singlet-TDA-BAR_SCR-full_OC11_QMT002'
+    # energies are given in eV
+    assert epsilon['frequencies'][-1] == pytest.approx(10.0 / 27.211386, rel=1e-6)
+    assert np.all(epsilon['values'].imag[:, 1:] > 0)
+    assert groups['LOSS']['n_files'] == 7
+    assert np.all(groups['LOSS']['values'].imag == 0)
+
+    archive = EntryArchive()
+    parser = ExcitingParser()
+    parser.parse(mainfile, archive, logging.getLogger())
+    assert list(parser.stages) == ['discovery', 'info', 'spectra']
+    output = archive.data.outputs[-1]
+    assert output.total_energies
+    spectra = output.x_exciting_spectra
+    # the excitons of each momentum transfer share their energies
+    assert [(s.kind, s.n_files) for s in spectra] == [
+        ('EPSILON', 6),
+        ('EXCITON', 3),
+        ('EXCITON', 3),
+        ('LOSS', 7),
+    ]
+    assert spectra[0].value == pytest.approx(epsilon['values'])
+    assert spectra[0].frequencies.to('eV').magnitude[-1] == pytest.approx(10.0)
+
+    logger = MagicMock()
+    parser = ExcitingParser(max_file_size=dict(spectra=1000))
+    parser.parse(mainfile, EntryArchive(), logger)
+    assert 'spectra' not in parser.stages
+    assert logger.warning.call_args.kwargs['data']['max_file_size'] == 1000
+
+    parser = ExcitingParser(summary=True)
+    parser.parse(mainfile, EntryArchive(), logging.getLogger())
+    assert 'spectra' not in parser.stages
+
+
+def test_stages(exciting_calculation):
+    mainfile = exciting_calculation()
+    parser = ExcitingParser()
+    tracemalloc.start()
+    try:
+        parser.parse(mainfile, EntryArchive(), logging.getLogger())
+    finally:
+        tracemalloc.stop()
+    assert list(parser.stages) == [
+        'discovery',
+        'info',
+        'input_xml',
+        'eigval',
+        'bandstructure_xml',
+        'dos_xml',
+    ]
+    for metrics in parser.stages.values():
+        assert metrics['time'] > 0
+        assert metrics['memory_peak'] >= metrics['memory_retained']
+        assert metrics['top_allocations']
+
+
+def test_discovery(exciting_calculation):
+    # a ground-state run without properties
+    mainfile = exciting_calculation(files=['INFO.OUT', 'input.xml', 'EIGVAL.OUT'])
+    directory = os.path.dirname(mainfile)
+    with open(os.path.join(directory, 'input.xml')) as f:
+        content = f.read()
+    start = content.index('  <properties>')
+    end = content.index('</properties>') + len('</properties>\n')
+    with open(os.path.join(directory, 'input.xml'), 'w') as f:
+        f.write(content[:start] + content[end:])
+    os.makedirs(os.path.join(directory, 'a', 'b'))
+    parser = ExcitingParser()
+    archive = EntryArchive()
+    parser.parse(mainfile, archive, logging.getLogger())
+    discovery = parser.stages['discovery']
+    assert discovery['searched'] == ['input.xml', 'EIGVAL.OUT']
+    assert 'dos.xml' in discovery['skipped']
+    assert 'EVALQP.DAT' in discovery['skipped']
+    assert discovery['directory_scans'] == 1
+    assert discovery['avoided_scans'] > 0
+    assert archive.data.outputs[0].electronic_eigenvalues
+
+    # the property files are only searched for the tasks of input.xml
+    mainfile = exciting_calculation(files=['INFO.OUT', 'input.xml', 'dos.xml'])
+    parser.parse(mainfile, EntryArchive(), logging.getLogger())
+    discovery = parser.stages['discovery']
+    assert discovery['searched'] == [
+        'input.xml',
+        'EIGVAL.OUT',
+        'bandstructure.xml',
+        'dos.xml',
+        'BAND.OUT',
+    ]
+    assert 'dos_xml' in parser.stages
+    assert 'bandstructure_xml' not in parser.stages
+
+    # INFO.OUT is only scanned up to the first module banner, which gives EIGVAL.OUT
+    mainfile = exciting_calculation(
+        files=['INFO.OUT'], n_scf=20, n_optimization_steps=5
+    )
+    assert scan_modules(mainfile, chunk_size=1024) == ({'groundstate'}, 0)
+
+
+def test_search_many_files(tmp_path):
+    for path in ['a/EIGVAL.OUT.gz', 'a/EIGVAL.OUT', 'a/b/dos.xml', '.c/input.xml']:
+        os.makedirs(os.path.dirname(tmp_path / path), exist_ok=True)
+        (tmp_path / path).touch()
+    (tmp_path / 'dos.xml.xz').touch()
+    found, scans = search_many_files(
+        ['EIGVAL.OUT', 'dos.xml', 'input.xml'], str(tmp_path), max_dirs=4
+    )
+    assert found['EIGVAL.OUT'] == [
+        str(tmp_path / 'a' / 'EIGVAL.OUT'),
+        str(tmp_path / 'a' / 'EIGVAL.OUT.gz'),
+    ]
+    assert found['dos.xml'] == [str(tmp_path / 'dos.xml.xz')]
+    # hidden folders are skipped
+    assert found['input.xml'] == []
+    assert scans == [1, 1, 1]
+
+
+def test_summary(exciting_calculation):
+    mainfile = exciting_calculation(n_atoms=4, n_species=2, n_scf=5)
+    reference = EntryArchive()
+    ExcitingParser().parse(mainfile, reference, logging.getLogger())
+    parser = ExcitingParser(summary=True)
+    archive = EntryArchive()
+    parser.parse(mainfile, archive, logging.getLogger())
+
+    # only INFO.OUT is read
+    assert list(parser.stages) == ['discovery', 'info']
+    assert not parser.context.parsers['info'].data['groundstate'].get('scf_iterations')
+    simulation = archive.data
+    assert simulation.program.version == reference.data.program.version
+    assert simulation.program.version_internal == (
+        '1775bff4453c84689fb848894a9224f155377cfc'
+    )
+    assert [
+        a.chemical_symbol for a in simulation.model_system[0].cell[0].atoms_state
+    ] == [a.chemical_symbol for a in reference.data.model_system[0].cell[0].atoms_state]
+    xc_functionals = simulation.model_method[0].xc_functionals
+    assert [xc.libxc_name for xc in xc_functionals] == ['GGA_C_PBE', 'GGA_X_PBE']
+    energy = simulation.outputs[-1].total_energies[0]
+    reference_energy = reference.data.outputs[-1].total_energies[0]
+    assert energy.value == reference_energy.value
+    assert energy.is_scf_converged
+    assert not simulation.outputs[-1].electronic_eigenvalues
+
+
+def test_summary_optimization(exciting_calculation):
+    mainfile = exciting_calculation(files=['INFO.OUT'], n_optimization_steps=3)
+    archive = EntryArchive()
+    ExcitingParser(summary=True).parse(mainfile, archive, logging.getLogger())
+
+    # groundstate and the final optimized structure without the optimization steps
+    assert len(archive.data.model_system) == 2
+    assert [o.total_energies[0].is_scf_converged for o in archive.data.outputs] == [
+        True,
+        True,
+    ]
+
+
+@pytest.mark.parametrize('extension', ['.gz', '.bz2', '.xz', '.zst'])
+def test_compressed_files(exciting_calculation, extension):
+    mainfile = exciting_calculation(n_kpoints=5, n_bands=8)
+    reference = EntryArchive()
+    ExcitingParser().parse(mainfile, reference, logging.getLogger())
+
+    if extension == '.zst':
+        zstandard = pytest.importorskip('zstandard')
+        compress = zstandard.ZstdCompressor().compress
+    else:
+        compress = {'.gz': gzip, '.bz2': bz2, '.xz': lzma}[extension].compress
+    directory = os.path.dirname(mainfile)
+    for filename in os.listdir(directory):
+        filepath = os.path.join(directory, filename)
+        with open(filepath, 'rb') as f:
+            data = f.read()
+        with open(f'{filepath}{extension}', 'wb') as f:
+            f.write(compress(data))
+        os.remove(filepath)
+
+    archive = EntryArchive()
+    ExcitingParser().parse(f'{mainfile}{extension}', archive, logging.getLogger())
+    assert archive.data.m_to_dict() == reference.data.m_to_dict()
+
+
+def test_read_ahead(exciting_calculation, monkeypatch):
+    mainfile = exciting_calculation(n_kpoints=5, n_bands=8)
+    eigval_file = mainfile.replace('INFO.OUT', 'EIGVAL.OUT')
+    with ReadAhead([eigval_file, mainfile]):
+        with ReadAhead.claim(eigval_file) as f:
+            assert f.tell() == 0
+            assert f.read(1)
+        # a handle is only handed out once
+        assert ReadAhead.claim(eigval_file) is None
+    # unclaimed handles are released on exit
+    assert ReadAhead.claim(mainfile) is None
+
+    # a file queued behind the read of another file is not waited for
+    started, release = threading.Event(), threading.Event()
+    read = ReadAhead._read
+
+    def blocking_read(self, filepath):
+        if filepath == os.path.abspath(mainfile):
+            started.set()
+            release.wait(5)
+        return read(self, filepath)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(ReadAhead, '_read', blocking_read)
+        with ReadAhead([mainfile, eigval_file], max_workers=1):
+            assert started.wait(5)
+            assert ReadAhead.claim(eigval_file) is None
+            release.set()
+
+    archives = []
+    for read_ahead in [True, False]:
+        archive = EntryArchive()
+        ExcitingParser(read_ahead=read_ahead).parse(
+            mainfile, archive, logging.getLogger()
+        )
+        archives.append(archive.data.m_to_dict())
+    assert archives[0] == archives[1]
+
+
+def test_budgets(exciting_calculation, monkeypatch):
+    mainfile = exciting_calculation(n_kpoints=5, n_bands=8)
+    reference = EntryArchive()
+    ExcitingParser().parse(mainfile, reference, logging.getLogger())
+    assert reference.data.outputs[-1].electronic_dos
+
+    # dos.xml is over its size budget
+    logger = MagicMock()
+    archive = EntryArchive()
+    ExcitingParser(max_file_size={'dos.xml': 10}).parse(mainfile, archive, logger)
+    assert not archive.data.outputs[-1].electronic_dos
+    assert archive.data.outputs[-1].electronic_eigenvalues
+    assert logger.warning.call_args.kwargs['data']['max_file_size'] == 10
+
+    # reading dos.xml is cancelled after its time budget
+    def to_dict(self, **kwargs):
+        time.sleep(10)
+
+    monkeypatch.setattr(DosXMLParser, 'to_dict', to_dict)
+    logger = MagicMock()
+    archive = EntryArchive()
+    start = time.perf_counter()
+    ExcitingParser(max_parse_time={'dos.xml': 0.1}).parse(mainfile, archive, logger)
+    assert time.perf_counter() - start < 5
+    assert not archive.data.outputs[-1].electronic_dos
+    assert archive.data.outputs[-1].electronic_band_structures
+    assert logger.warning.call_args.kwargs['data']['max_parse_time'] == 0.1
+
+    # a timer set outside of a budget is restored with its remaining time
+    signal.setitimer(signal.ITIMER_REAL, 10)
+    try:
+        with time_budget(5):
+            time.sleep(0.01)
+        assert 9 < signal.getitimer(signal.ITIMER_REAL)[0] < 10
+        # or passed on to its handler if it expires first
+        with pytest.raises(TimeBudgetExceeded, match='of 0.05 s'):
+            with time_budget(0.05), time_budget(5):
+                time.sleep(1)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def test_max_memory(exciting_calculation, tmp_path):
+    buffer = ArrayBuffer(max_memory=100, directory=str(tmp_path))
+    heap = buffer.array(['1.5'] * 10)
+    spilled = buffer.stack([np.arange(3.0)] * 4, dtype='float32')
+    assert not isinstance(heap, np.memmap)
+    assert isinstance(spilled, np.memmap)
+    assert heap.tolist() == [1.5] * 10
+    assert spilled[-1].tolist() == [0, 1, 2]
+    assert (buffer.heap_size, buffer.spilled_size) == (80, 48)
+    # the files are unlinked and stay readable after they are closed
+    assert not os.listdir(tmp_path)
+    buffer.close()
+    assert spilled.sum() == 12
+
+    mainfile = exciting_calculation()
+    archive = EntryArchive()
+    ExcitingParser().parse(mainfile, archive, logging.getLogger())
+    spilled_archive = EntryArchive()
+    logger = MagicMock()
+    parser = ExcitingParser(max_memory=0)
+    parser.parse(mainfile, spilled_archive, logger)
+    assert parser.context.buffer.heap_size == 0
+    assert logger.info.call_args.kwargs['data']['spilled_size'] > 0
+    outputs = archive.data.outputs[-1]
+    spilled_outputs = spilled_archive.data.outputs[-1]
+    assert np.array_equal(
+        spilled_outputs.electronic_eigenvalues[0].value.magnitude,
+        outputs.electronic_eigenvalues[0].value.magnitude,
+    )
+    assert np.array_equal(
+        spilled_outputs.electronic_band_structures[0].value.magnitude,
+        outputs.electronic_band_structures[0].value.magnitude,
+    )
+    assert np.array_equal(
+        spilled_outputs.electronic_dos[0].value.magnitude,
+        outputs.electronic_dos[0].value.magnitude,
+    )